@@ -17,6 +17,7 @@ from autogpt.logs import (
     NEXT_ACTION_FILE_NAME,
     USER_INPUT_FILE_NAME,
     LogCycleHandler,
+    StreamingThoughtsPrinter,
     logger,
     print_assistant_thoughts,
     remove_ansi_escape,
@@ -132,7 +133,17 @@ class Agent:
                 )
                 break
             # Send message to AI, get response
-            with Spinner("Thinking... ", plain_output=self.config.plain_output):
+            spinner = Spinner("Thinking... ", plain_output=self.config.plain_output)
+            thoughts_printer = None
+            if self.config.stream_chat_completions and not any(
+                # Plugins that change the response must see it before it's printed
+                plugin.can_handle_on_response() or plugin.can_handle_post_planning()
+                for plugin in self.config.plugins
+            ):
+                thoughts_printer = StreamingThoughtsPrinter(
+                    self.ai_name, self.config, before_first_print=spinner.stop
+                )
+            with spinner:
                 assistant_reply = chat_with_ai(
                     self.config,
                     self,
@@ -140,6 +151,7 @@ class Agent:
                     self.triggering_prompt,
                     self.smart_token_limit,
                     self.config.smart_llm,
+                    stream_handler=thoughts_printer,
                 )
 
             try:
@@ -160,9 +172,12 @@ class Agent:
             if assistant_reply_json != {}:
                 # Get command name and arguments
                 try:
-                    print_assistant_thoughts(
-                        self.ai_name, assistant_reply_json, self.config
-                    )
+                    if thoughts_printer is not None:
+                        thoughts_printer.print_remaining(assistant_reply_json)
+                    else:
+                        print_assistant_thoughts(
+                            self.ai_name, assistant_reply_json, self.config
+                        )
                     command_name, arguments = extract_command(
                         assistant_reply_json, assistant_reply, self.config
                     )
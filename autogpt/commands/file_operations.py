@@ -2,16 +2,20 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import hashlib
 import os
 import os.path
+import threading
 from pathlib import Path
-from typing import Generator, Literal
+from types import MappingProxyType
+from typing import Generator, Literal, Mapping, NamedTuple
 
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
 from autogpt.logs import logger
 from autogpt.memory.vector import MemoryItem, VectorMemory
+from autogpt.memory.vector.document_store import get_document_store
 
 from .decorators import sanitize_path_arg
 from .file_operations_utils import read_textual_file
@@ -33,46 +37,208 @@ def operations_from_log(
     except FileNotFoundError:
         return
 
-    for line in log:
-        line = line.replace("File Operation Logger", "").strip()
-        if not line:
-            continue
-        operation, tail = line.split(": ", maxsplit=1)
-        operation = operation.strip()
-        if operation in ("write", "append"):
-            try:
-                path, checksum = (x.strip() for x in tail.rsplit(" #", maxsplit=1))
-            except ValueError:
-                logger.warn(f"File log entry lacks checksum: '{line}'")
-                path, checksum = tail.strip(), None
-            yield (operation, path, checksum)
-        elif operation == "delete":
-            yield (operation, tail.strip(), None)
+    with log:
+        for line in log:
+            if operation := _parse_log_entry(line):
+                yield operation
+
+
+def _parse_log_entry(line: str) -> tuple[Operation, str, str | None] | None:
+    line = line.replace("File Operation Logger", "").strip()
+    if not line:
+        return None
+    operation, tail = line.split(": ", maxsplit=1)
+    operation = operation.strip()
+    if operation in ("write", "append"):
+        try:
+            path, checksum = (x.strip() for x in tail.rsplit(" #", maxsplit=1))
+        except ValueError:
+            logger.warn(f"File log entry lacks checksum: '{line}'")
+            path, checksum = tail.strip(), None
+        return (operation, path, checksum)
+    elif operation == "delete":
+        return (operation, tail.strip(), None)
+    return None
+
+
+def _apply_operation(
+    state: dict[str, str | None],
+    operation: Operation,
+    path: str,
+    checksum: str | None,
+) -> None:
+    if operation in ("write", "append"):
+        state[path] = checksum
+    elif operation == "delete":
+        state.pop(path, None)
+
+
+def _written_size(text: str) -> int:
+    """Returns the number of bytes that writing text to a file in text mode adds"""
+    return len(text.replace("\n", os.linesep).encode("utf-8"))
+
+
+class FileOperationsIndex:
+    """
+    Expected state of the files in the workspace, according to the operations log.
+
+    The log is parsed once, after which the state is updated incrementally as
+    operations are logged. It is only parsed again when the log file is changed by
+    something else, which is detected by a change of its size or modification time.
+    """
+
+    log_path: str
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+
+        self._lock = threading.Lock()
+        self._state: dict[str, str | None] = {}
+        self._log_stat: tuple[int, int, int] | None = None
+        """The (inode, size, mtime) of the log when the state was last updated"""
+
+    def state(self) -> Mapping[str, str | None]:
+        """Returns a read-only view of the file paths mapped to their checksums"""
+        with self._lock:
+            if self._stat_log() != self._log_stat:
+                self._load()
+            return MappingProxyType(self._state)
+
+    def record(self, log_entry: str) -> None:
+        """Updates the state with an entry that was just appended to the log"""
+        with self._lock:
+            log_stat = self._stat_log()
+            if (
+                log_stat is None
+                or self._log_stat is None
+                or log_stat[0] != self._log_stat[0]
+                or log_stat[1] != self._log_stat[1] + _written_size(log_entry)
+            ):
+                # The log was also changed by something else
+                self._load()
+                return
+
+            if operation := _parse_log_entry(log_entry):
+                _apply_operation(self._state, *operation)
+            self._log_stat = log_stat
+
+    def _load(self) -> None:
+        logger.debug(f"Loading file operations log {self.log_path}")
+        self._log_stat = self._stat_log()
+        self._state = {}
+        for operation in operations_from_log(self.log_path):
+            _apply_operation(self._state, *operation)
+
+    def _stat_log(self) -> tuple[int, int, int] | None:
+        return _stat_file(self.log_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_file_operations_index(log_path: str) -> FileOperationsIndex:
+    return FileOperationsIndex(log_path)
+
 
-    log.close()
+def get_file_operations_index(log_path: str | Path) -> FileOperationsIndex:
+    """Returns the file operations index for the given log, creating it once"""
+    return _get_file_operations_index(os.path.abspath(log_path))
 
 
-def file_operations_state(log_path: str) -> dict[str, str]:
-    """Iterates over the operations log and returns the expected state.
+def file_operations_state(log_path: str | Path) -> Mapping[str, str | None]:
+    """Returns the expected state of the files according to the operations log.
 
-    Parses a log file at config.file_logger_path to construct a dictionary that maps
-    each file path written or appended to its checksum. Deleted files are removed
-    from the dictionary.
+    Uses the index of the log at config.file_logger_path to look up a mapping of
+    each file path written or appended to its checksum. Deleted files are not in
+    the mapping. The log is only parsed again if it was changed externally.
 
     Returns:
-        A dictionary mapping file paths to their checksums.
+        A read-only mapping of file paths to their checksums.
 
     Raises:
-        FileNotFoundError: If config.file_logger_path is not found.
         ValueError: If the log file content is not in the expected format.
     """
-    state = {}
-    for operation, path, checksum in operations_from_log(log_path):
-        if operation in ("write", "append"):
-            state[path] = checksum
-        elif operation == "delete":
-            del state[path]
-    return state
+    return get_file_operations_index(log_path).state()
+
+
+class AppendChecksums:
+    """
+    Resumable checksums of the files that are appended to, so that an append only
+    hashes the appended text instead of the whole file.
+
+    The checksums are the same as the `text_checksum` of the content of the file.
+    If a file was changed by something else since it was last appended to, which is
+    detected by a change of its size or modification time, it is hashed completely.
+    """
+
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hashes: dict[str, _FileHash] = {}
+
+    def append(self, path: str, text: str) -> str:
+        """Appends text to a file and returns the checksum of its new content"""
+        path = os.path.abspath(path)
+        with self._lock:
+            stat_before = _stat_file(path)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(text)
+            stat_after = _stat_file(path)
+
+            file_hash = (
+                self._hashes.get(path)
+                if stat_before is not None
+                else _FileHash(None, hashlib.md5(), False)
+            )
+            # Files are read with universal newlines, so a carriage return could
+            # be read differently once it is followed by the appended text.
+            size_before = stat_before[1] if stat_before else 0
+            if (
+                file_hash is not None
+                and file_hash.stat == stat_before
+                and not file_hash.ends_with_cr
+                and "\r" not in text
+                and stat_after[0] == (stat_before or stat_after)[0]
+                and stat_after[1] == size_before + _written_size(text)
+            ):
+                digest = file_hash.hash.copy()
+                digest.update(text.encode("utf-8"))
+                ends_with_cr = False
+            else:
+                digest, ends_with_cr = self._hash_file(path)
+
+            self._hashes[path] = _FileHash(stat_after, digest, ends_with_cr)
+            return digest.hexdigest()
+
+    def _hash_file(self, path: str) -> tuple[hashlib._Hash, bool]:
+        logger.debug(f"Computing checksum of {path}")
+        digest = hashlib.md5()
+        with open(path, "r", encoding="utf-8") as f:
+            while chunk := f.read(self.CHUNK_SIZE):
+                digest.update(chunk.encode("utf-8"))
+        with open(path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+            ends_with_cr = f.read(1) == b"\r"
+        return digest, ends_with_cr
+
+
+class _FileHash(NamedTuple):
+    stat: tuple[int, int, int] | None
+    """The (inode, size, mtime) of the file at the time it was hashed"""
+    hash: hashlib._Hash
+    ends_with_cr: bool
+
+
+def _stat_file(path: str) -> tuple[int, int, int] | None:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+
+_append_checksums = AppendChecksums()
 
 
 @sanitize_path_arg("filename")
@@ -121,9 +287,13 @@ def log_operation(
     if checksum is not None:
         log_entry += f" #{checksum}"
     logger.debug(f"Logging file operation: {log_entry}")
-    append_to_file(
+    result = append_to_file(
         agent.config.file_logger_path, f"{log_entry}\n", agent, should_log=False
     )
+    if not result.startswith("Error:"):
+        get_file_operations_index(agent.config.file_logger_path).record(
+            f"{log_entry}\n"
+        )
 
 
 @command(
@@ -147,15 +317,26 @@ def read_file(filename: str, agent: Agent) -> str:
     Returns:
         str: The contents of the file
     """
-    try:
-        content = read_textual_file(filename, logger)
 
-        # TODO: invalidate/update memory when file is edited
-        file_memory = MemoryItem.from_text_file(content, filename, agent.config)
+    def read_content() -> str:
+        return read_textual_file(
+            filename, logger, max_bytes=agent.config.read_file_max_bytes
+        )
+
+    try:
+        document_store = get_document_store(agent.config)
+        if document_store is not None and os.path.isfile(filename):
+            file_memory = document_store.memorize_file(
+                filename, read_content, agent.config
+            )
+        else:
+            file_memory = MemoryItem.from_text_file(
+                read_content(), filename, agent.config
+            )
         if len(file_memory.chunks) > 1:
             return file_memory.summary
 
-        return content
+        return file_memory.raw_content
     except Exception as e:
         return f"Error: {str(e)}"
 
@@ -261,13 +442,12 @@ def append_to_file(
     try:
         directory = os.path.dirname(filename)
         os.makedirs(directory, exist_ok=True)
-        with open(filename, "a", encoding="utf-8") as f:
-            f.write(text)
-
         if should_log:
-            with open(filename, "r", encoding="utf-8") as f:
-                checksum = text_checksum(f.read())
+            checksum = _append_checksums.append(filename, text)
             log_operation("append", filename, agent, checksum=checksum)
+        else:
+            with open(filename, "a", encoding="utf-8") as f:
+                f.write(text)
 
         return "Text appended successfully."
     except Exception as err:
@@ -328,7 +508,9 @@ def list_files(directory: str, agent: Agent) -> list[str]:
     """
     found_files = []
 
-    for root, _, files in os.walk(directory):
+    for root, dirs, files in os.walk(directory):
+        # Hidden directories hold e.g. the caches, which are not for the agent
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
         for file in files:
             if file.startswith("."):
                 continue
@@ -1,5 +1,7 @@
+import codecs
 import json
 import os
+from typing import Iterator, Optional
 
 import charset_normalizer
 import docx
@@ -12,38 +14,48 @@ from pylatexenc.latex2text import LatexNodes2Text
 from autogpt import logs
 from autogpt.logs import logger
 
+BINARY_SNIFF_SIZE = 8 * 1024
+"""Number of bytes at the start of a file that are checked for null bytes"""
+ENCODING_SNIFF_SIZE = 64 * 1024
+"""Number of bytes at the start of a text file used to detect its encoding"""
+READ_CHUNK_SIZE = 1024 * 1024
+
 
 class ParserStrategy:
+    """Reads the text from a file. Subclasses implement `read` or `iter_text`."""
+
     def read(self, file_path: str) -> str:
-        raise NotImplementedError
+        return "".join(self.iter_text(file_path))
+
+    def iter_text(self, file_path: str) -> Iterator[str]:
+        """Yield the text of the file in pieces, so it doesn't have to be read at once"""
+        yield self.read(file_path)
 
 
 # Basic text file reading
 class TXTParser(ParserStrategy):
-    def read(self, file_path: str) -> str:
-        charset_match = charset_normalizer.from_path(file_path).best()
-        logger.debug(f"Reading '{file_path}' with encoding '{charset_match.encoding}'")
-        return str(charset_match)
+    def iter_text(self, file_path: str) -> Iterator[str]:
+        encoding = detect_encoding(file_path)
+        logger.debug(f"Reading '{file_path}' with encoding '{encoding}'")
+        with open(file_path, "r", encoding=encoding, errors="replace") as f:
+            while chunk := f.read(READ_CHUNK_SIZE):
+                yield chunk
 
 
 # Reading text from binary file using pdf parser
 class PDFParser(ParserStrategy):
-    def read(self, file_path: str) -> str:
+    def iter_text(self, file_path: str) -> Iterator[str]:
         parser = PyPDF2.PdfReader(file_path)
-        text = ""
-        for page_idx in range(len(parser.pages)):
-            text += parser.pages[page_idx].extract_text()
-        return text
+        for page in parser.pages:
+            yield page.extract_text()
 
 
 # Reading text from binary file using docs parser
 class DOCXParser(ParserStrategy):
-    def read(self, file_path: str) -> str:
+    def iter_text(self, file_path: str) -> Iterator[str]:
         doc_file = docx.Document(file_path)
-        text = ""
         for para in doc_file.paragraphs:
-            text += para.text
-        return text
+            yield para.text
 
 
 # Reading as dictionary and returning string format
@@ -109,6 +121,10 @@ class FileContext:
         self.logger.debug(f"Reading file {file_path} with parser {self.parser}")
         return self.parser.read(file_path)
 
+    def iter_text(self, file_path) -> Iterator[str]:
+        self.logger.debug(f"Reading file {file_path} with parser {self.parser}")
+        return self.parser.iter_text(file_path)
+
 
 extension_to_parser = {
     ".txt": TXTParser(),
@@ -129,22 +145,64 @@ extension_to_parser = {
 
 
 def is_file_binary_fn(file_path: str):
-    """Given a file path load all its content and checks if the null bytes is present
+    """Given a file path, checks if a null byte is present at the start of the file
 
     Args:
-        file_path (_type_): _description_
+        file_path (str): The path of the file to check
 
     Returns:
         bool: is_binary
     """
     with open(file_path, "rb") as f:
-        file_data = f.read()
+        file_data = f.read(BINARY_SNIFF_SIZE)
     if b"\x00" in file_data:
         return True
     return False
 
 
-def read_textual_file(file_path: str, logger: logs.Logger) -> str:
+def detect_encoding(file_path: str) -> str:
+    """Detect the encoding of a text file from the start of the file
+
+    Args:
+        file_path (str): The path of the file
+
+    Returns:
+        str: The name of the encoding, UTF-8 if it can't be detected
+    """
+    with open(file_path, "rb") as f:
+        sample = f.read(ENCODING_SNIFF_SIZE)
+    try:
+        # The sample may end in the middle of a character, which would make
+        # charset_normalizer rule out UTF-8
+        codecs.getincrementaldecoder("utf_8")().decode(
+            sample, final=len(sample) < ENCODING_SNIFF_SIZE
+        )
+    except UnicodeDecodeError:
+        pass
+    else:
+        return "utf_8_sig"
+    charset_match = charset_normalizer.from_bytes(sample).best()
+    encoding = charset_match.encoding if charset_match else "utf_8"
+    # The rest of the file may not be ASCII, and a BOM is not part of the text
+    if encoding in ("ascii", "utf_8"):
+        encoding = "utf_8_sig"
+    return encoding
+
+
+def read_textual_file(
+    file_path: str, logger: logs.Logger, max_bytes: Optional[int] = None
+) -> str:
+    """Read the text from a file, with a parser based on the file extension
+
+    Args:
+        file_path (str): The path of the file to read
+        logger (Logger): The logger to use
+        max_bytes (int, optional): The maximum size of the text to read, in UTF-8
+            bytes. If the text is longer, it is truncated and a note is added.
+
+    Returns:
+        str: The text of the file
+    """
     if not os.path.isfile(file_path):
         raise FileNotFoundError(
             f"read_file {file_path} failed: no such file or directory"
@@ -158,4 +216,22 @@ def read_textual_file(file_path: str, logger: logs.Logger) -> str:
         # fallback to txt file parser (to support script and code files loading)
         parser = TXTParser()
     file_context = FileContext(parser, logger)
-    return file_context.read_file(file_path)
+    if not max_bytes:
+        return file_context.read_file(file_path)
+
+    pieces = []
+    size = 0
+    for piece in file_context.iter_text(file_path):
+        encoded_piece = piece.encode("utf-8")
+        if size + len(encoded_piece) > max_bytes:
+            pieces.append(
+                encoded_piece[: max_bytes - size].decode("utf-8", errors="ignore")
+            )
+            logger.warn(f"Only read the first {max_bytes} bytes of {file_path}")
+            pieces.append(
+                f"\n\n[The text of this file is truncated to {max_bytes} bytes]"
+            )
+            break
+        pieces.append(piece)
+        size += len(encoded_piece)
+    return "".join(pieces)
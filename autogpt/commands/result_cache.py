@@ -0,0 +1,115 @@
+"""Cache of the results of commands that fetch information from the web"""
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from autogpt.config import Config
+from autogpt.memory.vector.utils import Embedding
+from autogpt.sqlite_store import SQLiteStore, open_store
+
+RESULT_CACHE_FILE = "command_result_cache.sqlite3"
+SIMILAR_QUESTION_THRESHOLD = 0.95
+"""Minimum cosine similarity for a cached answer to be used for another question"""
+
+
+class CommandResultCache(SQLiteStore):
+    """
+    On-disk cache of command results, keyed by the command name and e.g. a URL or
+    search query. Results can also be stored for a question, in which case they are
+    only returned for questions with a similar embedding. Results expire `ttl`
+    seconds after they were stored.
+    """
+
+    TABLE = "results"
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS results ("
+        "  command TEXT NOT NULL,"
+        "  key TEXT NOT NULL,"
+        "  question_embedding BLOB NOT NULL,"
+        "  result TEXT NOT NULL,"
+        "  created_at REAL NOT NULL,"
+        "  PRIMARY KEY (command, key, question_embedding)"
+        ")"
+    ]
+
+    ttl: int
+
+    def __init__(self, path: Path, ttl: int):
+        super().__init__(path)
+        self.ttl = ttl
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Returns the query in a form that is the same for near-identical queries"""
+        return re.sub(r"\s+", " ", query).strip().lower()
+
+    def get(
+        self,
+        command: str,
+        key: str,
+        question_embedding: Optional[Embedding] = None,
+    ) -> str | None:
+        """Returns a fresh cached result, or None if there is none"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT question_embedding, result FROM results"
+                " WHERE command = ? AND key = ? AND created_at > ?",
+                (command, key, time.time() - self.ttl),
+            ).fetchall()
+
+        if question_embedding is None:
+            return next((result for e, result in rows if not e), None)
+
+        question_embedding = np.asarray(question_embedding, dtype=np.float32)
+        best_result, best_similarity = None, SIMILAR_QUESTION_THRESHOLD
+        for embedding, result in rows:
+            if not embedding:
+                continue
+            similarity = _cosine_similarity(
+                question_embedding, np.frombuffer(embedding, dtype=np.float32)
+            )
+            if similarity >= best_similarity:
+                best_result, best_similarity = result, similarity
+        return best_result
+
+    def put(
+        self,
+        command: str,
+        key: str,
+        result: str,
+        question_embedding: Optional[Embedding] = None,
+    ) -> None:
+        """Stores a command result and evicts the expired ones"""
+        embedding = (
+            np.asarray(question_embedding, dtype=np.float32).tobytes()
+            if question_embedding is not None
+            else b""
+        )
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (command, key, embedding, result, now),
+            )
+            self._connection.execute(
+                "DELETE FROM results WHERE created_at <= ?", (now - self.ttl,)
+            )
+
+
+def _cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    norms = np.linalg.norm(a) * np.linalg.norm(b)
+    return float(np.dot(a, b) / norms) if norms else 0.0
+
+
+def get_command_result_cache(config: Config) -> CommandResultCache | None:
+    """Returns the command result cache for the configured workspace, if enabled"""
+    if config.web_cache_ttl <= 0 or not config.workspace_path:
+        return None
+    return open_store(
+        CommandResultCache, config, RESULT_CACHE_FILE, config.web_cache_ttl
+    )
@@ -9,6 +9,8 @@ from duckduckgo_search import DDGS
 
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
+from autogpt.commands.result_cache import CommandResultCache, get_command_result_cache
+from autogpt.logs import logger
 
 DUCKDUCKGO_MAX_ATTEMPTS = 3
 
@@ -38,10 +40,16 @@ def web_search(query: str, agent: Agent, num_results: int = 8) -> str:
     search_results = []
     attempts = 0
 
-    while attempts < DUCKDUCKGO_MAX_ATTEMPTS:
-        if not query:
-            return json.dumps(search_results)
+    if not query:
+        return json.dumps(search_results)
+
+    cache = get_command_result_cache(agent.config)
+    cache_key = f"{CommandResultCache.normalize_query(query)}:{num_results}"
+    if cache is not None and (cached := cache.get("web_search", cache_key)):
+        logger.debug(f"Using cached results for web search '{query}'")
+        return cached
 
+    while attempts < DUCKDUCKGO_MAX_ATTEMPTS:
         results = DDGS().text(query)
         search_results = list(islice(results, num_results))
 
@@ -51,8 +59,12 @@ def web_search(query: str, agent: Agent, num_results: int = 8) -> str:
         time.sleep(1)
         attempts += 1
 
-    results = json.dumps(search_results, ensure_ascii=False, indent=4)
-    return safe_google_results(results)
+    results = safe_google_results(
+        json.dumps(search_results, ensure_ascii=False, indent=4)
+    )
+    if cache is not None and search_results:
+        cache.put("web_search", cache_key, results)
+    return results
 
 
 @command(
@@ -1,12 +1,18 @@
 """Selenium web scraping module."""
 from __future__ import annotations
 
+import atexit
+import functools
 import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from sys import platform
 from typing import Optional, Type
 
-from bs4 import BeautifulSoup
+import orjson
+import requests
 from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.chrome.service import Service as ChromeDriverService
@@ -24,20 +30,33 @@ from selenium.webdriver.safari.webdriver import WebDriver as SafariDriver
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.wait import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.manager import DriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 from webdriver_manager.microsoft import EdgeChromiumDriverManager as EdgeDriverManager
 
 from autogpt.agent.agent import Agent
 from autogpt.command_decorator import command
+from autogpt.commands.result_cache import get_command_result_cache
+from autogpt.commands.webdriver_pool import WebDriverPool
+from autogpt.config import Config
 from autogpt.logs import logger
 from autogpt.memory.vector import MemoryItem, get_memory
-from autogpt.processing.html import extract_hyperlinks, format_hyperlinks
+from autogpt.memory.vector.utils import Embedding, get_embedding
+from autogpt.processing.html import extract_page_content, format_hyperlinks
+from autogpt.processing.text import summarize_text
 from autogpt.url_utils.validators import validate_url
 
 BrowserOptions = ChromeOptions | EdgeOptions | FirefoxOptions | SafariOptions
 
 FILE_DIR = Path(__file__).parent.parent
 
+MIN_STATIC_PAGE_TEXT_LENGTH = 200
+"""Pages with less text than this without JavaScript are loaded in a browser"""
+JAVASCRIPT_REQUIRED_PATTERN = re.compile(r"enable javascript|requires javascript", re.I)
+HTTP_CHUNK_SIZE = 64 * 1024
+
+_memory_lock = threading.Lock()
+
 
 @command(
     "browse_website",
@@ -60,37 +79,262 @@ def browse_website(url: str, question: str, agent: Agent) -> str:
         question (str): The question asked by the user
 
     Returns:
-        Tuple[str, WebDriver]: The answer and links to the user and the webdriver
+        str: The answer and links to the user
     """
     try:
-        driver, text = scrape_text_with_selenium(url, agent)
+        answer, links = _browse_website(
+            url, question, agent, _get_question_embedding(question, agent)
+        )
     except WebDriverException as e:
-        # These errors are often quite long and include lots of context.
-        # Just grab the first line.
-        msg = e.msg.split("\n")[0]
-        return f"Error: {msg}"
+        return _webdriver_error(e)
+    return f"Answer gathered from website: {answer}\n\nLinks: {links}"
+
+
+@command(
+    "browse_websites",
+    "Browses several websites at once",
+    {
+        "urls": {
+            "type": "string",
+            "description": "The URLs to visit, separated by commas",
+            "required": True,
+        },
+        "question": {
+            "type": "string",
+            "description": "What you want to find on the websites",
+            "required": True,
+        },
+    },
+)
+def browse_websites(urls: list[str] | str, question: str, agent: Agent) -> str:
+    """Browse several websites in parallel and return one answer and their links
+
+    At most `config.browse_concurrency` websites are fetched and summarized at the
+    same time. The pages share the browser pool and HTTP session. The answers
+    gathered from the websites are then summarized into one answer to the question,
+    the way the summaries of the chunks of a long text are.
+
+    Args:
+        urls (list[str] | str): The urls of the websites to browse
+        question (str): The question asked by the user
+
+    Returns:
+        str: The answer, and the links and errors of each website
+    """
+    if isinstance(urls, str):
+        urls = re.split(r"[\s,]+", urls)
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if not urls:
+        return "Error: No URLs to browse"
+
+    question_embedding = _get_question_embedding(question, agent)
+
+    def browse(url: str) -> tuple[str, list[str]] | str:
+        try:
+            answer, links = validate_url(_browse_website)(
+                url, question, agent, question_embedding
+            )
+        except ValueError as e:
+            return f"Error: {e}"
+        except WebDriverException as e:
+            return _webdriver_error(e)
+        # E.g. when there was no text on the page
+        return answer if answer.startswith("Error:") else (answer, links)
+
+    with ThreadPoolExecutor(
+        max_workers=max(min(len(urls), agent.config.browse_concurrency), 1)
+    ) as executor:
+        results = list(executor.map(browse, urls))
+
+    answers, links, errors = [], [], []
+    for url, result in zip(urls, results):
+        if isinstance(result, str):
+            errors.append(f"Website {url}: {result}")
+        else:
+            answers.append((url, result[0]))
+            links.append(f"Links from {url}: {result[1]}")
+
+    if not answers:
+        return "\n".join(errors)
+    if len(answers) == 1:
+        answer = answers[0][1]
+    else:
+        # Reduce the answers to one, like the summaries of the chunks of a text
+        answer, _ = summarize_text(
+            "\n\n".join(f"Website {url}:\n{answer}" for url, answer in answers),
+            agent.config,
+            question=question,
+        )
+    return "\n\n".join(
+        [f"Answer gathered from websites: {answer}", "\n".join(links), *errors]
+    )
 
-    add_header(driver)
-    summary = summarize_memorize_webpage(url, text, question, agent, driver)
-    links = scrape_links_with_selenium(driver, url)
+
+def _get_question_embedding(question: str, agent: Agent) -> Embedding | None:
+    """Returns the embedding to look up cached answers with, if the cache is enabled"""
+    if get_command_result_cache(agent.config) is None:
+        return None
+    return get_embedding(question, agent.config)
+
+
+def _browse_website(
+    url: str,
+    question: str,
+    agent: Agent,
+    question_embedding: Optional[Embedding],
+) -> tuple[str, list[str]]:
+    """Returns the answer gathered from a website and its first links
+
+    Raises:
+        WebDriverException: If the page could not be loaded in the browser
+    """
+    cache = get_command_result_cache(agent.config)
+    if cache is not None and question_embedding is not None:
+        if cached := cache.get("browse_website", url, question_embedding):
+            logger.debug(f"Using cached answer from {url}")
+            answer, links = orjson.loads(cached)
+            return answer, links
+
+    page = (
+        scrape_page_with_requests(url, agent) if agent.config.browse_fast_path else None
+    )
+    if page is not None:
+        text, links = page
+    else:
+        with get_webdriver_pool(agent.config).driver() as driver:
+            text, links = scrape_page_with_selenium(driver, url)
+            add_header(driver)
+
+    summary = summarize_memorize_webpage(url, text, question, agent)
 
     # Limit links to 5
     if len(links) > 5:
         links = links[:5]
-    close_browser(driver)
-    return f"Answer gathered from website: {summary}\n\nLinks: {links}"
+    if cache is not None and question_embedding is not None and text:
+        cache.put(
+            "browse_website",
+            url,
+            orjson.dumps([summary, links]).decode(),
+            question_embedding,
+        )
+    return summary, links
+
 
+def _webdriver_error(e: WebDriverException) -> str:
+    # These errors are often quite long and include lots of context.
+    # Just grab the first line.
+    msg = e.msg.split("\n")[0]
+    return f"Error: {msg}"
 
-def scrape_text_with_selenium(url: str, agent: Agent) -> tuple[WebDriver, str]:
-    """Scrape text from a website using selenium
+
+def scrape_page_with_requests(url: str, agent: Agent) -> tuple[str, list[str]] | None:
+    """Scrape text and links from a website without a browser
 
     Args:
         url (str): The url of the website to scrape
 
     Returns:
-        Tuple[WebDriver, str]: The webdriver and the text scraped from the website
+        Tuple[str, List[str]]: The text and links scraped from the website, or None
+            if the page could not be fetched or seems to need JavaScript to render
+    """
+    try:
+        response = _http_session().get(
+            url,
+            headers={"User-Agent": agent.config.user_agent},
+            timeout=10,
+            stream=True,
+        )
+        with response:
+            content_type = response.headers.get("Content-Type", "")
+            if not response.ok or "html" not in content_type:
+                return None
+            # Without a charset in the header, requests would decode the page as
+            # ISO-8859-1, so the parser gets the bytes to find the charset itself
+            page = extract_page_content(
+                response.iter_content(
+                    HTTP_CHUNK_SIZE, decode_unicode="charset=" in content_type.lower()
+                ),
+                response.url,
+            )
+    except Exception as e:
+        logger.debug(f"Failed to fetch {url} without a browser: {e}")
+        return None
+
+    if JAVASCRIPT_REQUIRED_PATTERN.search(page.noscript_text):
+        logger.debug(f"{url} needs JavaScript, using a browser")
+        return None
+
+    text, links = page.text, format_hyperlinks(page.hyperlinks)
+    if len(text) < MIN_STATIC_PAGE_TEXT_LENGTH:
+        logger.debug(f"{url} has little text without JavaScript, using a browser")
+        return None
+    return text, links
+
+
+@functools.lru_cache(maxsize=None)
+def _http_session() -> requests.Session:
+    return requests.Session()
+
+
+def scrape_page_with_selenium(driver: WebDriver, url: str) -> tuple[str, list[str]]:
+    """Scrape text and links from a website using selenium
+
+    Args:
+        driver (WebDriver): The webdriver to use to scrape the website
+        url (str): The url of the website to scrape
+
+    Returns:
+        Tuple[str, List[str]]: The text and links scraped from the website
+    """
+    driver.get(url)
+
+    WebDriverWait(driver, 10).until(
+        EC.presence_of_element_located((By.TAG_NAME, "body"))
+    )
+
+    # Get the HTML content directly from the browser's DOM
+    page = extract_page_content(driver.page_source, url)
+    return page.text, format_hyperlinks(page.hyperlinks)
+
+
+def get_webdriver_pool(config: Config) -> WebDriverPool:
+    """Returns the pool of WebDrivers for the configured browser"""
+    return _get_webdriver_pool(
+        config.selenium_web_browser,
+        config.selenium_headless,
+        config.browser_pool_size,
+        config.browser_idle_timeout,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _get_webdriver_pool(
+    browser: str, headless: bool, max_size: int, idle_timeout: int
+) -> WebDriverPool:
+    pool = WebDriverPool(
+        functools.partial(create_webdriver, browser, headless, max_size > 1),
+        max_size=max_size,
+        idle_timeout=idle_timeout,
+    )
+    atexit.register(pool.close_idle)
+    return pool
+
+
+def create_webdriver(
+    browser: str, headless: bool, allow_multiple: bool = False
+) -> WebDriver:
+    """Start a WebDriver for the given browser
+
+    Args:
+        browser (str): The browser to use: chrome, edge, firefox or safari
+        headless (bool): Whether to run the browser without a window
+        allow_multiple (bool): Whether multiple browsers may be running at once
+
+    Returns:
+        WebDriver: The webdriver
     """
     logging.getLogger("selenium").setLevel(logging.CRITICAL)
+    logger.debug(f"Starting {browser} WebDriver")
 
     options_available: dict[str, Type[BrowserOptions]] = {
         "chrome": ChromeOptions,
@@ -99,33 +343,37 @@ def scrape_text_with_selenium(url: str, agent: Agent) -> tuple[WebDriver, str]:
         "safari": SafariOptions,
     }
 
-    options: BrowserOptions = options_available[agent.config.selenium_web_browser]()
+    options: BrowserOptions = options_available[browser]()
     options.add_argument(
         "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.5615.49 Safari/537.36"
     )
 
-    if agent.config.selenium_web_browser == "firefox":
-        if agent.config.selenium_headless:
+    if browser == "firefox":
+        if headless:
             options.headless = True
             options.add_argument("--disable-gpu")
         driver = FirefoxDriver(
-            service=GeckoDriverService(GeckoDriverManager().install()), options=options
+            service=GeckoDriverService(_install_driver(GeckoDriverManager)),
+            options=options,
         )
-    elif agent.config.selenium_web_browser == "edge":
+    elif browser == "edge":
         driver = EdgeDriver(
-            service=EdgeDriverService(EdgeDriverManager().install()), options=options
+            service=EdgeDriverService(_install_driver(EdgeDriverManager)),
+            options=options,
         )
-    elif agent.config.selenium_web_browser == "safari":
+    elif browser == "safari":
         # Requires a bit more setup on the users end
         # See https://developer.apple.com/documentation/webkit/testing_with_webdriver_in_safari
         driver = SafariDriver(options=options)
     else:
         if platform == "linux" or platform == "linux2":
             options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--remote-debugging-port=9222")
+            # A fixed port can only be used by one browser at a time
+            port = 0 if allow_multiple else 9222
+            options.add_argument(f"--remote-debugging-port={port}")
 
         options.add_argument("--no-sandbox")
-        if agent.config.selenium_headless:
+        if headless:
             options.add_argument("--headless=new")
             options.add_argument("--disable-gpu")
 
@@ -134,59 +382,16 @@ def scrape_text_with_selenium(url: str, agent: Agent) -> tuple[WebDriver, str]:
         driver = ChromeDriver(
             service=ChromeDriverService(str(chromium_driver_path))
             if chromium_driver_path.exists()
-            else ChromeDriverService(ChromeDriverManager().install()),
+            else ChromeDriverService(_install_driver(ChromeDriverManager)),
             options=options,
         )
-    driver.get(url)
+    return driver
 
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.TAG_NAME, "body"))
-    )
-
-    # Get the HTML content directly from the browser's DOM
-    page_source = driver.execute_script("return document.body.outerHTML;")
-    soup = BeautifulSoup(page_source, "html.parser")
-
-    for script in soup(["script", "style"]):
-        script.extract()
-
-    text = soup.get_text()
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    text = "\n".join(chunk for chunk in chunks if chunk)
-    return driver, text
 
-
-def scrape_links_with_selenium(driver: WebDriver, url: str) -> list[str]:
-    """Scrape links from a website using selenium
-
-    Args:
-        driver (WebDriver): The webdriver to use to scrape the links
-
-    Returns:
-        List[str]: The links scraped from the website
-    """
-    page_source = driver.page_source
-    soup = BeautifulSoup(page_source, "html.parser")
-
-    for script in soup(["script", "style"]):
-        script.extract()
-
-    hyperlinks = extract_hyperlinks(soup, url)
-
-    return format_hyperlinks(hyperlinks)
-
-
-def close_browser(driver: WebDriver) -> None:
-    """Close the browser
-
-    Args:
-        driver (WebDriver): The webdriver to close
-
-    Returns:
-        None
-    """
-    driver.quit()
+@functools.lru_cache(maxsize=None)
+def _install_driver(manager: Type[DriverManager]) -> str:
+    """Install a driver once per process and return its path"""
+    return manager().install()
 
 
 def add_header(driver: WebDriver) -> None:
@@ -230,8 +435,10 @@ def summarize_memorize_webpage(
     text_length = len(text)
     logger.info(f"Text length: {text_length} characters")
 
-    memory = get_memory(agent.config)
-
     new_memory = MemoryItem.from_webpage(text, url, agent.config, question=question)
-    memory.add(new_memory)
+    # Pages can be summarized in parallel, but memory providers aren't thread-safe.
+    # The memory is loaded inside the lock too, so that it includes the pages that
+    # other threads have just added.
+    with _memory_lock:
+        get_memory(agent.config).add(new_memory)
     return new_memory.summary
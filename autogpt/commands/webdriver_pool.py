@@ -0,0 +1,140 @@
+"""Pool of reusable Selenium WebDrivers"""
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from typing import Callable, Iterator
+
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from autogpt.logs import logger
+
+
+class WebDriverPool:
+    """
+    Bounded pool of warm WebDrivers, so that a browser doesn't have to be started
+    for every page that is browsed.
+
+    Drivers are checked for health before they are handed out, and their state
+    (cookies, extra tabs, current page) is reset when they are given back. Drivers
+    that fail while in use are discarded, and drivers that are idle for longer than
+    `idle_timeout` seconds are closed, unless it is 0.
+    """
+
+    def __init__(
+        self,
+        create_driver: Callable[[], WebDriver],
+        max_size: int,
+        idle_timeout: float,
+    ):
+        self._create_driver = create_driver
+        self._max_size = max(max_size, 1)
+        self._idle_timeout = idle_timeout
+
+        self._condition = threading.Condition()
+        self._idle: list[tuple[WebDriver, float]] = []
+        """Drivers that are not in use, with the time they were given back"""
+        self._n_drivers = 0
+        """Number of drivers, idle or in use"""
+
+    @contextlib.contextmanager
+    def driver(self) -> Iterator[WebDriver]:
+        """Borrow a driver from the pool, starting one if none is available
+
+        If the block raises, the driver is discarded instead of given back, since it
+        may have crashed or be in an unknown state.
+        """
+        driver = self._acquire()
+        try:
+            yield driver
+        except BaseException:
+            self._discard(driver)
+            raise
+        self._release(driver)
+
+    def close_idle(self, max_idle_time: float = 0) -> None:
+        """Close the drivers that have been idle for longer than `max_idle_time`"""
+        now = time.monotonic()
+        with self._condition:
+            expired = [d for d, t in self._idle if now - t >= max_idle_time]
+            self._idle = [(d, t) for d, t in self._idle if now - t < max_idle_time]
+        for driver in expired:
+            logger.debug("Closing idle WebDriver")
+            self._discard(driver)
+
+    def __len__(self) -> int:
+        with self._condition:
+            return self._n_drivers
+
+    def _acquire(self) -> WebDriver:
+        if self._idle_timeout > 0:
+            self.close_idle(self._idle_timeout)
+        while True:
+            with self._condition:
+                while not self._idle and self._n_drivers >= self._max_size:
+                    self._condition.wait()
+                if not self._idle:
+                    self._n_drivers += 1
+                    break
+                # the most recently used driver is the least likely to have expired
+                driver, _ = self._idle.pop()
+
+            if _is_healthy(driver):
+                return driver
+            logger.debug("Discarding unresponsive WebDriver")
+            self._discard(driver)
+
+        try:
+            return self._create_driver()
+        except BaseException:
+            with self._condition:
+                self._n_drivers -= 1
+                self._condition.notify()
+            raise
+
+    def _release(self, driver: WebDriver) -> None:
+        try:
+            _reset_state(driver)
+        except WebDriverException as e:
+            logger.debug(f"Discarding WebDriver that failed to reset: {e.msg}")
+            self._discard(driver)
+            return
+
+        with self._condition:
+            self._idle.append((driver, time.monotonic()))
+            self._condition.notify()
+
+        if self._idle_timeout > 0:
+            timer = threading.Timer(
+                self._idle_timeout, self.close_idle, (self._idle_timeout,)
+            )
+            timer.daemon = True
+            timer.start()
+
+    def _discard(self, driver: WebDriver) -> None:
+        with contextlib.suppress(Exception):
+            driver.quit()
+        with self._condition:
+            self._n_drivers -= 1
+            self._condition.notify()
+
+
+def _is_healthy(driver: WebDriver) -> bool:
+    try:
+        driver.current_url
+        return True
+    except WebDriverException:
+        return False
+
+
+def _reset_state(driver: WebDriver) -> None:
+    """Close all tabs but one, clear the cookies and navigate away from the page"""
+    handles = driver.window_handles
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.delete_all_cookies()
+    driver.get("about:blank")
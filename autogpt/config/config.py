@@ -54,8 +54,19 @@ class Config(SystemSettings, arbitrary_types_allowed=True):
     smart_llm: str = "gpt-4"
     temperature: float = 0
     openai_functions: bool = False
+    stream_chat_completions: bool = False
+    completion_cache: bool = False
+    completion_cache_max_entries: int = 1000
+    completion_cache_ttl: int = 86400
     embedding_model: str = "text-embedding-ada-002"
+    embedding_cache: bool = True
+    embedding_cache_max_entries: int = 20000
+    document_store: bool = True
     browse_spacy_language_model: str = "en_core_web_sm"
+    browse_spacy_sentencizer_only: bool = False
+    summarization_concurrency: int = 4
+    openai_requests_per_minute: Dict[str, int] = Field(default_factory=dict)
+    openai_tokens_per_minute: Dict[str, int] = Field(default_factory=dict)
     # Run loop configuration
     continuous_mode: bool = False
     continuous_limit: int = 0
@@ -78,6 +89,7 @@ class Config(SystemSettings, arbitrary_types_allowed=True):
     # File ops
     restrict_to_workspace: bool = True
     allow_downloads: bool = False
+    read_file_max_bytes: int = 0
     # Shell commands
     shell_command_control: str = "denylist"
     execute_local_commands: bool = False
@@ -94,6 +106,11 @@ class Config(SystemSettings, arbitrary_types_allowed=True):
     # Web browsing
     selenium_web_browser: str = "chrome"
     selenium_headless: bool = True
+    browser_pool_size: int = 1
+    browser_idle_timeout: int = 300
+    browse_fast_path: bool = True
+    browse_concurrency: int = 4
+    web_cache_ttl: int = 3600
     user_agent: str = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_4) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/83.0.4103.97 Safari/537.36"
 
     ###################
@@ -155,6 +172,13 @@ class Config(SystemSettings, arbitrary_types_allowed=True):
             credentials.update(azure_credentials)
         return credentials
 
+    def get_openai_rate_limits(self, model: str) -> dict[str, int]:
+        """Get the kwargs for `RateLimiter.request` for the given model."""
+        return {
+            "requests_per_minute": self.openai_requests_per_minute.get(model, 0),
+            "tokens_per_minute": self.openai_tokens_per_minute.get(model, 0),
+        }
+
     def get_azure_credentials(self, model: str) -> dict[str, str]:
         """Get the kwargs for the Azure API."""
 
@@ -222,7 +246,13 @@ class ConfigBuilder(Configurable[Config]):
             "fast_llm": os.getenv("FAST_LLM", os.getenv("FAST_LLM_MODEL")),
             "smart_llm": os.getenv("SMART_LLM", os.getenv("SMART_LLM_MODEL")),
             "embedding_model": os.getenv("EMBEDDING_MODEL"),
+            "embedding_cache": os.getenv("EMBEDDING_CACHE", "True") == "True",
+            "document_store": os.getenv("DOCUMENT_STORE", "True") == "True",
             "browse_spacy_language_model": os.getenv("BROWSE_SPACY_LANGUAGE_MODEL"),
+            "browse_spacy_sentencizer_only": os.getenv(
+                "BROWSE_SPACY_SENTENCIZER_ONLY", "False"
+            )
+            == "True",
             "openai_api_key": os.getenv("OPENAI_API_KEY"),
             "use_azure": os.getenv("USE_AZURE") == "True",
             "azure_config_file": os.getenv("AZURE_CONFIG_FILE", AZURE_CONFIG_FILE),
@@ -231,6 +261,9 @@ class ConfigBuilder(Configurable[Config]):
             "restrict_to_workspace": os.getenv("RESTRICT_TO_WORKSPACE", "True")
             == "True",
             "openai_functions": os.getenv("OPENAI_FUNCTIONS", "False") == "True",
+            "stream_chat_completions": os.getenv("STREAM_CHAT_COMPLETIONS", "False")
+            == "True",
+            "completion_cache": os.getenv("COMPLETION_CACHE", "False") == "True",
             "elevenlabs_api_key": os.getenv("ELEVENLABS_API_KEY"),
             "streamelements_voice": os.getenv("STREAMELEMENTS_VOICE"),
             "text_to_speech_provider": os.getenv("TEXT_TO_SPEECH_PROVIDER"),
@@ -248,6 +281,7 @@ class ConfigBuilder(Configurable[Config]):
             "sd_webui_auth": os.getenv("SD_WEBUI_AUTH"),
             "selenium_web_browser": os.getenv("USE_WEB_BROWSER"),
             "selenium_headless": os.getenv("HEADLESS_BROWSER", "True") == "True",
+            "browse_fast_path": os.getenv("BROWSE_FAST_PATH", "True") == "True",
             "user_agent": os.getenv("USER_AGENT"),
             "memory_backend": os.getenv("MEMORY_BACKEND"),
             "memory_index": os.getenv("MEMORY_INDEX"),
@@ -296,12 +330,43 @@ class ConfigBuilder(Configurable[Config]):
             config_dict["plugins_allowlist"],
         )
 
+        config_dict["openai_requests_per_minute"] = _parse_model_limits(
+            os.getenv("OPENAI_REQUESTS_PER_MINUTE")
+        )
+        config_dict["openai_tokens_per_minute"] = _parse_model_limits(
+            os.getenv("OPENAI_TOKENS_PER_MINUTE")
+        )
+
         with contextlib.suppress(TypeError):
             config_dict["image_size"] = int(os.getenv("IMAGE_SIZE"))
         with contextlib.suppress(TypeError):
             config_dict["redis_port"] = int(os.getenv("REDIS_PORT"))
         with contextlib.suppress(TypeError):
             config_dict["temperature"] = float(os.getenv("TEMPERATURE"))
+        with contextlib.suppress(TypeError):
+            config_dict["summarization_concurrency"] = int(
+                os.getenv("SUMMARIZATION_CONCURRENCY")
+            )
+        with contextlib.suppress(TypeError):
+            config_dict["embedding_cache_max_entries"] = int(
+                os.getenv("EMBEDDING_CACHE_MAX_ENTRIES")
+            )
+        with contextlib.suppress(TypeError):
+            config_dict["completion_cache_max_entries"] = int(
+                os.getenv("COMPLETION_CACHE_MAX_ENTRIES")
+            )
+        with contextlib.suppress(TypeError):
+            config_dict["browser_pool_size"] = int(os.getenv("BROWSER_POOL_SIZE"))
+        with contextlib.suppress(TypeError):
+            config_dict["read_file_max_bytes"] = int(os.getenv("READ_FILE_MAX_BYTES"))
+        with contextlib.suppress(TypeError):
+            config_dict["browse_concurrency"] = int(os.getenv("BROWSE_CONCURRENCY"))
+        with contextlib.suppress(TypeError):
+            config_dict["browser_idle_timeout"] = int(os.getenv("BROWSER_IDLE_TIMEOUT"))
+        with contextlib.suppress(TypeError):
+            config_dict["web_cache_ttl"] = int(os.getenv("WEB_CACHE_TTL"))
+        with contextlib.suppress(TypeError):
+            config_dict["completion_cache_ttl"] = int(os.getenv("COMPLETION_CACHE_TTL"))
 
         if config_dict["use_azure"]:
             azure_config = cls.load_azure_config(config_dict["azure_config_file"])
@@ -382,3 +447,14 @@ def _safe_split(s: Union[str, None], sep: str = ",") -> list[str]:
     if s is None:
         return []
     return s.split(sep)
+
+
+def _parse_model_limits(s: Union[str, None]) -> dict[str, int]:
+    """Parse a list of per-model limits, e.g. "gpt-4:200,gpt-3.5-turbo:3500"."""
+    limits = {}
+    for item in _safe_split(s):
+        if not item.strip():
+            continue
+        model, _, limit = item.rpartition(":")
+        limits[model.strip()] = int(limit)
+    return limits
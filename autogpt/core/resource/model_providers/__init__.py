@@ -2,6 +2,7 @@ from autogpt.core.resource.model_providers.openai import (
     OPEN_AI_MODELS,
     OpenAIModelName,
     OpenAIProvider,
+    OpenAIRetryMetrics,
     OpenAISettings,
 )
 from autogpt.core.resource.model_providers.schema import (
@@ -40,5 +41,6 @@ __all__ = [
     "OpenAIModelName",
     "OPEN_AI_MODELS",
     "OpenAIProvider",
+    "OpenAIRetryMetrics",
     "OpenAISettings",
 ]
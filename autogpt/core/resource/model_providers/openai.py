@@ -1,12 +1,18 @@
+import asyncio
+import contextlib
 import enum
 import functools
 import logging
 import math
+import random
 import time
-from typing import Callable, ParamSpec, TypeVar
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional, ParamSpec, TypeVar
 
 import openai
-from openai.error import APIError, RateLimitError
+import tiktoken
+from openai.error import APIError, OpenAIError, RateLimitError
+from pydantic import BaseModel
 
 from autogpt.core.configuration import (
     Configurable,
@@ -97,9 +103,13 @@ OPEN_AI_MODELS = {
     **OPEN_AI_EMBEDDING_MODELS,
 }
 
+OPEN_AI_MAX_EMBEDDING_BATCH_SIZE = 2048
+"""Maximum number of inputs the OpenAI API accepts in a single embedding request"""
+
 
 class OpenAIConfiguration(SystemConfiguration):
     retries_per_request: int = UserConfigurable()
+    max_concurrent_embedding_requests: int = UserConfigurable()
 
 
 class OpenAIModelProviderBudget(ModelProviderBudget):
@@ -123,6 +133,7 @@ class OpenAIProvider(
         description="Provides access to OpenAI's API.",
         configuration=OpenAIConfiguration(
             retries_per_request=10,
+            max_concurrent_embedding_requests=4,
         ),
         credentials=ModelProviderCredentials(),
         budget=OpenAIModelProviderBudget(
@@ -154,9 +165,10 @@ class OpenAIProvider(
             logger=self._logger,
             num_retries=self._configuration.retries_per_request,
         )
+        self._retry_metrics = retry_handler.metrics
 
         self._create_completion = retry_handler(_create_completion)
-        self._create_embedding = retry_handler(_create_embedding)
+        self._create_embeddings = retry_handler(_create_embeddings)
 
     def get_token_limit(self, model_name: str) -> int:
         """Get the token limit for a given model."""
@@ -166,6 +178,10 @@ class OpenAIProvider(
         """Get the remaining budget."""
         return self._budget.remaining_budget
 
+    def get_retry_metrics(self) -> "OpenAIRetryMetrics":
+        """Get statistics on the API calls that had to be retried."""
+        return self._retry_metrics.copy()
+
     async def create_language_completion(
         self,
         model_prompt: list[LanguageModelMessage],
@@ -203,20 +219,66 @@ class OpenAIProvider(
         **kwargs,
     ) -> EmbeddingModelProviderModelResponse:
         """Create an embedding using the OpenAI API."""
+        responses = await self.create_embeddings(
+            [text], model_name, embedding_parser, **kwargs
+        )
+        return responses[0]
+
+    async def create_embeddings(
+        self,
+        texts: list[str],
+        model_name: OpenAIModelName,
+        embedding_parser: Callable[[Embedding], Embedding],
+        **kwargs,
+    ) -> list[EmbeddingModelProviderModelResponse]:
+        """Create embeddings for multiple texts using the OpenAI API.
+
+        The texts are packed into as few requests as the model's limits allow,
+        and the requests are made concurrently.
+        """
+        if not texts:
+            return []
+
+        model_info = OPEN_AI_EMBEDDING_MODELS[model_name]
         embedding_kwargs = self._get_embedding_kwargs(model_name, **kwargs)
-        response = await self._create_embedding(text=text, **embedding_kwargs)
+        tokenizer = _get_tokenizer(model_name)
+        token_counts = [len(t) for t in tokenizer.encode_batch(texts)]
+        batches = _batch_embedding_inputs(
+            token_counts, model_info.max_tokens, OPEN_AI_MAX_EMBEDDING_BATCH_SIZE
+        )
+        semaphore = asyncio.Semaphore(
+            max(self._configuration.max_concurrent_embedding_requests, 1)
+        )
 
-        response_args = {
-            "model_info": OPEN_AI_EMBEDDING_MODELS[model_name],
-            "prompt_tokens_used": response.usage.prompt_tokens,
-            "completion_tokens_used": response.usage.completion_tokens,
-        }
-        response = EmbeddingModelProviderModelResponse(
-            **response_args,
-            embedding=embedding_parser(response.embeddings[0]),
+        async def embed_batch(batch: list[int]) -> list[Embedding]:
+            async with semaphore:
+                response = await self._create_embeddings(
+                    texts=[texts[i] for i in batch], **embedding_kwargs
+                )
+            # Usage is only reported per request; any difference with our own count
+            # is attributed to the last text, so the totals match what is billed.
+            token_counts[batch[-1]] += response.usage.prompt_tokens - sum(
+                token_counts[i] for i in batch
+            )
+            return [d.embedding for d in sorted(response.data, key=lambda d: d.index)]
+
+        self._logger.debug(
+            f"Embedding {len(texts)} texts with {model_name} "
+            f"in {len(batches)} requests"
         )
-        self._budget.update_usage_and_cost(response)
-        return response
+        results = await asyncio.gather(*(embed_batch(batch) for batch in batches))
+
+        responses: list[EmbeddingModelProviderModelResponse] = [None] * len(texts)
+        for batch, embeddings in zip(batches, results):
+            for i, embedding in zip(batch, embeddings):
+                responses[i] = EmbeddingModelProviderModelResponse(
+                    model_info=model_info,
+                    prompt_tokens_used=token_counts[i],
+                    completion_tokens_used=0,
+                    embedding=embedding_parser(embedding),
+                )
+                self._budget.update_usage_and_cost(responses[i])
+        return responses
 
     def _get_completion_kwargs(
         self,
@@ -271,22 +333,59 @@ class OpenAIProvider(
         return "OpenAIProvider()"
 
 
-async def _create_embedding(text: str, *_, **kwargs) -> openai.Embedding:
-    """Embed text using the OpenAI API.
+async def _create_embeddings(texts: list[str], *_, **kwargs) -> openai.Embedding:
+    """Embed texts using the OpenAI API.
 
     Args:
-        text str: The text to embed.
+        texts list[str]: The texts to embed.
         model_name str: The name of the model to use.
 
     Returns:
-        str: The embedding.
+        The response, with an embedding for each text.
     """
     return await openai.Embedding.acreate(
-        input=[text],
+        input=texts,
         **kwargs,
     )
 
 
+@functools.lru_cache(maxsize=None)
+def _get_tokenizer(model_name: str) -> tiktoken.Encoding:
+    return tiktoken.encoding_for_model(model_name)
+
+
+def _batch_embedding_inputs(
+    token_counts: list[int],
+    max_tokens: int,
+    max_batch_size: int,
+) -> list[list[int]]:
+    """Packs embedding inputs into batches that fit in a single API request.
+
+    Args:
+        token_counts: The number of tokens of each input.
+        max_tokens: The token budget per request.
+        max_batch_size: The maximum number of inputs per request.
+
+    Returns:
+        The indices of the inputs in each batch, in order. An input that exceeds
+        the token budget by itself gets its own batch.
+    """
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_tokens = 0
+    for i, n_tokens in enumerate(token_counts):
+        if batch and (
+            len(batch) >= max_batch_size or batch_tokens + n_tokens > max_tokens
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(i)
+        batch_tokens += n_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 async def _create_completion(
     messages: list[LanguageModelMessage], *_, **kwargs
 ) -> openai.Completion:
@@ -312,12 +411,28 @@ _T = TypeVar("_T")
 _P = ParamSpec("_P")
 
 
+class OpenAIRetryMetrics(BaseModel):
+    """Statistics on the retries of an OpenAI provider's API calls."""
+
+    retries: int = 0
+    rate_limit_errors: int = 0
+    server_errors: int = 0
+    time_waiting: float = 0.0
+    """Total number of seconds spent waiting before retries"""
+
+
 class _OpenAIRetryHandler:
     """Retry Handler for OpenAI API call.
 
+    Waits before each retry without blocking the event loop. The wait time is
+    the one the API asks for in its `Retry-After` header, if any, and otherwise
+    grows exponentially with some random jitter, so that clients that are
+    rate limited at the same time don't all retry at the same time.
+
     Args:
         num_retries int: Number of retries. Defaults to 10.
         backoff_base float: Base for exponential backoff. Defaults to 2.
+        max_backoff float: Maximum backoff in seconds. Defaults to 60.
         warn_user bool: Whether to warn the user. Defaults to True.
     """
 
@@ -326,19 +441,22 @@ class _OpenAIRetryHandler:
         "Please double check that you have setup a PAID OpenAI API Account. You can "
         "read more here: https://docs.agpt.co/setup/#getting-an-api-key"
     )
-    _backoff_msg = "Error: API Bad gateway. Waiting {backoff} seconds..."
+    _backoff_msg = "Error: API Bad gateway. Waiting {backoff:.2f} seconds..."
 
     def __init__(
         self,
         logger: logging.Logger,
         num_retries: int = 10,
         backoff_base: float = 2.0,
+        max_backoff: float = 60.0,
         warn_user: bool = True,
     ):
         self._logger = logger
         self._num_retries = num_retries
         self._backoff_base = backoff_base
+        self._max_backoff = max_backoff
         self._warn_user = warn_user
+        self.metrics = OpenAIRetryMetrics()
 
     def _log_rate_limit_error(self) -> None:
         self._logger.debug(self._retry_limit_msg)
@@ -346,10 +464,18 @@ class _OpenAIRetryHandler:
             self._logger.warning(self._api_key_error_msg)
             self._warn_user = False
 
-    def _backoff(self, attempt: int) -> None:
-        backoff = self._backoff_base ** (attempt + 2)
+    def _get_backoff(self, attempt: int, error: OpenAIError) -> float:
+        if (retry_after := _get_retry_after(error)) is not None:
+            return retry_after
+        backoff = min(self._backoff_base ** (attempt + 2), self._max_backoff)
+        return random.uniform(backoff / 2, backoff)
+
+    async def _backoff(self, attempt: int, error: OpenAIError) -> None:
+        backoff = self._get_backoff(attempt, error)
         self._logger.debug(self._backoff_msg.format(backoff=backoff))
-        time.sleep(backoff)
+        self.metrics.retries += 1
+        self.metrics.time_waiting += backoff
+        await asyncio.sleep(backoff)
 
     def __call__(self, func: Callable[_P, _T]) -> Callable[_P, _T]:
         @functools.wraps(func)
@@ -359,15 +485,38 @@ class _OpenAIRetryHandler:
                 try:
                     return await func(*args, **kwargs)
 
-                except RateLimitError:
+                except RateLimitError as e:
+                    self.metrics.rate_limit_errors += 1
                     if attempt == num_attempts:
                         raise
                     self._log_rate_limit_error()
+                    error = e
 
                 except APIError as e:
+                    if e.http_status == 502:
+                        self.metrics.server_errors += 1
                     if (e.http_status != 502) or (attempt == num_attempts):
                         raise
+                    error = e
 
-                self._backoff(attempt)
+                await self._backoff(attempt, error)
 
         return _wrapped
+
+
+def _get_retry_after(error: OpenAIError) -> Optional[float]:
+    """Get the number of seconds to wait from the error's Retry-After header"""
+    headers = error.headers or {}
+    if (retry_after_ms := headers.get("retry-after-ms")) is not None:
+        with contextlib.suppress(ValueError):
+            return max(float(retry_after_ms) / 1000, 0)
+
+    if (retry_after := headers.get("retry-after")) is not None:
+        with contextlib.suppress(ValueError):
+            return max(float(retry_after), 0)
+        # Retry-After may also be an HTTP date
+        with contextlib.suppress(TypeError, ValueError):
+            retry_at = parsedate_to_datetime(retry_after).timestamp()
+            return max(retry_at - time.time(), 0)
+
+    return None
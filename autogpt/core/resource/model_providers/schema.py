@@ -160,6 +160,7 @@ class EmbeddingModelProviderModelInfo(ModelProviderModelInfo):
     """Struct for embedding model information."""
 
     model_service = ModelProviderService.EMBEDDING
+    max_tokens: int
     embedding_dimensions: int
 
 
@@ -187,6 +188,22 @@ class EmbeddingModelProvider(ModelProvider):
     ) -> EmbeddingModelProviderModelResponse:
         ...
 
+    @abc.abstractmethod
+    async def create_embeddings(
+        self,
+        texts: list[str],
+        model_name: str,
+        embedding_parser: Callable[[Embedding], Embedding],
+        **kwargs,
+    ) -> list[EmbeddingModelProviderModelResponse]:
+        """Embed multiple texts, with as few API calls as possible.
+
+        Returns:
+            One response per text, in the same order as the texts. The tokens used
+            by each text are accounted for in its own response.
+        """
+        ...
+
 
 ###################
 # Language Models #
@@ -2,7 +2,7 @@
 import ast
 import json
 import os.path
-from typing import Any
+from typing import Any, Optional
 
 from jsonschema import Draft7Validator
 
@@ -28,6 +28,81 @@ def extract_json_from_response(response_content: str) -> dict:
         return {}
 
 
+class StreamingJSONParser:
+    """
+    Parses a JSON object that is received in pieces, e.g. from a streamed LLM
+    response, so the part that was received so far can be used before the object
+    is complete. Any text before the opening brace is ignored.
+    """
+
+    text: str
+    complete: bool
+
+    def __init__(self):
+        self.text = ""
+        self.complete = False
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._closers: list[str] = []
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def started_at_beginning(self) -> bool:
+        """Whether the text starts with the object, apart from whitespace"""
+        return self._start is not None and not self.text[: self._start].strip()
+
+    @property
+    def depth(self) -> int:
+        """The number of objects and arrays that are open at the end of the text"""
+        return len(self._closers)
+
+    def feed(self, chunk: str) -> None:
+        """Adds the next piece of the text"""
+        offset = len(self.text)
+        self.text += chunk
+        if self.complete:
+            return
+
+        for i, char in enumerate(chunk, offset):
+            if self._start is None:
+                if char == "{":
+                    self._start = i
+                    self._closers.append("}")
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._closers.append("}" if char == "{" else "]")
+            elif char in "}]":
+                self._closers.pop()
+                if not self._closers:
+                    self.complete = True
+                    self._end = i + 1
+                    return
+
+    def parse(self) -> Optional[dict]:
+        """
+        Returns the object as far as it was received, with all open objects and
+        arrays closed. Returns None if that is not valid JSON at this point, e.g.
+        because the text ends in the middle of a key or a string.
+        """
+        if self._start is None or self._in_string:
+            return None
+
+        partial = self.text[self._start : self._end].rstrip().removesuffix(",")
+        try:
+            return json.loads(partial + "".join(reversed(self._closers)))
+        except json.JSONDecodeError:
+            return None
+
+
 def llm_response_schema(
     config: Config, schema_name: str = LLM_DEFAULT_RESPONSE_FORMAT
 ) -> dict[str, Any]:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 from typing import List, Optional
 
 import openai
@@ -17,13 +18,20 @@ class ApiManager(metaclass=Singleton):
         self.total_cost = 0
         self.total_budget = 0
         self.models: Optional[list[Model]] = None
+        self.completion_cache_hits = 0
+        self.completion_cache_misses = 0
+        # API calls can be made from multiple threads at the same time
+        self._lock = threading.Lock()
 
     def reset(self):
-        self.total_prompt_tokens = 0
-        self.total_completion_tokens = 0
-        self.total_cost = 0
-        self.total_budget = 0.0
-        self.models = None
+        with self._lock:
+            self.total_prompt_tokens = 0
+            self.total_completion_tokens = 0
+            self.total_cost = 0
+            self.total_budget = 0.0
+            self.models = None
+            self.completion_cache_hits = 0
+            self.completion_cache_misses = 0
 
     def update_cost(self, prompt_tokens, completion_tokens, model):
         """
@@ -40,15 +48,30 @@ class ApiManager(metaclass=Singleton):
         model = model[:-3] if model.endswith("-v2") else model
         model_info = OPEN_AI_MODELS[model]
 
-        self.total_prompt_tokens += prompt_tokens
-        self.total_completion_tokens += completion_tokens
-        self.total_cost += prompt_tokens * model_info.prompt_token_cost / 1000
+        cost = prompt_tokens * model_info.prompt_token_cost / 1000
         if issubclass(type(model_info), CompletionModelInfo):
-            self.total_cost += (
-                completion_tokens * model_info.completion_token_cost / 1000
-            )
+            cost += completion_tokens * model_info.completion_token_cost / 1000
+
+        with self._lock:
+            self.total_prompt_tokens += prompt_tokens
+            self.total_completion_tokens += completion_tokens
+            self.total_cost += cost
+            total_cost = self.total_cost
+
+        logger.debug(f"Total running cost: ${total_cost:.3f}")
+
+    def update_completion_cache_stats(self, hit: bool):
+        """
+        Count a lookup in the completion cache.
 
-        logger.debug(f"Total running cost: ${self.total_cost:.3f}")
+        Args:
+        hit (bool): Whether the completion was found in the cache.
+        """
+        with self._lock:
+            if hit:
+                self.completion_cache_hits += 1
+            else:
+                self.completion_cache_misses += 1
 
     def set_total_budget(self, total_budget):
         """
@@ -95,6 +118,16 @@ class ApiManager(metaclass=Singleton):
         """
         return self.total_budget
 
+    def get_completion_cache_hit_rate(self):
+        """
+        Get the fraction of completion cache lookups that were hits.
+
+        Returns:
+        float: The hit rate of the completion cache, 0 if it wasn't used.
+        """
+        lookups = self.completion_cache_hits + self.completion_cache_misses
+        return self.completion_cache_hits / lookups if lookups else 0.0
+
     def get_models(self, **openai_credentials) -> List[Model]:
         """
         Get list of available GPT models.
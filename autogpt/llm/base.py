@@ -39,9 +39,23 @@ class Message:
     content: str
     type: MessageType | None = None
 
+    _token_counts: dict[str, tuple[MessageDict, int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
     def raw(self) -> MessageDict:
         return {"role": self.role, "content": self.content}
 
+    def cached_token_count(self, encoding_model: str) -> int | None:
+        """Returns the token count stored by `cache_token_count`, if still valid"""
+        if encoding_model not in self._token_counts:
+            return None
+        counted, n_tokens = self._token_counts[encoding_model]
+        return n_tokens if counted == self.raw() else None
+
+    def cache_token_count(self, encoding_model: str, n_tokens: int) -> None:
+        self._token_counts[encoding_model] = (self.raw(), n_tokens)
+
 
 @dataclass
 class ModelInfo:
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional
 
 if TYPE_CHECKING:
     from autogpt.agent.agent import Agent
@@ -13,6 +13,7 @@ from autogpt.llm.providers.openai import (
     count_openai_functions_tokens,
     get_openai_command_specs,
 )
+from autogpt.llm.rate_limiter import RequestPriority
 from autogpt.llm.utils import count_message_tokens, create_chat_completion
 from autogpt.logs import CURRENT_CONTEXT_FILE_NAME, logger
 
@@ -25,6 +26,7 @@ def chat_with_ai(
     triggering_prompt: str,
     token_limit: int,
     model: str | None = None,
+    stream_handler: Optional[Callable[[str], Optional[bool]]] = None,
 ):
     """
     Interact with the OpenAI API, sending the prompt, user input,
@@ -37,6 +39,8 @@ def chat_with_ai(
         triggering_prompt (str): The input from the user.
         token_limit (int): The maximum number of tokens allowed in the API call.
         model (str, optional): The model to use. By default, the config.smart_llm will be used.
+        stream_handler (Callable, optional): Stream the response to this handler,
+            see `create_chat_completion`.
 
     Returns:
     str: The AI's response.
@@ -93,18 +97,13 @@ def chat_with_ai(
     current_tokens_used += agent.history.max_summary_tlength  # Reserve space
     current_tokens_used += 500  # Reserve space for the openai functions TODO improve
 
-    # Add historical Messages until the token limit is reached
-    #  or there are no more messages to add.
-    for cycle in reversed(list(agent.history.per_cycle())):
-        messages_to_add = [msg for msg in cycle if msg is not None]
-        tokens_to_add = count_message_tokens(messages_to_add, model)
-        if current_tokens_used + tokens_to_add > send_token_limit:
-            break
-
-        # Add the most recent message to the start of the chain,
-        #  after the system prompts.
-        message_sequence.insert(insertion_index, *messages_to_add)
-        current_tokens_used += tokens_to_add
+    # Add the most recent cycles from the history that fit in the token limit,
+    #  after the system prompts.
+    messages_to_add, tokens_to_add = agent.history.most_recent_cycles(
+        send_token_limit - current_tokens_used, model
+    )
+    message_sequence.insert(insertion_index, *messages_to_add)
+    current_tokens_used += tokens_to_add
 
     # Update & add summary of trimmed messages
     if len(agent.history) > 0:
@@ -194,6 +193,8 @@ def chat_with_ai(
         config=agent.config,
         functions=openai_functions,
         max_tokens=tokens_remaining,
+        stream_handler=stream_handler,
+        priority=RequestPriority.AGENT,
     )
 
     # Update full message history
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from autogpt.config import Config
+from autogpt.sqlite_store import SQLiteStore, open_store
+
+from .base import ResponseMessageDict
+
+COMPLETION_CACHE_FILE = "completion_cache.sqlite3"
+
+
+class CompletionCache(SQLiteStore):
+    """
+    On-disk cache of chat completions, keyed by the SHA-256 hash of the request.
+    Entries expire `ttl` seconds after they were stored. When the cache holds more
+    than `max_entries` completions, the least recently used ones are evicted.
+
+    Only use this for deterministic requests, i.e. with a temperature of 0.
+    """
+
+    TABLE = "completions"
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS completions ("
+        "  key TEXT PRIMARY KEY,"
+        "  message TEXT NOT NULL,"
+        "  created_at REAL NOT NULL,"
+        "  last_used REAL NOT NULL"
+        ")",
+        "CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used)",
+    ]
+
+    max_entries: int
+    ttl: int
+
+    def __init__(self, path: Path, max_entries: int, ttl: int):
+        super().__init__(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+    @staticmethod
+    def key(
+        model: str,
+        messages: list[dict],
+        functions: Optional[list[dict]],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> str:
+        """Returns the cache key for a chat completion request"""
+        request: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "functions": functions,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+        }
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    def get(self, key: str) -> ResponseMessageDict | None:
+        """Returns the cached response message, or None if it's not cached"""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT message FROM completions WHERE key = ? AND created_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is None:
+                return None
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE completions SET last_used = ? WHERE key = ?", (now, key)
+                )
+        return json.loads(row[0])
+
+    def put(self, key: str, message: ResponseMessageDict) -> None:
+        """Stores a response message and evicts expired and least recently used ones"""
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)",
+                (key, json.dumps(message), now, now),
+            )
+            self._connection.execute(
+                "DELETE FROM completions WHERE created_at <= ?", (now - self.ttl,)
+            )
+            self._evict_least_recently_used(self.max_entries)
+
+
+def get_completion_cache(config: Config) -> CompletionCache | None:
+    """Returns the completion cache for the configured workspace, if enabled"""
+    if not config.completion_cache or not config.workspace_path:
+        return None
+    return open_store(
+        CompletionCache,
+        config,
+        COMPLETION_CACHE_FILE,
+        config.completion_cache_max_entries,
+        config.completion_cache_ttl,
+    )
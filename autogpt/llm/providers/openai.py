@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import functools
+import inspect
+import threading
 import time
+import weakref
 from dataclasses import dataclass
-from typing import Callable, List, Optional
-from unittest.mock import patch
+from typing import Any, Callable, Coroutine, Iterator, List, Optional, TypeVar
 
+import aiohttp
 import openai
-import openai.api_resources.abstract.engine_api_resource as engine_api_resource
 from colorama import Fore, Style
 from openai.error import APIError, RateLimitError, ServiceUnavailableError, Timeout
 from openai.openai_object import OpenAIObject
@@ -118,8 +122,6 @@ def meter_api(func: Callable):
 
     api_manager = ApiManager()
 
-    openai_obj_processor = openai.util.convert_to_openai_object
-
     def update_usage_with_response(response: OpenAIObject):
         try:
             usage = response.usage
@@ -132,19 +134,24 @@ def meter_api(func: Callable):
         except Exception as err:
             logger.warn(f"Failed to update API costs: {err.__class__.__name__}: {err}")
 
-    def metering_wrapper(*args, **kwargs):
-        openai_obj = openai_obj_processor(*args, **kwargs)
-        if isinstance(openai_obj, OpenAIObject) and "usage" in openai_obj:
-            update_usage_with_response(openai_obj)
-        return openai_obj
+    def process_response(response: Any) -> Any:
+        # Streamed responses are generators without usage info; their cost is
+        # accounted for by the code that consumes the stream.
+        if isinstance(response, OpenAIObject) and "usage" in response:
+            update_usage_with_response(response)
+        return response
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def metered_async_func(*args, **kwargs):
+            return process_response(await func(*args, **kwargs))
+
+        return metered_async_func
 
+    @functools.wraps(func)
     def metered_func(*args, **kwargs):
-        with patch.object(
-            engine_api_resource.util,
-            "convert_to_openai_object",
-            side_effect=metering_wrapper,
-        ):
-            return func(*args, **kwargs)
+        return process_response(func(*args, **kwargs))
 
     return metered_func
 
@@ -173,6 +180,64 @@ def retry_api(
     backoff_msg = f"{Fore.RED}Waiting {{backoff}} seconds...{Fore.RESET}"
 
     def _wrapper(func: Callable):
+        def handle_error(
+            err: Exception, attempt: int, max_attempts: int, user_warned: bool
+        ) -> bool:
+            """Re-raises the error if the call can't be retried
+
+            Returns:
+                bool: Whether the user has been warned about their API account
+            """
+            if isinstance(err, (RateLimitError, ServiceUnavailableError)):
+                if attempt >= max_attempts or (
+                    # User's API quota exceeded
+                    isinstance(err, RateLimitError)
+                    and (error := getattr(err, "error", {}))
+                    and error.get("code") == "insufficient_quota"
+                ):
+                    raise
+
+                error_msg = error_messages[type(err)]
+                logger.warn(error_msg)
+                if not user_warned:
+                    logger.double_check(api_key_error_msg)
+                    logger.debug(f"Status: {err.http_status}")
+                    logger.debug(f"Response body: {err.json_body}")
+                    logger.debug(f"Response headers: {err.headers}")
+                    user_warned = True
+
+            elif isinstance(err, (APIError, Timeout)):
+                if (err.http_status not in [429, 502]) or (attempt == max_attempts):
+                    raise
+
+            return user_warned
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def _async_wrapped(*args, **kwargs):
+                user_warned = not warn_user
+                max_attempts = max_retries + 1  # +1 for the first attempt
+                for attempt in range(1, max_attempts + 1):
+                    try:
+                        return await func(*args, **kwargs)
+
+                    except (
+                        RateLimitError,
+                        ServiceUnavailableError,
+                        APIError,
+                        Timeout,
+                    ) as e:
+                        user_warned = handle_error(
+                            e, attempt, max_attempts, user_warned
+                        )
+
+                    backoff = backoff_base ** (attempt + 2)
+                    logger.warn(backoff_msg.format(backoff=backoff))
+                    await asyncio.sleep(backoff)
+
+            return _async_wrapped
+
         @functools.wraps(func)
         def _wrapped(*args, **kwargs):
             user_warned = not warn_user
@@ -181,27 +246,13 @@ def retry_api(
                 try:
                     return func(*args, **kwargs)
 
-                except (RateLimitError, ServiceUnavailableError) as e:
-                    if attempt >= max_attempts or (
-                        # User's API quota exceeded
-                        isinstance(e, RateLimitError)
-                        and (err := getattr(e, "error", {}))
-                        and err.get("code") == "insufficient_quota"
-                    ):
-                        raise
-
-                    error_msg = error_messages[type(e)]
-                    logger.warn(error_msg)
-                    if not user_warned:
-                        logger.double_check(api_key_error_msg)
-                        logger.debug(f"Status: {e.http_status}")
-                        logger.debug(f"Response body: {e.json_body}")
-                        logger.debug(f"Response headers: {e.headers}")
-                        user_warned = True
-
-                except (APIError, Timeout) as e:
-                    if (e.http_status not in [429, 502]) or (attempt == max_attempts):
-                        raise
+                except (
+                    RateLimitError,
+                    ServiceUnavailableError,
+                    APIError,
+                    Timeout,
+                ) as e:
+                    user_warned = handle_error(e, attempt, max_attempts, user_warned)
 
                 backoff = backoff_base ** (attempt + 2)
                 logger.warn(backoff_msg.format(backoff=backoff))
@@ -218,21 +269,23 @@ def create_chat_completion(
     messages: List[MessageDict],
     *_,
     **kwargs,
-) -> OpenAIObject:
+) -> OpenAIObject | Iterator[OpenAIObject]:
     """Create a chat completion using the OpenAI API
 
     Args:
         messages: A list of messages to feed to the chatbot.
         kwargs: Other arguments to pass to the OpenAI API chat completion call.
+            With `stream=True`, the response is returned as an iterator of chunks.
+            Streamed responses don't report their usage, so they are not metered.
     Returns:
         OpenAIObject: The ChatCompletion response from OpenAI
 
     """
-    completion: OpenAIObject = openai.ChatCompletion.create(
+    completion: OpenAIObject | Iterator[OpenAIObject] = openai.ChatCompletion.create(
         messages=messages,
         **kwargs,
     )
-    if not hasattr(completion, "error"):
+    if not kwargs.get("stream") and not hasattr(completion, "error"):
         logger.debug(f"Response: {completion}")
     return completion
 
@@ -281,6 +334,120 @@ def create_embedding(
     )
 
 
+MAX_POOLED_CONNECTIONS = 16
+"""The maximum number of connections the async API calls keep open per event loop"""
+
+_aiohttp_sessions: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, aiohttp.ClientSession
+] = weakref.WeakKeyDictionary()
+
+
+def _get_aiohttp_session() -> aiohttp.ClientSession:
+    """Returns the keep-alive HTTP session shared by the async API calls that run
+    on the current event loop"""
+    loop = asyncio.get_running_loop()
+    session = _aiohttp_sessions.get(loop)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=MAX_POOLED_CONNECTIONS)
+        )
+        _aiohttp_sessions[loop] = session
+    return session
+
+
+async def _with_shared_session(
+    request: Callable[..., Coroutine[Any, Any, OpenAIObject]], **kwargs
+) -> OpenAIObject:
+    if openai.aiosession.get() is not None:
+        # Don't override a session that was set by the caller
+        return await request(**kwargs)
+
+    token = openai.aiosession.set(_get_aiohttp_session())
+    try:
+        return await request(**kwargs)
+    finally:
+        openai.aiosession.reset(token)
+
+
+@meter_api
+@retry_api()
+async def acreate_chat_completion(
+    messages: List[MessageDict],
+    *_,
+    **kwargs,
+) -> OpenAIObject:
+    """Create a chat completion using the OpenAI API, without blocking the event
+    loop. Like `create_chat_completion`, but streaming is not supported."""
+    completion: OpenAIObject = await _with_shared_session(
+        openai.ChatCompletion.acreate, messages=messages, **kwargs
+    )
+    if not hasattr(completion, "error"):
+        logger.debug(f"Response: {completion}")
+    return completion
+
+
+@meter_api
+@retry_api()
+async def acreate_text_completion(
+    prompt: str,
+    *_,
+    **kwargs,
+) -> OpenAIObject:
+    """Create a text completion using the OpenAI API, without blocking the event loop"""
+    return await _with_shared_session(
+        openai.Completion.acreate, prompt=prompt, **kwargs
+    )
+
+
+@meter_api
+@retry_api()
+async def acreate_embedding(
+    input: str | TText | List[str] | List[TText],
+    *_,
+    **kwargs,
+) -> OpenAIObject:
+    """Create an embedding using the OpenAI API, without blocking the event loop"""
+    return await _with_shared_session(openai.Embedding.acreate, input=input, **kwargs)
+
+
+T = TypeVar("T")
+
+
+_background_event_loop_lock = threading.Lock()
+
+
+def _background_event_loop() -> asyncio.AbstractEventLoop:
+    with _background_event_loop_lock:
+        return _start_background_event_loop()
+
+
+@functools.lru_cache(maxsize=None)
+def _start_background_event_loop() -> asyncio.AbstractEventLoop:
+    loop = asyncio.new_event_loop()
+    threading.Thread(
+        target=loop.run_forever, name="openai-event-loop", daemon=True
+    ).start()
+
+    @atexit.register
+    def close_session():
+        if session := _aiohttp_sessions.get(loop):
+            asyncio.run_coroutine_threadsafe(session.close(), loop).result(timeout=5)
+
+    return loop
+
+
+def run_async(coroutine: Coroutine[Any, Any, T]) -> T:
+    """
+    Runs a coroutine, e.g. one of the async API functions, on a background event
+    loop and waits for its result. This allows synchronous code to use the async
+    API functions: calls from multiple threads run concurrently on the same loop
+    and share its pooled connections.
+    """
+    return asyncio.run_coroutine_threadsafe(
+        coroutine, _background_event_loop()
+    ).result()
+
+
 @dataclass
 class OpenAIFunctionCall:
     """Represents a function call as generated by an OpenAI model
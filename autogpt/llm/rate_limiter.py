@@ -0,0 +1,188 @@
+"""Client-side rate limiting of OpenAI API requests"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Iterator, Optional
+
+from autogpt.logs import logger
+from autogpt.singleton import Singleton
+
+
+class RequestPriority(IntEnum):
+    """The order in which waiting requests are sent; lower values go first"""
+
+    AGENT = 0
+    """Requests the agent's next step waits on"""
+    DEFAULT = 1
+    BACKGROUND = 2
+    """Requests nothing is directly waiting on, e.g. summarization"""
+
+
+@dataclass
+class _TokenBucket:
+    """Allows `capacity` units per minute, with bursts of up to `capacity` units"""
+
+    capacity: int
+    level: float = field(init=False)
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self.level = self.capacity
+
+    def refill(self, now: float) -> None:
+        elapsed = max(now - self.updated_at, 0)
+        self.level = min(self.capacity, self.level + elapsed * self.capacity / 60)
+        self.updated_at = now
+
+    def time_until_available(self, amount: float) -> float:
+        # A request larger than the bucket would wait forever, so it only waits
+        # until the bucket is full.
+        shortage = min(amount, self.capacity) - self.level
+        return max(shortage * 60 / self.capacity, 0)
+
+
+@dataclass
+class _ModelLimits:
+    requests: Optional[_TokenBucket] = None
+    tokens: Optional[_TokenBucket] = None
+    queue: list[tuple[int, int]] = field(default_factory=list)
+    """Heap of (priority, sequence number) of the waiting requests"""
+
+    def configure(self, requests_per_minute: int, tokens_per_minute: int) -> None:
+        for attr, capacity in (
+            ("requests", requests_per_minute),
+            ("tokens", tokens_per_minute),
+        ):
+            bucket: Optional[_TokenBucket] = getattr(self, attr)
+            if not capacity:
+                setattr(self, attr, None)
+            elif bucket is None:
+                setattr(self, attr, _TokenBucket(capacity))
+            else:
+                bucket.capacity = capacity
+
+    def buckets(self) -> Iterator[tuple[_TokenBucket, str]]:
+        if self.requests:
+            yield self.requests, "requests"
+        if self.tokens:
+            yield self.tokens, "tokens"
+
+
+class RateLimiter(metaclass=Singleton):
+    """Keeps the OpenAI API requests of this process within per-model limits
+
+    Each model has a token bucket for requests per minute and one for tokens per
+    minute. Before a request is sent, its prompt tokens are taken from the bucket;
+    when the response arrives, the difference with the actual usage is settled.
+    Requests that have to wait are sent in order of priority, then arrival.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._models: dict[str, _ModelLimits] = {}
+        self._sequence = itertools.count()
+
+    def reset(self):
+        with self._condition:
+            self._models.clear()
+            self._condition.notify_all()
+
+    @contextmanager
+    def request(
+        self,
+        model: str,
+        estimated_tokens: int,
+        priority: RequestPriority = RequestPriority.DEFAULT,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+    ) -> Iterator[RateLimitedRequest]:
+        """Waits until a request can be sent without exceeding the limits
+
+        Args:
+            model: The model the request is for.
+            estimated_tokens: The number of tokens the request is expected to use.
+            priority: The priority of the request.
+            requests_per_minute: The maximum number of requests per minute to the
+                model. 0 means no limit.
+            tokens_per_minute: The maximum number of tokens per minute to the
+                model. 0 means no limit.
+
+        Yields:
+            RateLimitedRequest: Report the actual usage of the request to this.
+        """
+        if not requests_per_minute and not tokens_per_minute:
+            yield RateLimitedRequest(self, model, estimated_tokens)
+            return
+
+        self._acquire(
+            model, estimated_tokens, priority, requests_per_minute, tokens_per_minute
+        )
+        yield RateLimitedRequest(self, model, estimated_tokens)
+
+    def _acquire(
+        self,
+        model: str,
+        tokens: int,
+        priority: RequestPriority,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+    ) -> None:
+        with self._condition:
+            limits = self._models.setdefault(model, _ModelLimits())
+            limits.configure(requests_per_minute, tokens_per_minute)
+
+            ticket = (int(priority), next(self._sequence))
+            heapq.heappush(limits.queue, ticket)
+            try:
+                while True:
+                    if limits.queue[0] != ticket:
+                        self._condition.wait()
+                        continue
+
+                    now = time.monotonic()
+                    wait, limiting = 0.0, ""
+                    for bucket, unit in limits.buckets():
+                        bucket.refill(now)
+                        amount = 1 if bucket is limits.requests else tokens
+                        if (t := bucket.time_until_available(amount)) > wait:
+                            wait, limiting = t, unit
+                    if not wait:
+                        break
+
+                    logger.debug(
+                        f"Waiting {wait:.2f}s for {model} {limiting} rate limit"
+                    )
+                    self._condition.wait(wait)
+
+                if limits.requests:
+                    limits.requests.level -= 1
+                if limits.tokens:
+                    limits.tokens.level -= tokens
+            finally:
+                limits.queue.remove(ticket)
+                heapq.heapify(limits.queue)
+                self._condition.notify_all()
+
+    def _settle(self, model: str, tokens: int) -> None:
+        with self._condition:
+            limits = self._models.get(model)
+            if limits and limits.tokens:
+                limits.tokens.level -= tokens
+                self._condition.notify_all()
+
+
+@dataclass
+class RateLimitedRequest:
+    rate_limiter: RateLimiter
+    model: str
+    estimated_tokens: int
+
+    def report_usage(self, total_tokens: int) -> None:
+        """Settles the difference between the estimated and actual token usage"""
+        self.rate_limiter._settle(self.model, total_tokens - self.estimated_tokens)
@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-from typing import List, Literal, Optional
+from typing import Callable, Iterator, List, Literal, Optional
 
 from colorama import Fore
+from openai.openai_object import OpenAIObject
 
 from autogpt.config import Config
 
@@ -14,6 +15,7 @@ from ..base import (
     Message,
     ResponseMessageDict,
 )
+from ..completion_cache import get_completion_cache
 from ..providers import openai as iopenai
 from ..providers.openai import (
     OPEN_AI_CHAT_MODELS,
@@ -21,6 +23,7 @@ from ..providers.openai import (
     OpenAIFunctionSpec,
     count_openai_functions_tokens,
 )
+from ..rate_limiter import RateLimitedRequest, RateLimiter, RequestPriority
 from .token_counter import *
 
 
@@ -72,6 +75,7 @@ def create_text_completion(
     model: Optional[str],
     temperature: Optional[float],
     max_output_tokens: Optional[int],
+    priority: RequestPriority = RequestPriority.DEFAULT,
 ) -> str:
     if model is None:
         model = config.fast_llm
@@ -81,12 +85,19 @@ def create_text_completion(
     kwargs = {"model": model}
     kwargs.update(config.get_openai_credentials(model))
 
-    response = iopenai.create_text_completion(
-        prompt=prompt,
-        **kwargs,
-        temperature=temperature,
-        max_tokens=max_output_tokens,
-    )
+    with RateLimiter().request(
+        model,
+        count_string_tokens(prompt, model),
+        priority,
+        **config.get_openai_rate_limits(model),
+    ) as request:
+        response = iopenai.create_text_completion(
+            prompt=prompt,
+            **kwargs,
+            temperature=temperature,
+            max_tokens=max_output_tokens,
+        )
+        _report_usage(request, response)
     logger.debug(f"Response: {response}")
 
     return response.choices[0].text
@@ -100,6 +111,8 @@ def create_chat_completion(
     model: Optional[str] = None,
     temperature: Optional[float] = None,
     max_tokens: Optional[int] = None,
+    stream_handler: Optional[Callable[[str], Optional[bool]]] = None,
+    priority: RequestPriority = RequestPriority.DEFAULT,
 ) -> ChatModelResponse:
     """Create a chat completion using the OpenAI API
 
@@ -108,6 +121,11 @@ def create_chat_completion(
         model (str, optional): The model to use. Defaults to None.
         temperature (float, optional): The temperature to use. Defaults to 0.9.
         max_tokens (int, optional): The max tokens to use. Defaults to None.
+        stream_handler (Callable, optional): If set, the response is streamed and
+            this is called with every piece of content as it arrives. When it
+            returns True, the rest of the response is discarded.
+        priority (RequestPriority, optional): The priority of the request if it
+            has to wait for the configured rate limits.
 
     Returns:
         str: The response from the chat completion
@@ -117,14 +135,15 @@ def create_chat_completion(
         model = prompt.model.name
     if temperature is None:
         temperature = config.temperature
+
+    prompt_tlength = prompt.token_length
+    logger.debug(f"Prompt length: {prompt_tlength} tokens")
+    if functions:
+        functions_tlength = count_openai_functions_tokens(functions, model)
+        prompt_tlength += functions_tlength
+        logger.debug(f"Functions take up {functions_tlength} tokens in API call")
     if max_tokens is None:
-        prompt_tlength = prompt.token_length
         max_tokens = OPEN_AI_CHAT_MODELS[model].max_tokens - prompt_tlength
-        logger.debug(f"Prompt length: {prompt_tlength} tokens")
-        if functions:
-            functions_tlength = count_openai_functions_tokens(functions, model)
-            max_tokens -= functions_tlength
-            logger.debug(f"Functions take up {functions_tlength} tokens in API call")
 
     logger.debug(
         f"{Fore.GREEN}Creating chat completion with model {model}, temperature {temperature}, max_tokens {max_tokens}{Fore.RESET}"
@@ -154,17 +173,44 @@ def create_chat_completion(
             function.schema for function in functions
         ]
 
-    response = iopenai.create_chat_completion(
-        messages=prompt.raw(),
-        **chat_completion_kwargs,
+    cache = (
+        get_completion_cache(config)
+        if temperature == 0 and stream_handler is None
+        else None
     )
-    logger.debug(f"Response: {response}")
-
-    if hasattr(response, "error"):
-        logger.error(response.error)
-        raise RuntimeError(response.error)
+    if cache is None:
+        first_message = _send_chat_completion(
+            prompt,
+            functions,
+            chat_completion_kwargs,
+            prompt_tlength,
+            config,
+            priority,
+            stream_handler,
+        )
+    else:
+        cache_key = cache.key(
+            model,
+            prompt.raw(),
+            chat_completion_kwargs.get("functions"),
+            temperature,
+            max_tokens,
+        )
+        first_message = cache.get(cache_key)
+        ApiManager().update_completion_cache_stats(hit=first_message is not None)
+        if first_message is not None:
+            logger.debug(f"Cached response: {first_message}")
+        else:
+            first_message = _send_chat_completion(
+                prompt,
+                functions,
+                chat_completion_kwargs,
+                prompt_tlength,
+                config,
+                priority,
+            )
+            cache.put(cache_key, first_message)
 
-    first_message: ResponseMessageDict = response.choices[0].message
     content: str | None = first_message.get("content")
     function_call: FunctionCallDict | None = first_message.get("function_call")
 
@@ -185,6 +231,112 @@ def create_chat_completion(
     )
 
 
+def _send_chat_completion(
+    prompt: ChatSequence,
+    functions: Optional[List[OpenAIFunctionSpec]],
+    chat_completion_kwargs: dict,
+    prompt_tlength: int,
+    config: Config,
+    priority: RequestPriority,
+    stream_handler: Optional[Callable[[str], Optional[bool]]] = None,
+) -> ResponseMessageDict:
+    """Sends a chat completion request to the API and returns the response message"""
+    model = chat_completion_kwargs["model"]
+    with RateLimiter().request(
+        model, prompt_tlength, priority, **config.get_openai_rate_limits(model)
+    ) as request:
+        if stream_handler is not None:
+            first_message = _receive_chat_completion_stream(
+                iopenai.create_chat_completion(
+                    messages=prompt.raw(),
+                    stream=True,
+                    **chat_completion_kwargs,
+                ),
+                stream_handler,
+            )
+            logger.debug(f"Streamed response: {first_message}")
+            request.report_usage(
+                _update_streamed_chat_completion_cost(
+                    prompt, functions, first_message, model
+                )
+            )
+        else:
+            response = iopenai.create_chat_completion(
+                messages=prompt.raw(),
+                **chat_completion_kwargs,
+            )
+            _report_usage(request, response)
+            logger.debug(f"Response: {response}")
+
+            if hasattr(response, "error"):
+                logger.error(response.error)
+                raise RuntimeError(response.error)
+
+            first_message: ResponseMessageDict = response.choices[0].message
+    return first_message
+
+
+def _receive_chat_completion_stream(
+    chunks: Iterator[OpenAIObject],
+    stream_handler: Callable[[str], Optional[bool]],
+) -> ResponseMessageDict:
+    """Puts a streamed chat completion back together into a response message"""
+    content: list[str] = []
+    function_call: FunctionCallDict | None = None
+    try:
+        for chunk in chunks:
+            delta = chunk.choices[0].delta
+            if "function_call" in delta:
+                function_call = function_call or {"name": "", "arguments": ""}
+                function_call["name"] += delta.function_call.get("name", "")
+                function_call["arguments"] += delta.function_call.get("arguments", "")
+            if delta.get("content"):
+                content.append(delta.content)
+                if stream_handler(delta.content):
+                    break
+    finally:
+        if hasattr(chunks, "close"):
+            chunks.close()
+
+    return {
+        "role": "assistant",
+        "content": "".join(content) if content else None,
+        "function_call": function_call,
+    }
+
+
+def _update_streamed_chat_completion_cost(
+    prompt: ChatSequence,
+    functions: Optional[List[OpenAIFunctionSpec]],
+    response_message: ResponseMessageDict,
+    model: str,
+) -> int:
+    """Streamed responses don't report their usage, so it is counted here
+
+    Returns:
+        int: The total number of tokens used
+    """
+    prompt_tokens = count_message_tokens(prompt.messages, model)
+    if functions:
+        prompt_tokens += count_openai_functions_tokens(functions, model)
+
+    completion_tokens = 0
+    if response_message["content"]:
+        completion_tokens += count_string_tokens(response_message["content"], model)
+    if function_call := response_message["function_call"]:
+        completion_tokens += count_string_tokens(
+            function_call["name"] + function_call["arguments"], model
+        )
+
+    ApiManager().update_cost(prompt_tokens, completion_tokens, model)
+    return prompt_tokens + completion_tokens
+
+
+def _report_usage(request: RateLimitedRequest, response: OpenAIObject) -> None:
+    if (usage := getattr(response, "usage", None)) and "total_tokens" in usage:
+        request.report_usage(usage.total_tokens)
+
+
 def check_model(
     model_name: str,
     model_type: Literal["smart_llm", "fast_llm"],
@@ -1,6 +1,10 @@
 """Functions for counting the number of tokens in a message or string."""
 from __future__ import annotations
 
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
 from typing import List, overload
 
 import tiktoken
@@ -8,6 +12,44 @@ import tiktoken
 from autogpt.llm.base import Message
 from autogpt.logs import logger
 
+TOKEN_COUNT_CACHE_SIZE = 4096
+"""The maximum number of token counts remembered by `count_text_tokens`"""
+
+_token_counts: OrderedDict[tuple[str, bytes], int] = OrderedDict()
+_token_counts_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def get_tokenizer(model_name: str) -> tiktoken.Encoding:
+    """
+    Returns the tiktoken encoding for a model. The encoding is only looked up once.
+
+    Raises:
+        KeyError: if tiktoken doesn't know the model
+    """
+    return tiktoken.encoding_for_model(model_name)
+
+
+def count_text_tokens(text: str, encoding: tiktoken.Encoding) -> int:
+    """
+    Returns the number of tokens in a text. The most recently used counts are
+    memoized by encoding and hash of the text, so counting the same text again
+    doesn't encode it again.
+    """
+    key = (encoding.name, hashlib.blake2b(text.encode(), digest_size=16).digest())
+    with _token_counts_lock:
+        if key in _token_counts:
+            _token_counts.move_to_end(key)
+            return _token_counts[key]
+
+    n_tokens = len(encoding.encode(text))
+
+    with _token_counts_lock:
+        _token_counts[key] = n_tokens
+        if len(_token_counts) > TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return n_tokens
+
 
 @overload
 def count_message_tokens(messages: Message, model: str = "gpt-3.5-turbo") -> int:
@@ -54,7 +96,7 @@ def count_message_tokens(
             " information on how messages are converted to tokens."
         )
     try:
-        encoding = tiktoken.encoding_for_model(encoding_model)
+        encoding = get_tokenizer(encoding_model)
     except KeyError:
         logger.warn("Warning: model not found. Using cl100k_base encoding.")
         encoding = tiktoken.get_encoding("cl100k_base")
@@ -62,10 +104,17 @@ def count_message_tokens(
     num_tokens = 0
     for message in messages:
         num_tokens += tokens_per_message
-        for key, value in message.raw().items():
-            num_tokens += len(encoding.encode(value))
-            if key == "name":
-                num_tokens += tokens_per_name
+        # Messages remember their own token count, so the message history
+        # doesn't have to be counted again for every cycle
+        message_tokens = message.cached_token_count(encoding_model)
+        if message_tokens is None:
+            message_tokens = 0
+            for key, value in message.raw().items():
+                message_tokens += count_text_tokens(value, encoding)
+                if key == "name":
+                    message_tokens += tokens_per_name
+            message.cache_token_count(encoding_model, message_tokens)
+        num_tokens += message_tokens
     num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
     return num_tokens
 
@@ -81,5 +130,4 @@ def count_string_tokens(string: str, model_name: str) -> int:
     Returns:
         int: The number of tokens in the text string.
     """
-    encoding = tiktoken.encoding_for_model(model_name)
-    return len(encoding.encode(string))
+    return count_text_tokens(string, get_tokenizer(model_name))
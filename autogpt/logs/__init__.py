@@ -12,4 +12,8 @@ from .log_cycle import (
     LogCycleHandler,
 )
 from .logger import Logger, logger
-from .utils import print_assistant_thoughts, remove_ansi_escape
+from .utils import (
+    StreamingThoughtsPrinter,
+    print_assistant_thoughts,
+    remove_ansi_escape,
+)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable, Optional
 
 from colorama import Fore
 
@@ -9,56 +9,133 @@ if TYPE_CHECKING:
 
 from .logger import logger
 
+THOUGHT_FIELDS = ["text", "reasoning", "plan", "criticism", "speak"]
+"""The fields of the assistant's thoughts, in the order they are printed"""
+
 
 def print_assistant_thoughts(
     ai_name: str,
     assistant_reply_json_valid: dict,
     config: Config,
 ) -> None:
-    from autogpt.speech import say_text
+    assistant_thoughts = assistant_reply_json_valid.get("thoughts", {})
+    for field in THOUGHT_FIELDS:
+        print_assistant_thought(ai_name, field, assistant_thoughts, config)
 
-    assistant_thoughts_reasoning = None
-    assistant_thoughts_plan = None
-    assistant_thoughts_speak = None
-    assistant_thoughts_criticism = None
 
-    assistant_thoughts = assistant_reply_json_valid.get("thoughts", {})
-    assistant_thoughts_text = remove_ansi_escape(assistant_thoughts.get("text", ""))
-    if assistant_thoughts:
-        assistant_thoughts_reasoning = remove_ansi_escape(
-            assistant_thoughts.get("reasoning", "")
-        )
-        assistant_thoughts_plan = remove_ansi_escape(assistant_thoughts.get("plan", ""))
-        assistant_thoughts_criticism = remove_ansi_escape(
-            assistant_thoughts.get("criticism", "")
-        )
-        assistant_thoughts_speak = remove_ansi_escape(
-            assistant_thoughts.get("speak", "")
+def print_assistant_thought(
+    ai_name: str,
+    field: str,
+    assistant_thoughts: dict,
+    config: Config,
+) -> None:
+    """Prints one of the THOUGHT_FIELDS of the assistant's thoughts"""
+    from autogpt.speech import say_text
+
+    if field == "text":
+        assistant_thoughts_text = remove_ansi_escape(assistant_thoughts.get("text", ""))
+        logger.typewriter_log(
+            f"{ai_name.upper()} THOUGHTS:", Fore.YELLOW, assistant_thoughts_text
         )
-    logger.typewriter_log(
-        f"{ai_name.upper()} THOUGHTS:", Fore.YELLOW, assistant_thoughts_text
+        return
+
+    value = (
+        remove_ansi_escape(assistant_thoughts.get(field, ""))
+        if assistant_thoughts
+        else None
     )
-    logger.typewriter_log("REASONING:", Fore.YELLOW, str(assistant_thoughts_reasoning))
-    if assistant_thoughts_plan:
+    if field == "reasoning":
+        logger.typewriter_log("REASONING:", Fore.YELLOW, str(value))
+    elif field == "plan" and value:
         logger.typewriter_log("PLAN:", Fore.YELLOW, "")
         # If it's a list, join it into a string
-        if isinstance(assistant_thoughts_plan, list):
-            assistant_thoughts_plan = "\n".join(assistant_thoughts_plan)
-        elif isinstance(assistant_thoughts_plan, dict):
-            assistant_thoughts_plan = str(assistant_thoughts_plan)
+        if isinstance(value, list):
+            value = "\n".join(value)
+        elif isinstance(value, dict):
+            value = str(value)
 
         # Split the input_string using the newline character and dashes
-        lines = assistant_thoughts_plan.split("\n")
+        lines = value.split("\n")
         for line in lines:
             line = line.lstrip("- ")
             logger.typewriter_log("- ", Fore.GREEN, line.strip())
-    logger.typewriter_log("CRITICISM:", Fore.YELLOW, f"{assistant_thoughts_criticism}")
+    elif field == "criticism":
+        logger.typewriter_log("CRITICISM:", Fore.YELLOW, f"{value}")
     # Speak the assistant's thoughts
-    if assistant_thoughts_speak:
+    elif field == "speak" and value:
         if config.speak_mode:
-            say_text(assistant_thoughts_speak, config)
+            say_text(value, config)
         else:
-            logger.typewriter_log("SPEAK:", Fore.YELLOW, f"{assistant_thoughts_speak}")
+            logger.typewriter_log("SPEAK:", Fore.YELLOW, f"{value}")
+
+
+class StreamingThoughtsPrinter:
+    """
+    Prints the assistant's thoughts while its response is being streamed: each
+    field is printed as soon as it has been received completely. Pass an instance
+    as `stream_handler` to `create_chat_completion`, and call `print_remaining`
+    with the parsed response once it is complete.
+    """
+
+    def __init__(
+        self,
+        ai_name: str,
+        config: Config,
+        before_first_print: Optional[Callable[[], None]] = None,
+    ):
+        from autogpt.json_utils.utilities import StreamingJSONParser
+
+        self.ai_name = ai_name
+        self.config = config
+        self.before_first_print = before_first_print
+        self.parser = StreamingJSONParser()
+        self.n_printed = 0
+
+    def __call__(self, content: str) -> bool:
+        """
+        Handles the next piece of the response.
+
+        Returns:
+            bool: Whether the response is complete, so the rest of the stream
+                can be discarded
+        """
+        self.parser.feed(content)
+        if self.n_printed < len(THOUGHT_FIELDS):
+            if (reply := self.parser.parse()) is not None:
+                self._print_received_thoughts(reply)
+        return self.parser.complete and self.parser.started_at_beginning
+
+    def _print_received_thoughts(self, reply: dict) -> None:
+        thoughts = reply.get("thoughts")
+        if not isinstance(thoughts, dict) or not thoughts:
+            return
+
+        thoughts_complete = list(reply)[-1] != "thoughts" or self.parser.depth < 2
+        # The last field is complete once it's followed by a comma
+        last_field = list(thoughts)[-1]
+        last_field_complete = (
+            self.parser.depth == 2 and self.parser.text.rstrip().endswith(",")
+        )
+        while self.n_printed < len(THOUGHT_FIELDS):
+            field = THOUGHT_FIELDS[self.n_printed]
+            if not thoughts_complete and (
+                field not in thoughts
+                or (field == last_field and not last_field_complete)
+            ):
+                break
+            self._print(field, thoughts)
+
+    def print_remaining(self, assistant_reply_json_valid: dict) -> None:
+        """Prints the fields of the thoughts that haven't been printed yet"""
+        assistant_thoughts = assistant_reply_json_valid.get("thoughts", {})
+        while self.n_printed < len(THOUGHT_FIELDS):
+            self._print(THOUGHT_FIELDS[self.n_printed], assistant_thoughts)
+
+    def _print(self, field: str, assistant_thoughts: dict) -> None:
+        if self.n_printed == 0 and self.before_first_print:
+            self.before_first_print()
+        print_assistant_thought(self.ai_name, field, assistant_thoughts, self.config)
+        self.n_printed += 1
 
 
 def remove_ansi_escape(s: str) -> str:
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import bisect
 import copy
 import json
-from dataclasses import dataclass
-from typing import TYPE_CHECKING, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterator, Optional
 
 if TYPE_CHECKING:
     from autogpt.agent import Agent
@@ -19,6 +20,9 @@ from autogpt.llm.utils import (
 )
 from autogpt.logs import PROMPT_SUMMARY_FILE_NAME, SUMMARY_FILE_NAME, logger
 
+Cycle = tuple[Optional[Message], Message, Message]
+"""User input (if any), AI response and action result of one cycle"""
+
 
 @dataclass
 class MessageHistory(ChatSequence):
@@ -27,6 +31,22 @@ class MessageHistory(ChatSequence):
     summary: str = "I was created"
     last_trimmed_index: int = 0
 
+    # Cycles parsed from the messages so far, and the token length sums of the
+    # first n cycles per model. These are extended as messages are appended.
+    _cycles: list[Cycle] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _cycle_tlength_sums: dict[str, list[int]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _indexed_messages: Optional[list[Message]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _n_indexed_messages: int = field(default=0, init=False, repr=False, compare=False)
+    _last_indexed_message: Optional[Message] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
     SUMMARIZATION_PROMPT = '''Your task is to create a concise running summary of actions and information results in the provided text, focusing on key and potentially important information to remember.
 
 You will receive the current summary and your latest actions. Combine them, adding relevant key information from the latest development in 1st person past tense and keeping the summary concise.
@@ -80,15 +100,78 @@ Latest Development:
 
         return new_summary_message, new_messages_not_in_chain
 
-    def per_cycle(self, messages: list[Message] | None = None):
+    def per_cycle(self, messages: list[Message] | None = None) -> Iterator[Cycle]:
         """
         Yields:
             Message: a message containing user input
             Message: a message from the AI containing a proposed action
             Message: the message containing the result of the AI's proposed action
         """
-        messages = messages or self.messages
-        for i in range(0, len(messages) - 1):
+        if messages:
+            yield from self._parse_cycles(messages)
+        else:
+            yield from self._index_cycles()
+
+    def most_recent_cycles(
+        self, max_tlength: int, model: str
+    ) -> tuple[list[Message], int]:
+        """
+        Returns the messages of the most recent cycles that together fit in a
+        token budget.
+
+        Args:
+            max_tlength (int): The maximum total token length of the cycles
+            model (str): The model to count tokens for
+
+        Returns:
+            list[Message]: The messages of the cycles, in chronological order
+            int: The token length of the cycles
+        """
+        tlength_sums = self._get_cycle_tlength_sums(model)
+        n_cycles = len(tlength_sums) - 1
+
+        # The cycles from `first` onwards are the longest suffix within budget
+        first = min(
+            bisect.bisect_left(tlength_sums, tlength_sums[-1] - max_tlength), n_cycles
+        )
+        messages = [
+            msg for cycle in self._cycles[first:] for msg in cycle if msg is not None
+        ]
+        return messages, tlength_sums[-1] - tlength_sums[first]
+
+    def _get_cycle_tlength_sums(self, model: str) -> list[int]:
+        cycles = self._index_cycles()
+        tlength_sums = self._cycle_tlength_sums.setdefault(model, [0])
+        for cycle in cycles[len(tlength_sums) - 1 :]:
+            tlength_sums.append(
+                tlength_sums[-1]
+                + count_message_tokens([msg for msg in cycle if msg is not None], model)
+            )
+        return tlength_sums
+
+    def _index_cycles(self) -> list[Cycle]:
+        """Parses the cycles in messages that were appended since the last call"""
+        messages = self.messages
+        if (
+            messages is not self._indexed_messages
+            or len(messages) <= self._n_indexed_messages
+            or messages[self._n_indexed_messages] is not self._last_indexed_message
+        ):
+            # The messages were changed in another way than by appending to them
+            self._cycles = []
+            self._cycle_tlength_sums = {}
+            self._indexed_messages = messages
+            self._n_indexed_messages = 0
+
+        self._cycles.extend(self._parse_cycles(messages, self._n_indexed_messages))
+        if messages:
+            self._n_indexed_messages = len(messages) - 1
+            self._last_indexed_message = messages[-1]
+        return self._cycles
+
+    @staticmethod
+    def _parse_cycles(messages: list[Message], start: int = 0) -> Iterator[Cycle]:
+        for i in range(start, len(messages) - 1):
             ai_message = messages[i]
             if ai_message.type != "ai_response":
                 continue
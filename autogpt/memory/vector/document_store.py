@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+from typing import Callable, NamedTuple
+
+import orjson
+
+from autogpt.config import Config
+from autogpt.logs import logger
+from autogpt.sqlite_store import SQLiteStore, open_store
+
+from .memory_item import MemoryItem
+
+DOCUMENT_STORE_FILE = "document_store.sqlite3"
+
+
+class StoredDocument(NamedTuple):
+    mtime_ns: int
+    size: int
+    content_hash: str
+    models: str
+    """The models the memory was made with, as returned by `DocumentStore.models`"""
+    memory: MemoryItem
+
+
+class DocumentStore(SQLiteStore):
+    """
+    On-disk store of the memories of the files in the workspace, keyed by path.
+
+    A stored memory is reused as is while the modification time and size of the
+    file, or else the hash of its content, are unchanged. When the file has changed,
+    the summaries and embeddings of the chunks that are still in it are reused, so
+    only the chunks whose text changed are summarized and embedded again.
+    """
+
+    SAVE_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS
+
+    TABLE = "documents"
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS documents ("
+        "  path TEXT PRIMARY KEY,"
+        "  mtime_ns INTEGER NOT NULL,"
+        "  size INTEGER NOT NULL,"
+        "  content_hash TEXT NOT NULL,"
+        "  models TEXT NOT NULL,"
+        "  memory BLOB NOT NULL"
+        ")"
+    ]
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def models(config: Config) -> str:
+        """Identifies the models that summaries and embeddings are made with"""
+        return f"{config.fast_llm}:{config.embedding_model}"
+
+    def get(self, path: str) -> StoredDocument | None:
+        """Returns the stored document for a file path, or None if there is none"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mtime_ns, size, content_hash, models, memory FROM documents"
+                " WHERE path = ?",
+                (path,),
+            ).fetchone()
+        if row is None:
+            return None
+        *document, memory = row
+        return StoredDocument(*document, MemoryItem(**orjson.loads(memory)))
+
+    def put(self, path: str, document: StoredDocument) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO documents VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    path,
+                    document.mtime_ns,
+                    document.size,
+                    document.content_hash,
+                    document.models,
+                    orjson.dumps(
+                        dataclasses.asdict(document.memory), option=self.SAVE_OPTIONS
+                    ),
+                ),
+            )
+
+    def memorize_file(
+        self, path: str, read_content: Callable[[], str], config: Config
+    ) -> MemoryItem:
+        """Returns the memory of a text file, reusing as much as possible of the
+        memory that was stored for it
+
+        Args:
+            path: The path of the file
+            read_content: Reads the text of the file; not called if the file is
+                unchanged since it was stored
+            config: The config object
+        """
+        # Stat before reading, so that changes made while reading are noticed later
+        stat = os.stat(path)
+        models = self.models(config)
+        stored = self.get(path)
+        if stored is not None and stored.models != models:
+            stored = None
+
+        if stored is not None and (stored.mtime_ns, stored.size) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            logger.debug(f"Using stored memory of unchanged file {path}")
+            return stored.memory
+
+        content = read_content()
+        content_hash = self.content_hash(content)
+        if stored is not None and stored.content_hash == content_hash:
+            logger.debug(f"Using stored memory of {path}, its content is unchanged")
+            memory = stored.memory
+        else:
+            known_chunks = (
+                {
+                    chunk: (summary, embedding)
+                    for chunk, summary, embedding in zip(
+                        stored.memory.chunks,
+                        stored.memory.chunk_summaries,
+                        stored.memory.e_chunks,
+                    )
+                }
+                if stored is not None
+                else {}
+            )
+            memory = MemoryItem.from_text_file(
+                content, path, config, known_chunks=known_chunks
+            )
+
+        self.put(
+            path,
+            StoredDocument(
+                stat.st_mtime_ns, stat.st_size, content_hash, models, memory
+            ),
+        )
+        return memory
+
+
+def get_document_store(config: Config) -> DocumentStore | None:
+    """Returns the document store for the configured workspace, if enabled"""
+    if not config.document_store or not config.workspace_path:
+        return None
+    return open_store(DocumentStore, config, DOCUMENT_STORE_FILE)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Sequence
+
+import numpy as np
+
+from autogpt.config import Config
+from autogpt.llm.base import TText
+from autogpt.sqlite_store import SQLiteStore, open_store
+
+if TYPE_CHECKING:
+    from .utils import Embedding
+
+EMBEDDING_CACHE_FILE = "embedding_cache.sqlite3"
+
+
+class EmbeddingCache(SQLiteStore):
+    """
+    On-disk cache of embeddings, keyed by the embedding model and the SHA-256 hash
+    of the (normalized) input. When the cache holds more than `max_entries`
+    embeddings, the least recently used ones are evicted.
+    """
+
+    TABLE = "embeddings"
+    SCHEMA = [
+        "CREATE TABLE IF NOT EXISTS embeddings ("
+        "  model TEXT NOT NULL,"
+        "  key TEXT NOT NULL,"
+        "  embedding BLOB NOT NULL,"
+        "  last_used INTEGER NOT NULL,"
+        "  PRIMARY KEY (model, key)"
+        ")",
+        "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)",
+    ]
+
+    max_entries: int
+    hits: int
+    misses: int
+
+    def __init__(self, path: Path, max_entries: int):
+        super().__init__(path)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        self._clock = self._connection.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM embeddings"
+        ).fetchone()[0]
+
+    @staticmethod
+    def key(input: str | TText) -> str:
+        """Returns the cache key for an (already normalized) embedding input"""
+        if isinstance(input, str):
+            return hashlib.sha256(f"text:{input}".encode()).hexdigest()
+        return hashlib.sha256(
+            f"tokens:{','.join(map(str, input))}".encode()
+        ).hexdigest()
+
+    def get_many(
+        self, model: str, inputs: Sequence[str | TText]
+    ) -> list[Embedding | None]:
+        """Returns the cached embedding for each input, or None if it's not cached"""
+        keys = [self.key(i) for i in inputs]
+        with self._lock:
+            found: dict[str, bytes] = {}
+            # Stay well below SQLite's limit on the number of query parameters
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                found.update(
+                    self._connection.execute(
+                        "SELECT key, embedding FROM embeddings"
+                        f" WHERE model = ? AND key IN ({','.join('?' * len(batch))})",
+                        (model, *batch),
+                    ).fetchall()
+                )
+
+            if found:
+                self._clock += 1
+                with self._connection:
+                    self._connection.executemany(
+                        "UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?",
+                        [(self._clock, model, k) for k in found],
+                    )
+
+            n_hits = sum(k in found for k in keys)
+            self.hits += n_hits
+            self.misses += len(keys) - n_hits
+
+        return [
+            np.frombuffer(found[k], dtype=np.float32).tolist() if k in found else None
+            for k in keys
+        ]
+
+    def put_many(
+        self, model: str, inputs: Sequence[str | TText], embeddings: list[Embedding]
+    ) -> None:
+        """Stores embeddings in the cache and evicts the least recently used ones"""
+        with self._lock:
+            self._clock += 1
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            model,
+                            self.key(i),
+                            np.asarray(e, dtype=np.float32).tobytes(),
+                            self._clock,
+                        )
+                        for i, e in zip(inputs, embeddings)
+                    ],
+                )
+                self._evict_least_recently_used(self.max_entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def get_embedding_cache(config: Config) -> EmbeddingCache | None:
+    """Returns the embedding cache for the configured workspace, if enabled"""
+    if not config.embedding_cache or not config.workspace_path:
+        return None
+    return open_store(
+        EmbeddingCache,
+        config,
+        EMBEDDING_CACHE_FILE,
+        config.embedding_cache_max_entries,
+    )
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+import numpy as np
+
+from .memory_item import MemoryItem, MemoryItemRelevance
+from .utils import Embedding
+
+
+class EmbeddingIndex:
+    """
+    Keeps the summary and chunk embeddings of a list of MemoryItems in a
+    contiguous float32 matrix, so that a query can be scored against all of them
+    with one matrix-vector product.
+
+    The rows of each item are stored contiguously: first the summary embedding,
+    then the embeddings of its chunks. `item_offsets[i]` is the first row of the
+    i-th item, `item_offsets[i + 1]` is the row after its last chunk.
+
+    The matrix consists of an optional read-only base block, e.g. a memory-mapped
+    file, followed by a growable in-memory block to which new items are added.
+    """
+
+    INITIAL_CAPACITY = 64
+
+    _base: np.ndarray | None
+    _tail: np.ndarray | None
+    _n_tail_rows: int
+    item_offsets: list[int]
+
+    def __init__(self, items: Iterable[MemoryItem] = ()):
+        self.clear()
+        for item in items:
+            self.add(item)
+
+    @classmethod
+    def from_matrix(cls, matrix: np.ndarray, item_offsets: list[int]):
+        """
+        Creates an index on top of an existing embedding matrix without copying it
+
+        Params:
+            matrix: the (n_rows x dimensions) embedding matrix
+            item_offsets: the first row of every item, followed by n_rows
+        """
+        if item_offsets[0] != 0 or item_offsets[-1] != len(matrix):
+            raise ValueError(
+                f"Item offsets don't match embedding matrix with {len(matrix)} rows"
+            )
+        index = cls()
+        index._base = matrix
+        index.item_offsets = list(item_offsets)
+        return index
+
+    def __len__(self) -> int:
+        """The number of items in the index"""
+        return len(self.item_offsets) - 1
+
+    @property
+    def dimensions(self) -> int | None:
+        for block in (self._base, self._tail):
+            if block is not None:
+                return block.shape[1]
+        return None
+
+    def add(self, item: MemoryItem) -> None:
+        """Appends the embeddings of a MemoryItem to the index"""
+        rows = np.vstack(
+            [
+                np.asarray(item.e_summary, dtype=np.float32),
+                *(np.asarray(e, dtype=np.float32) for e in item.e_chunks),
+            ]
+        )
+        self._reserve(self._n_tail_rows + len(rows), rows.shape[1])
+        self._tail[self._n_tail_rows : self._n_tail_rows + len(rows)] = rows
+        self._n_tail_rows += len(rows)
+        self.item_offsets.append(self.item_offsets[-1] + len(rows))
+
+    def clear(self) -> None:
+        """Removes all items from the index"""
+        self._base = None
+        self._tail = None
+        self._n_tail_rows = 0
+        self.item_offsets = [0]
+
+    def _reserve(self, n_rows: int, dimensions: int) -> None:
+        if self.dimensions not in (None, dimensions):
+            raise ValueError(
+                f"Embedding has {dimensions} dimensions, index has {self.dimensions}"
+            )
+
+        if self._tail is None:
+            self._tail = np.empty(
+                (max(self.INITIAL_CAPACITY, n_rows), dimensions), dtype=np.float32
+            )
+        elif n_rows > len(self._tail):
+            grown = np.empty(
+                (max(2 * len(self._tail), n_rows), dimensions), dtype=np.float32
+            )
+            grown[: self._n_tail_rows] = self._tail[: self._n_tail_rows]
+            self._tail = grown
+
+    def scores(self, e_query: Embedding) -> np.ndarray:
+        """Returns the relevance score of every row in the index for the query"""
+        e_query = np.asarray(e_query, dtype=np.float32)
+        blocks = [
+            block
+            for block in (
+                self._base,
+                self._tail[: self._n_tail_rows] if self._tail is not None else None,
+            )
+            if block is not None and len(block) > 0
+        ]
+        if not blocks:
+            return np.empty(0, dtype=np.float32)
+        return np.concatenate([block @ e_query for block in blocks])
+
+    def top_k(
+        self,
+        memories: Sequence[MemoryItem],
+        for_query: str,
+        e_query: Embedding,
+        k: int,
+    ) -> list[MemoryItemRelevance]:
+        """
+        Returns the top-k most relevant memories for the given query embedding.
+
+        Params:
+            memories: the items this index was built from, in the same order
+            for_query: the query the embedding was made for
+            e_query: the query embedding
+            k: the number of relevant memories to fetch
+        """
+        if len(self) < 1 or k < 1:
+            return []
+
+        scores = self.scores(e_query)
+        # Aggregate relevance of an item is the max over its summary and chunks
+        item_scores = np.maximum.reduceat(scores, self.item_offsets[:-1])
+
+        k = min(k, len(item_scores))
+        top_k = np.argpartition(item_scores, -k)[-k:]
+        top_k = top_k[np.argsort(item_scores[top_k])[::-1]]
+
+        return [self._relevance(memories[i], i, for_query, scores) for i in top_k]
+
+    def relevances(
+        self, memories: Sequence[MemoryItem], for_query: str, e_query: Embedding
+    ) -> list[MemoryItemRelevance]:
+        """Returns MemoryItemRelevance for every memory in the index"""
+        scores = self.scores(e_query)
+        return [
+            self._relevance(m, i, for_query, scores) for i, m in enumerate(memories)
+        ]
+
+    def _relevance(
+        self, memory: MemoryItem, i: int, for_query: str, scores: np.ndarray
+    ) -> MemoryItemRelevance:
+        start, end = self.item_offsets[i], self.item_offsets[i + 1]
+        return MemoryItemRelevance(
+            memory_item=memory,
+            for_query=for_query,
+            summary_relevance_score=float(scores[start]),
+            chunk_relevance_scores=scores[start + 1 : end].tolist(),
+        )
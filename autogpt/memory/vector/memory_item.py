@@ -10,7 +10,13 @@ from autogpt.config import Config
 from autogpt.llm import Message
 from autogpt.llm.utils import count_string_tokens
 from autogpt.logs import logger
-from autogpt.processing.text import chunk_content, split_text, summarize_text
+from autogpt.processing.text import (
+    chunk_content,
+    split_paragraphs,
+    split_text,
+    summarize_chunks,
+    summarize_text,
+)
 
 from .utils import Embedding, get_embedding
 
@@ -40,35 +46,52 @@ class MemoryItem:
         metadata: dict = {},
         how_to_summarize: str | None = None,
         question_for_summary: str | None = None,
+        known_chunks: dict[str, tuple[str, Embedding]] = {},
     ):
+        """Create a memory of a text, by chunking, summarizing and embedding it
+
+        Args:
+            known_chunks: The summary and embedding of chunks that have already
+                been memorized, e.g. from a previous version of the text. These
+                chunks aren't summarized and embedded again. Only the chunks of
+                text files keep their boundaries when the text is edited, see
+                `split_paragraphs`.
+        """
         logger.debug(f"Memorizing text:\n{'-'*32}\n{text}\n{'-'*32}\n")
 
-        chunks = [
-            chunk
-            for chunk, _ in (
-                split_text(text, config.embedding_model, config)
-                if source_type != "code_file"
-                else chunk_content(text, config.embedding_model)
-            )
-        ]
+        if source_type == "code_file":
+            split = chunk_content(text, config.embedding_model)
+        elif source_type == "text_file":
+            # Files are memorized again when they change; chunking them by
+            # paragraphs lets the unchanged chunks be reused
+            split = split_paragraphs(text, config.embedding_model, config)
+        else:
+            split = split_text(text, config.embedding_model, config)
+        chunks = [chunk for chunk, _ in split]
         logger.debug("Chunks: " + str(chunks))
 
-        chunk_summaries = [
-            summary
-            for summary, _ in [
-                summarize_text(
-                    text_chunk,
+        new_chunks = list(dict.fromkeys(c for c in chunks if c not in known_chunks))
+        if known_chunks:
+            logger.debug(
+                f"Reusing {len(chunks) - len(new_chunks)} of {len(chunks)} chunks"
+            )
+        new_chunk_summaries = dict(
+            zip(
+                new_chunks,
+                summarize_chunks(
+                    new_chunks,
                     config,
                     instruction=how_to_summarize,
                     question=question_for_summary,
-                )
-                for text_chunk in chunks
-            ]
+                ),
+            )
+        )
+        chunk_summaries = [
+            new_chunk_summaries[c] if c in new_chunk_summaries else known_chunks[c][0]
+            for c in chunks
         ]
         logger.debug("Chunk summaries: " + str(chunk_summaries))
 
-        e_chunks = get_embedding(chunks, config)
-
         summary = (
             chunk_summaries[0]
             if len(chunks) == 1
@@ -81,9 +104,15 @@ class MemoryItem:
         )
         logger.debug("Total summary: " + summary)
 
+        # Embed the new chunks and the summary in one go
+        *e_new_chunks, e_summary = get_embedding([*new_chunks, summary], config)
+        new_chunk_embeddings = dict(zip(new_chunks, e_new_chunks))
+        e_chunks = [
+            new_chunk_embeddings[c] if c in new_chunk_embeddings else known_chunks[c][1]
+            for c in chunks
+        ]
         # TODO: investigate search performance of weighted average vs summary
         # e_average = np.average(e_chunks, axis=0, weights=[len(c) for c in chunks])
-        e_summary = get_embedding(summary, config)
 
         metadata["source_type"] = source_type
 
@@ -98,8 +127,19 @@ class MemoryItem:
         )
 
     @staticmethod
-    def from_text_file(content: str, path: str, config: Config):
-        return MemoryItem.from_text(content, "text_file", config, {"location": path})
+    def from_text_file(
+        content: str,
+        path: str,
+        config: Config,
+        known_chunks: dict[str, tuple[str, Embedding]] = {},
+    ):
+        return MemoryItem.from_text(
+            content,
+            "text_file",
+            config,
+            {"location": path},
+            known_chunks=known_chunks,
+        )
 
     @staticmethod
     def from_code_file(content: str, path: str):
@@ -208,7 +248,8 @@ class MemoryItemRelevance:
     def of(
         memory_item: MemoryItem, for_query: str, e_query: Embedding | None = None
     ) -> MemoryItemRelevance:
-        e_query = e_query or get_embedding(for_query)
+        if e_query is None:
+            e_query = get_embedding(for_query)
         _, srs, crs = MemoryItemRelevance.calculate_scores(memory_item, e_query)
         return MemoryItemRelevance(
             for_query=for_query,
@@ -1,24 +1,65 @@
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import os
+import re
+import threading
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, Sequence
 
+import numpy as np
 import orjson
 
 from autogpt.config import Config
 from autogpt.logs import logger
 
-from ..memory_item import MemoryItem
+from ..embedding_index import EmbeddingIndex
+from ..memory_item import MemoryItem, MemoryItemRelevance
+from ..utils import get_embedding
 from .base import VectorMemoryProvider
 
 
 class JSONFileMemory(VectorMemoryProvider):
-    """Memory backend that stores memories in a JSON file"""
+    """
+    Memory backend that stores memories in a JSON file
+
+    The index consists of a snapshot of all memories at the time of the last
+    compaction, and an append-only log that contains the memories added since then.
+    The text and metadata of the memories are stored as JSON, while the embeddings
+    are stored in binary float32 sidecar files that are memory-mapped when loaded:
+
+    - `<memory_index>.json`: JSON array of the memories in the snapshot
+    - `<memory_index>.<hash>.npy`: embedding matrix of the snapshot
+    - `<memory_index>.jsonl`: JSON-lines log of memories added after the snapshot
+    - `<memory_index>.jsonl.f32`: raw embeddings of the memories in the log
+
+    The embedding matrix is named after the hash of the JSON snapshot it belongs to,
+    and the first line of the log holds that same hash, so that files left behind
+    by an interrupted compaction are recognized and ignored.
+
+    Several instances can use the same index files, e.g. because `get_memory` creates
+    a new instance on every call. Before changing the files, an instance checks
+    whether another one changed them since it last loaded or wrote them, and if so
+    loads them again first.
+    """
 
     SAVE_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SERIALIZE_DATACLASS
+    COMPACTION_MIN_RECORDS = 100
+    """The log is only compacted into the snapshot once it has at least this many
+    records, or as many records as the snapshot, whichever is more."""
 
     file_path: Path
+    log_path: Path
+    log_embeddings_path: Path
     memories: list[MemoryItem]
+    index: EmbeddingIndex
+
+    _snapshot_hash: str
+    _n_snapshot_records: int
+    _n_log_records: int
+    _files_stat: tuple | None
+    """The stat of the index files when this instance last loaded or wrote them"""
 
     def __init__(self, config: Config) -> None:
         """Initialize a class instance
@@ -31,19 +72,44 @@ class JSONFileMemory(VectorMemoryProvider):
         """
         workspace_path = Path(config.workspace_path)
         self.file_path = workspace_path / f"{config.memory_index}.json"
+        self.log_path = workspace_path / f"{config.memory_index}.jsonl"
+        self.log_embeddings_path = workspace_path / f"{config.memory_index}.jsonl.f32"
         self.file_path.touch()
+        self._lock = _index_lock(self.file_path)
+        self._files_stat = None
         logger.debug(
             f"Initialized {__class__.__name__} with index path {self.file_path}"
         )
 
+        with self._lock:
+            self._reload()
+
+    def _reload(self) -> None:
         self.memories = []
+        self.index = EmbeddingIndex()
         try:
             self.load_index()
             logger.debug(f"Loaded {len(self.memories)} MemoryItems from file")
         except Exception as e:
             logger.warn(f"Could not load MemoryItems from file: {e}")
+            self.memories = []
+            self.index = EmbeddingIndex()
             self.save_index()
 
+    def _stat_files(self) -> tuple:
+        return tuple(
+            (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+            if (stat := _stat(path))
+            else None
+            for path in (self.file_path, self.log_path, self.log_embeddings_path)
+        )
+
+    def _sync(self) -> None:
+        """Loads the index files again if another instance has changed them"""
+        if self._stat_files() != self._files_stat:
+            logger.debug("Memory index files were changed, loading them again")
+            self._reload()
+
     def __iter__(self) -> Iterator[MemoryItem]:
         return iter(self.memories)
 
@@ -54,34 +120,309 @@ class JSONFileMemory(VectorMemoryProvider):
         return len(self.memories)
 
     def add(self, item: MemoryItem):
-        self.memories.append(item)
-        logger.debug(f"Adding item to memory: {item.dump()}")
-        self.save_index()
-        return len(self.memories)
+        with self._lock:
+            self._sync()
+            self.memories.append(item)
+            self.index.add(item)
+            logger.debug(f"Adding item to memory: {item.dump()}")
+            self._append_to_log(item)
+            return len(self.memories)
 
     def discard(self, item: MemoryItem):
-        try:
-            self.remove(item)
-        except:
-            pass
+        with self._lock:
+            self._sync()
+            try:
+                self.memories.remove(item)
+            except ValueError:
+                return
+            self.save_index()
 
     def clear(self):
         """Clears the data in memory."""
-        self.memories.clear()
-        self.save_index()
+        with self._lock:
+            self.memories.clear()
+            self.index.clear()
+            self.save_index()
+
+    def get_relevant(
+        self, query: str, k: int, config: Config
+    ) -> Sequence[MemoryItemRelevance]:
+        """
+        Returns the top-k most relevant memories for the given query.
+        Scores all memories at once using the embedding matrix of the index.
+        """
+        if len(self) < 1:
+            return []
+
+        logger.debug(
+            f"Searching for {k} relevant memories for query '{query}'; "
+            f"{len(self)} memories in index"
+        )
+
+        e_query = get_embedding(query, config)
+        return self.index.top_k(self.memories, query, e_query, k)
+
+    def score_memories_for_relevance(
+        self, for_query: str, config: Config
+    ) -> Sequence[MemoryItemRelevance]:
+        e_query = get_embedding(for_query, config)
+        return self.index.relevances(self.memories, for_query, e_query)
 
     def load_index(self):
-        """Loads all memories from the index file"""
+        """Loads all memories from the index files and replays the append log"""
         if not self.file_path.is_file():
             logger.debug(f"Index file '{self.file_path}' does not exist")
             return
-        with self.file_path.open("r") as f:
+        with self.file_path.open("rb") as f:
             logger.debug(f"Loading memories from index file '{self.file_path}'")
-            json_index = orjson.loads(f.read())
+            snapshot = f.read()
+            json_index = orjson.loads(snapshot)
+        if not isinstance(json_index, list):
+            raise ValueError(f"Expected a list of memories, got {type(json_index)}")
+        self._snapshot_hash = hashlib.sha256(snapshot).hexdigest()
+        self._n_snapshot_records = len(json_index)
+        self._n_log_records = 0
+
+        if all("e_summary" in memory_item_dict for memory_item_dict in json_index):
+            # Index file with inline embeddings
             for memory_item_dict in json_index:
                 self.memories.append(MemoryItem(**memory_item_dict))
+            self.index = EmbeddingIndex(self.memories)
+        else:
+            embeddings_path = self._embeddings_path(self._snapshot_hash)
+            logger.debug(f"Memory-mapping embeddings from '{embeddings_path}'")
+            self._load_snapshot(json_index, np.load(embeddings_path, mmap_mode="r"))
+
+        self._replay_log()
+        self._files_stat = self._stat_files()
 
     def save_index(self):
+        """Writes all memories to the index files and starts a new append log"""
+        with self._lock:
+            self._save_index()
+
+    def _save_index(self) -> None:
         logger.debug(f"Saving memory index to file {self.file_path}")
-        with self.file_path.open("wb") as f:
-            return f.write(orjson.dumps(self.memories, option=self.SAVE_OPTIONS))
+        json_index = [_without_embeddings(m) for m in self.memories]
+        snapshot = orjson.dumps(json_index, option=self.SAVE_OPTIONS)
+        snapshot_hash = hashlib.sha256(snapshot).hexdigest()
+
+        # The embeddings must be in place before the snapshot that refers to them
+        embeddings_path = self._embeddings_path(snapshot_hash)
+        if self.memories:
+            _write_embedding_matrix(embeddings_path, self.memories)
+        _atomic_write(self.file_path, snapshot)
+
+        self._snapshot_hash = snapshot_hash
+        self._n_snapshot_records = len(self.memories)
+
+        # Point the memories at the new embedding file. This drops the mappings
+        # of the previous embedding files, which can't be replaced or removed
+        # while they are mapped on Windows.
+        if self.memories:
+            self._load_snapshot(json_index, np.load(embeddings_path, mmap_mode="r"))
+        else:
+            self.memories = []
+            self.index = EmbeddingIndex()
+
+        self._reset_log()
+
+        # Remove embedding matrices of previous snapshots
+        for path in self.file_path.parent.glob(f"{self.file_path.stem}.*.npy"):
+            if path != embeddings_path and re.fullmatch(
+                rf"{re.escape(self.file_path.stem)}\.[0-9a-f]{{16}}\.npy", path.name
+            ):
+                path.unlink(missing_ok=True)
+        self._files_stat = self._stat_files()
+
+    def _embeddings_path(self, snapshot_hash: str) -> Path:
+        return self.file_path.with_name(
+            f"{self.file_path.stem}.{snapshot_hash[:16]}.npy"
+        )
+
+    def _load_snapshot(self, json_index: list[dict], matrix: np.ndarray) -> None:
+        memories, item_offsets = [], [0]
+        for memory_item_dict in json_index:
+            start = item_offsets[-1]
+            end = start + 1 + len(memory_item_dict["chunks"])
+            memories.append(
+                MemoryItem(
+                    **memory_item_dict,
+                    e_summary=matrix[start],
+                    e_chunks=list(matrix[start + 1 : end]),
+                )
+            )
+            item_offsets.append(end)
+
+        self.index = EmbeddingIndex.from_matrix(matrix, item_offsets)
+        self.memories = memories
+
+    def _log_header(self) -> bytes:
+        return orjson.dumps({"snapshot": self._snapshot_hash}) + b"\n"
+
+    def _reset_log(self) -> None:
+        _atomic_write(self.log_path, self._log_header())
+        _atomic_write(self.log_embeddings_path, b"")
+        self._n_log_records = 0
+
+    def _append_to_log(self, item: MemoryItem) -> None:
+        if self._n_log_records + 1 >= max(
+            self.COMPACTION_MIN_RECORDS, self._n_snapshot_records
+        ):
+            self.save_index()
+            return
+
+        if not self.log_path.is_file():
+            self._reset_log()
+
+        logger.debug(f"Appending memory to log file {self.log_path}")
+        embeddings = np.vstack(
+            [
+                np.asarray(item.e_summary, dtype=np.float32),
+                *(np.asarray(e, dtype=np.float32) for e in item.e_chunks),
+            ]
+        )
+
+        # The embeddings must be in place before the record that refers to them
+        with self.log_embeddings_path.open("ab") as f:
+            e_offset = f.seek(0, os.SEEK_END)
+            f.write(embeddings.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        record = _without_embeddings(item) | {
+            "e_offset": e_offset,
+            "e_dimensions": embeddings.shape[1],
+        }
+        with self.log_path.open("ab") as f:
+            f.write(orjson.dumps(record, option=self.SAVE_OPTIONS) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._n_log_records += 1
+        self._files_stat = self._stat_files()
+
+    def _replay_log(self) -> None:
+        if not self.log_path.is_file():
+            return
+
+        with self.log_path.open("rb") as f:
+            header = f.readline()
+            try:
+                header_valid = header.endswith(b"\n") and orjson.loads(header) == {
+                    "snapshot": self._snapshot_hash
+                }
+            except orjson.JSONDecodeError:
+                header_valid = False
+            records = f.readlines() if header_valid else []
+
+        if not header_valid:
+            logger.debug(
+                f"Ignoring log file '{self.log_path}': "
+                "it does not belong to the current index file"
+            )
+            self._reset_log()
+            return
+
+        log_embeddings = (
+            np.memmap(self.log_embeddings_path, dtype=np.float32, mode="r")
+            if self.log_embeddings_path.is_file()
+            and self.log_embeddings_path.stat().st_size > 0
+            else np.empty(0, dtype=np.float32)
+        )
+        valid_length = len(header)
+        for line in records:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("incomplete record")
+                item = _item_from_log_record(orjson.loads(line), log_embeddings)
+            except Exception as e:
+                # Only the last write can have been interrupted
+                logger.warn(f"Discarding corrupt tail of memory log: {e}")
+                break
+            self.memories.append(item)
+            self.index.add(item)
+            self._n_log_records += 1
+            valid_length += len(line)
+
+        if valid_length < self.log_path.stat().st_size:
+            os.truncate(self.log_path, valid_length)
+        # Embeddings after the last valid record are not truncated, because the
+        # file is still mapped; new embeddings are appended after them.
+        if not self.log_embeddings_path.is_file():
+            self.log_embeddings_path.touch()
+        logger.debug(f"Replayed {self._n_log_records} MemoryItems from log file")
+
+
+def _without_embeddings(item: MemoryItem) -> dict:
+    return {
+        field.name: getattr(item, field.name)
+        for field in dataclasses.fields(item)
+        if field.name not in ("e_summary", "e_chunks")
+    }
+
+
+def _item_from_log_record(record: dict, log_embeddings: np.ndarray) -> MemoryItem:
+    """Returns the MemoryItem in a log record"""
+    if "e_summary" in record:
+        return MemoryItem(**record)
+
+    offset = record.pop("e_offset") // log_embeddings.itemsize
+    dimensions = record.pop("e_dimensions")
+    n_rows = 1 + len(record["chunks"])
+    if offset + n_rows * dimensions > len(log_embeddings):
+        raise ValueError("embeddings missing from log")
+
+    embeddings = log_embeddings[offset : offset + n_rows * dimensions].reshape(
+        n_rows, dimensions
+    )
+    return MemoryItem(**record, e_summary=embeddings[0], e_chunks=list(embeddings[1:]))
+
+
+def _write_embedding_matrix(path: Path, memories: list[MemoryItem]) -> None:
+    """Writes the embeddings of the given memories to a .npy file, row by row"""
+    n_rows = sum(1 + len(m.e_chunks) for m in memories)
+    dimensions = len(memories[0].e_summary)
+
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    matrix = np.lib.format.open_memmap(
+        tmp_path, mode="w+", dtype=np.float32, shape=(n_rows, dimensions)
+    )
+    row = 0
+    for memory in memories:
+        matrix[row] = memory.e_summary
+        if memory.e_chunks:
+            matrix[row + 1 : row + 1 + len(memory.e_chunks)] = memory.e_chunks
+        row += 1 + len(memory.e_chunks)
+    matrix.flush()
+    del matrix
+
+    with tmp_path.open("rb+") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """Replaces the contents of a file such that it is never left half-written"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _stat(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+_index_locks: dict[Path, threading.RLock] = {}
+_index_locks_lock = threading.Lock()
+
+
+def _index_lock(file_path: Path) -> threading.RLock:
+    """Returns the lock that the instances using the given index file share"""
+    with _index_locks_lock:
+        return _index_locks.setdefault(file_path.resolve(), threading.RLock())
@@ -1,15 +1,25 @@
-from typing import Any, overload
+import asyncio
+from contextlib import ExitStack
+from typing import Any, Sequence, overload
 
 import numpy as np
 
 from autogpt.config import Config
 from autogpt.llm.base import TText
 from autogpt.llm.providers import openai as iopenai
+from autogpt.llm.rate_limiter import RateLimiter, RequestPriority
+from autogpt.llm.utils import count_string_tokens
 from autogpt.logs import logger
 
+from .embedding_cache import get_embedding_cache
+
 Embedding = list[np.float32] | np.ndarray[Any, np.dtype[np.float32]]
 """Embedding vector"""
 
+MAX_EMBEDDING_BATCH_SIZE = 2048
+"""Maximum number of inputs the OpenAI API accepts in a single embedding request"""
+MAX_CONCURRENT_EMBEDDING_REQUESTS = 4
+
 
 @overload
 def get_embedding(input: str | TText) -> Embedding:
@@ -29,6 +39,8 @@ def get_embedding(
     Args:
         input: Input text to get embeddings for, encoded as a string or array of tokens.
             Multiple inputs may be given as a list of strings or token arrays.
+        config: The config object. If the embedding cache is enabled, only inputs
+            that are not in the cache are sent to the API.
 
     Returns:
         List[float]: The embedding.
@@ -41,24 +53,153 @@ def get_embedding(
         input = [text.replace("\n", " ") for text in input]
 
     model = config.embedding_model
+    inputs = input if multiple else [input]
+
+    cache = get_embedding_cache(config)
+    embeddings = (
+        cache.get_many(model, inputs) if cache is not None else [None] * len(inputs)
+    )
+    misses = [i for i, e in enumerate(embeddings) if e is None]
+    if cache is not None:
+        logger.debug(
+            f"Embedding cache: {len(inputs) - len(misses)} hits, {len(misses)} misses"
+        )
+    if not misses:
+        return embeddings if multiple else embeddings[0]
+
     kwargs = {"model": model}
     kwargs.update(config.get_openai_credentials(model))
 
+    batches = (
+        batch_embedding_inputs([inputs[i] for i in misses], model)
+        if multiple
+        else [[0]]
+    )
     logger.debug(
-        f"Getting embedding{f's for {len(input)} inputs' if multiple else ''}"
+        f"Getting embedding{f's for {len(misses)} inputs' if multiple else ''}"
         f" with model '{model}'"
+        + (f" in {len(batches)} requests" if len(batches) > 1 else "")
         + (f" via Azure deployment '{kwargs['engine']}'" if config.use_azure else "")
     )
     if config.use_azure:
         breakpoint()
 
-    embeddings = iopenai.create_embedding(
-        input,
-        **kwargs,
-    ).data
+    batch_inputs = [
+        [inputs[misses[i]] for i in batch] if multiple else input for batch in batches
+    ]
+    # Admit the batches here rather than in the async requests, so that waiting for
+    # the rate limits doesn't block the event loop
+    rate_limits = config.get_openai_rate_limits(model)
+    with ExitStack() as stack:
+        requests = [
+            stack.enter_context(
+                RateLimiter().request(
+                    model,
+                    # The estimate only matters if there are limits to keep to
+                    _estimate_tokens(batch_input, model)
+                    if any(rate_limits.values())
+                    else 0,
+                    RequestPriority.BACKGROUND,
+                    **rate_limits,
+                )
+            )
+            for batch_input in batch_inputs
+        ]
+        if len(batches) == 1:
+            responses = [iopenai.create_embedding(batch_inputs[0], **kwargs)]
+        else:
+            # Send the batches concurrently over the pooled connections of the
+            # async API
+            responses = iopenai.run_async(_acreate_embeddings(batch_inputs, **kwargs))
+        for request, response in zip(requests, responses):
+            if (usage := getattr(response, "usage", None)) and "total_tokens" in usage:
+                request.report_usage(usage.total_tokens)
+
+    for batch, response in zip(batches, responses):
+        for i, embedding in zip(batch, _embeddings(response)):
+            embeddings[misses[i]] = embedding
+    if cache is not None:
+        cache.put_many(
+            model, [inputs[i] for i in misses], [embeddings[i] for i in misses]
+        )
+
+    return embeddings if multiple else embeddings[0]
+
+
+async def _acreate_embeddings(batch_inputs: list[Any], **kwargs: Any) -> list[Any]:
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDDING_REQUESTS)
+
+    async def create_embeddings(batch_input: Any) -> Any:
+        async with semaphore:
+            return await iopenai.acreate_embedding(batch_input, **kwargs)
+
+    return await asyncio.gather(*map(create_embeddings, batch_inputs))
+
+
+def _embeddings(response: Any) -> list[Embedding]:
+    return [d["embedding"] for d in sorted(response.data, key=lambda x: x["index"])]
+
+
+def _estimate_tokens(
+    batch_input: str | TText | list[str] | list[TText], model: str
+) -> int:
+    inputs = (
+        batch_input
+        if isinstance(batch_input, list) and not isinstance(batch_input[0], int)
+        else [batch_input]
+    )
+    return sum(
+        len(i) if not isinstance(i, str) else count_string_tokens(i, model)
+        for i in inputs
+    )
+
+
+def batch_embedding_inputs(
+    inputs: Sequence[str | TText],
+    model: str,
+    max_batch_size: int = MAX_EMBEDDING_BATCH_SIZE,
+) -> list[list[int]]:
+    """Packs embedding inputs into batches that fit in a single API request
 
-    if not multiple:
-        return embeddings[0]["embedding"]
+    Args:
+        inputs: The (normalized) inputs to embed.
+        model: The embedding model; its `max_tokens` is the token budget per request.
+        max_batch_size: The maximum number of inputs per request.
 
-    embeddings = sorted(embeddings, key=lambda x: x["index"])
-    return [d["embedding"] for d in embeddings]
+    Returns:
+        list[list[int]]: The indices of the inputs in each batch, in order.
+            An input that exceeds the token budget by itself gets its own batch.
+    """
+    model_info = iopenai.OPEN_AI_EMBEDDING_MODELS.get(model)
+    max_tokens = model_info.max_tokens if model_info else None
+
+    # A token is at least one byte, so the UTF-8 length is an upper bound on the
+    # token count. Only tokenize if that bound doesn't already fit the budget.
+    if max_tokens is None or sum(_max_input_tokens(i) for i in inputs) <= max_tokens:
+        token_counts = [0] * len(inputs)
+        max_tokens = None
+    else:
+        token_counts = [
+            len(i) if not isinstance(i, str) else count_string_tokens(i, model)
+            for i in inputs
+        ]
+
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    batch_tokens = 0
+    for i, n_tokens in enumerate(token_counts):
+        if batch and (
+            len(batch) >= max_batch_size
+            or (max_tokens is not None and batch_tokens + n_tokens > max_tokens)
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(i)
+        batch_tokens += n_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _max_input_tokens(input: str | TText) -> int:
+    return len(input.encode()) if isinstance(input, str) else len(input)
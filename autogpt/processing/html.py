@@ -1,9 +1,232 @@
 """HTML processing functions"""
 from __future__ import annotations
 
+import codecs
+import itertools
+import re
+from typing import Iterable, NamedTuple
+
 from bs4 import BeautifulSoup
 from requests.compat import urljoin
 
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+SKIPPED_TAGS = frozenset({"script", "style"})
+"""Tags whose content is not visible text"""
+META_CHARSET_SNIFF_SIZE = 1024
+"""Number of bytes at the start of a page that are searched for a declared charset"""
+META_CHARSET_PATTERN = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?([A-Za-z0-9._:-]+)""", re.I
+)
+BYTE_ORDER_MARKS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+
+class PageContent(NamedTuple):
+    text: str
+    """The visible text of the page body, one phrase per line"""
+    hyperlinks: list[tuple[str, str]]
+    """The (text, URL) pairs of the links on the page"""
+    noscript_text: str
+    """The text shown to browsers without JavaScript"""
+
+
+def extract_page_content(
+    html: str | bytes | Iterable[str | bytes], base_url: str
+) -> PageContent:
+    """Extract the visible text and the hyperlinks from a page in a single pass
+
+    The page is parsed incrementally with lxml if it is installed, so it can be fed
+    in chunks (e.g. straight from a streamed response), and each part of the DOM is
+    discarded as soon as its text has been extracted. Without lxml, the page is
+    parsed as a whole with BeautifulSoup.
+
+    Args:
+        html (str | bytes | Iterable[str | bytes]): The page, or chunks of it
+        base_url (str): The base URL, to resolve relative links against
+
+    Returns:
+        PageContent: The text, hyperlinks and noscript text of the page
+    """
+    chunks = [html] if isinstance(html, (str, bytes)) else html
+    if etree is None:
+        return _extract_page_content_with_bs4(chunks, base_url)
+
+    chunks = (chunk for chunk in chunks if chunk)
+    first_chunk = next(chunks, b"")
+    extractor = _PageContentExtractor(base_url)
+    parser = etree.HTMLPullParser(
+        events=("start", "end", "comment", "pi"),
+        huge_tree=True,
+        encoding=_sniff_encoding(first_chunk) if first_chunk else None,
+    )
+    try:
+        for chunk in itertools.chain([first_chunk], chunks):
+            if chunk:
+                parser.feed(chunk)
+                extractor.process(parser.read_events())
+        parser.close()
+    except etree.LxmlError:
+        # Raised for empty documents; anything parsed so far is still usable
+        pass
+    extractor.process(parser.read_events())
+    return extractor.result()
+
+
+def _sniff_encoding(first_chunk: str | bytes) -> str | None:
+    """Returns the encoding to decode a page with, or None to let lxml detect it
+
+    Without a BOM or a declared charset, lxml would decode the page as Latin-1,
+    while nowadays it is most likely UTF-8.
+    """
+    if isinstance(first_chunk, str) or first_chunk.startswith(BYTE_ORDER_MARKS):
+        return None
+    if match := META_CHARSET_PATTERN.search(first_chunk[:META_CHARSET_SNIFF_SIZE]):
+        charset = match.group(1).decode("ascii")
+        try:
+            return codecs.lookup(charset).name
+        except LookupError:
+            pass
+    return "utf-8"
+
+
+class _PageContentExtractor:
+    """Collects text and links from the events of an lxml pull parser
+
+    Text is emitted in document order: the text of an element when its first child
+    starts or, if it has none, when it ends, and the tail of an element when its
+    next sibling starts or its parent ends. At that point the element has been
+    fully processed and is removed from the tree.
+    """
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.hyperlinks: list[tuple[str, str]] = []
+
+        self._text = _TextCleaner()
+        self._noscript_text: list[str] = []
+        self._stack: list = []
+        self._pending = None
+        """The last element that ended, whose tail has not been emitted yet"""
+        self._body_depth = 0
+        self._skip_depth = 0
+        self._noscript_depth = 0
+        self._links: list[tuple[str, list[str]]] = []
+        """The URLs and the text so far of the links the parser is inside of"""
+
+    def process(self, events: Iterable[tuple[str, etree._Element]]) -> None:
+        for event, element in events:
+            if event == "start":
+                self._emit_preceding_text()
+                self._stack.append(element)
+                self._enter(element, 1)
+            elif event == "end":
+                if self._pending is not None:
+                    self._emit_tail(self._pending)
+                else:
+                    self._emit(element.text)
+                self._enter(element, -1)
+                self._stack.pop()
+                self._pending = element
+            else:
+                # Comments and processing instructions have no start and end, and
+                # their content is not part of the text
+                self._emit_preceding_text()
+                self._pending = element
+
+    def result(self) -> PageContent:
+        if self._pending is not None:
+            self._emit_tail(self._pending)
+        return PageContent(
+            self._text.close(), self.hyperlinks, "".join(self._noscript_text)
+        )
+
+    def _enter(self, element: etree._Element, direction: int) -> None:
+        tag = element.tag
+        if tag == "body":
+            self._body_depth += direction
+        elif tag in SKIPPED_TAGS:
+            self._skip_depth += direction
+        elif tag == "noscript":
+            self._noscript_depth += direction
+        elif tag == "a" and element.get("href") is not None:
+            if direction > 0:
+                self._links.append((urljoin(self.base_url, element.get("href")), []))
+            elif self._links:
+                url, text = self._links.pop()
+                self.hyperlinks.append(("".join(text), url))
+
+    def _emit_preceding_text(self) -> None:
+        if self._pending is not None:
+            self._emit_tail(self._pending)
+        elif self._stack:
+            self._emit(self._stack[-1].text)
+
+    def _emit_tail(self, element: etree._Element) -> None:
+        self._emit(element.tail)
+        self._pending = None
+        parent = element.getparent()
+        if parent is not None:
+            parent.remove(element)
+
+    def _emit(self, text: str | None) -> None:
+        if not text or self._skip_depth:
+            return
+        if self._body_depth:
+            self._text.feed(text)
+        if self._noscript_depth:
+            self._noscript_text.append(text)
+        for _, link_text in self._links:
+            link_text.append(text)
+
+
+class _TextCleaner:
+    """Splits text into stripped lines and phrases as it comes in"""
+
+    def __init__(self):
+        self._chunks: list[str] = []
+        self._line: list[str] = []
+
+    def feed(self, text: str) -> None:
+        for part in text.splitlines(keepends=True):
+            self._line.append(part)
+            if part.splitlines()[0] != part:
+                self._add_line("".join(self._line))
+                self._line = []
+
+    def close(self) -> str:
+        self._add_line("".join(self._line))
+        self._line = []
+        return "\n".join(self._chunks)
+
+    def _add_line(self, line: str) -> None:
+        for phrase in line.strip().split("  "):
+            if phrase := phrase.strip():
+                self._chunks.append(phrase)
+
+
+def _extract_page_content_with_bs4(
+    chunks: Iterable[str | bytes], base_url: str
+) -> PageContent:
+    chunks = list(chunks)
+    html = (
+        b"".join(chunks) if chunks and isinstance(chunks[0], bytes) else "".join(chunks)
+    )
+    soup = BeautifulSoup(html, "html.parser")
+
+    for element in soup(list(SKIPPED_TAGS)):
+        element.extract()
+
+    text = _TextCleaner()
+    text.feed((soup.body or soup).get_text())
+    return PageContent(
+        text.close(),
+        extract_hyperlinks(soup, base_url),
+        "".join(noscript.get_text() for noscript in soup("noscript")),
+    )
+
 
 def extract_hyperlinks(soup: BeautifulSoup, base_url: str) -> list[tuple[str, str]]:
     """Extract hyperlinks from a BeautifulSoup object
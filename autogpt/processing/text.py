@@ -1,14 +1,19 @@
 """Text processing functions"""
+import functools
+import hashlib
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from math import ceil
-from typing import Optional
+from typing import Iterator, Optional
 
 import spacy
-import tiktoken
 
 from autogpt.config import Config
-from autogpt.llm.base import ChatSequence
+from autogpt.llm.base import ChatSequence, TText
 from autogpt.llm.providers.openai import OPEN_AI_MODELS
-from autogpt.llm.utils import count_string_tokens, create_chat_completion
+from autogpt.llm.rate_limiter import RequestPriority
+from autogpt.llm.utils import count_string_tokens, create_chat_completion, get_tokenizer
 from autogpt.logs import logger
 from autogpt.utils import batch
 
@@ -36,25 +41,45 @@ def chunk_content(
 ):
     """Split content into chunks of approximately equal token length."""
 
-    MAX_OVERLAP = 200  # limit overlap to save tokens
+    tokenizer = get_tokenizer(for_model)
+    tokenized_text = tokenizer.encode(content)
 
-    if not must_chunk_content(content, for_model, max_chunk_length):
-        yield content, count_string_tokens(content, for_model)
+    token_chunks = _chunk_tokens(
+        tokenized_text, for_model, max_chunk_length, with_overlap
+    )
+    if len(token_chunks) == 1:
+        yield content, len(tokenized_text)
         return
 
-    max_chunk_length = max_chunk_length or _max_chunk_length(for_model)
+    for token_batch in token_chunks:
+        yield tokenizer.decode(token_batch), len(token_batch)
 
-    tokenizer = tiktoken.encoding_for_model(for_model)
 
-    tokenized_text = tokenizer.encode(content)
-    total_length = len(tokenized_text)
+def _chunk_tokens(
+    tokens: TText,
+    for_model: str,
+    max_chunk_length: Optional[int] = None,
+    with_overlap=True,
+) -> list[TText]:
+    """Split tokens into chunks of approximately equal length.
+
+    Returns `[tokens]` if the tokens don't have to be chunked.
+    """
+
+    MAX_OVERLAP = 200  # limit overlap to save tokens
+
+    if len(tokens) <= _max_chunk_length(for_model, max_chunk_length):
+        return [tokens]
+
+    max_chunk_length = max_chunk_length or _max_chunk_length(for_model)
+
+    total_length = len(tokens)
     n_chunks = ceil(total_length / max_chunk_length)
 
     chunk_length = ceil(total_length / n_chunks)
     overlap = min(max_chunk_length - chunk_length, MAX_OVERLAP) if with_overlap else 0
 
-    for token_batch in batch(tokenized_text, chunk_length + overlap, overlap):
-        yield tokenizer.decode(token_batch), len(token_batch)
+    return list(batch(tokens, chunk_length + overlap, overlap))
 
 
 def summarize_text(
@@ -113,35 +138,120 @@ def summarize_text(
         )
 
         logger.debug(f"Summarizing with {model}:\n{summarization_prompt.dump()}\n")
-        summary = create_chat_completion(
-            prompt=summarization_prompt, config=config, temperature=0, max_tokens=500
-        ).content
+        with _summarization_slots(config.summarization_concurrency):
+            summary = create_chat_completion(
+                prompt=summarization_prompt,
+                config=config,
+                temperature=0,
+                max_tokens=500,
+                priority=RequestPriority.BACKGROUND,
+            ).content
 
         logger.debug(f"\n{'-'*16} SUMMARY {'-'*17}\n{summary}\n{'-'*42}\n")
         return summary.strip(), None
 
-    summaries: list[str] = []
     chunks = list(
         split_text(
             text, for_model=model, config=config, max_chunk_length=max_chunk_length
         )
     )
-
-    for i, (chunk, chunk_length) in enumerate(chunks):
-        logger.info(
-            f"Summarizing chunk {i + 1} / {len(chunks)} of length {chunk_length} tokens"
-        )
-        summary, _ = summarize_text(chunk, config, instruction)
-        summaries.append(summary)
-
+    summaries = summarize_chunks(
+        [chunk for chunk, _ in chunks], config, instruction=instruction
+    )
     logger.info(f"Summarized {len(chunks)} chunks")
 
+    # If the combined summaries are still too long, this will summarize them in
+    # chunks again, so the summaries are reduced level by level.
     summary, _ = summarize_text("\n\n".join(summaries), config)
     return summary.strip(), [
         (summaries[i], chunks[i][0]) for i in range(0, len(chunks))
     ]
 
 
+def summarize_chunks(
+    chunks: list[str],
+    config: Config,
+    instruction: Optional[str] = None,
+    question: Optional[str] = None,
+) -> list[str]:
+    """Summarize multiple chunks of text concurrently
+
+    At most `config.summarization_concurrency` summarization requests are made
+    at the same time, also when this function is called from multiple threads.
+
+    Args:
+        chunks (list[str]): The chunks to summarize
+        config (Config): The config object
+        instruction (str): Additional instruction for summarization
+        question (str): Question to answer in the summaries
+
+    Returns:
+        list[str]: The summary of each chunk, in the same order as the chunks
+    """
+
+    def summarize_chunk(i: int) -> str:
+        logger.info(f"Summarizing chunk {i + 1} / {len(chunks)}")
+        summary, _ = summarize_text(
+            chunks[i], config, instruction=instruction, question=question
+        )
+        return summary
+
+    if len(chunks) < 2 or config.summarization_concurrency < 2:
+        return [summarize_chunk(i) for i in range(len(chunks))]
+
+    with ThreadPoolExecutor(
+        max_workers=min(len(chunks), config.summarization_concurrency)
+    ) as executor:
+        return list(executor.map(summarize_chunk, range(len(chunks))))
+
+
+@functools.lru_cache(maxsize=None)
+def _summarization_slots(concurrency: int) -> threading.BoundedSemaphore:
+    """Process-wide limit on the number of concurrent summarization requests"""
+    return threading.BoundedSemaphore(max(concurrency, 1))
+
+
+SPACY_COMPONENTS_UNUSED_FOR_SENTENCES = [
+    "tok2vec",
+    "tagger",
+    "morphologizer",
+    "parser",
+    "senter",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+]
+
+
+@functools.lru_cache(maxsize=None)
+def load_spacy_pipeline(
+    model: str, sentencizer_only: bool = False
+) -> spacy.language.Language:
+    """Load a spaCy pipeline for sentence splitting, once per process
+
+    Args:
+        model (str): The name of the spaCy model to load
+        sentencizer_only (bool): Whether to exclude the trained components of the
+            model (parser, NER, etc.), so that sentences are split by the
+            rule-based sentencizer only. This is a lot faster, but may split
+            sentences differently.
+
+    Returns:
+        Language: The pipeline, with a sentencizer added
+    """
+    logger.debug(
+        f"Loading spaCy model '{model}'"
+        + (" with only a sentencizer" if sentencizer_only else "")
+    )
+    nlp = spacy.load(
+        model,
+        exclude=SPACY_COMPONENTS_UNUSED_FOR_SENTENCES if sentencizer_only else [],
+    )
+    if "sentencizer" not in nlp.pipe_names:
+        nlp.add_pipe("sentencizer")
+    return nlp
+
+
 def split_text(
     text: str,
     for_model: str,
@@ -166,10 +276,11 @@ def split_text(
     """
 
     max_length = _max_chunk_length(for_model, max_chunk_length)
+    tokenizer = get_tokenizer(for_model)
 
     # flatten paragraphs to improve performance
     text = text.replace("\n", " ")
-    text_length = count_string_tokens(text, for_model)
+    text_length = len(tokenizer.encode(text))
 
     if text_length < max_length:
         yield text, text_length
@@ -178,20 +289,24 @@ def split_text(
     n_chunks = ceil(text_length / max_length)
     target_chunk_length = ceil(text_length / n_chunks)
 
-    nlp: spacy.language.Language = spacy.load(config.browse_spacy_language_model)
-    nlp.add_pipe("sentencizer")
+    nlp = load_spacy_pipeline(
+        config.browse_spacy_language_model, config.browse_spacy_sentencizer_only
+    )
     doc = nlp(text)
     sentences = [sentence.text.strip() for sentence in doc.sents]
+    # Tokenize all sentences at once; all length arithmetic below works on these,
+    # so only text that is actually cut up has to be decoded.
+    sentence_tokens = tokenizer.encode_batch(sentences)
 
     current_chunk: list[str] = []
     current_chunk_length = 0
     last_sentence = None
-    last_sentence_length = 0
+    last_sentence_tokens: TText = []
 
     i = 0
     while i < len(sentences):
         sentence = sentences[i]
-        sentence_length = count_string_tokens(sentence, for_model)
+        sentence_length = len(sentence_tokens[i])
         expected_chunk_length = current_chunk_length + 1 + sentence_length
 
         if (
@@ -209,20 +324,20 @@ def split_text(
                 current_chunk_length = 0
 
                 if with_overlap:
+                    last_sentence_length = len(last_sentence_tokens)
                     overlap_max_length = max_length - sentence_length - 1
                     if last_sentence_length < overlap_max_length:
                         current_chunk += [last_sentence]
                         current_chunk_length += last_sentence_length + 1
                     elif overlap_max_length > 5:
                         # add as much from the end of the last sentence as fits
+                        overlap_chunks = _chunk_tokens(
+                            last_sentence_tokens, for_model, overlap_max_length
+                        )
                         current_chunk += [
-                            list(
-                                chunk_content(
-                                    last_sentence,
-                                    for_model,
-                                    overlap_max_length,
-                                )
-                            ).pop()[0],
+                            tokenizer.decode(overlap_chunks[-1])
+                            if len(overlap_chunks) > 1
+                            else last_sentence
                         ]
                         current_chunk_length += overlap_max_length + 1
 
@@ -230,15 +345,123 @@ def split_text(
             current_chunk_length += sentence_length
 
         else:  # sentence longer than maximum length -> chop up and try again
-            sentences[i : i + 1] = [
-                chunk
-                for chunk, _ in chunk_content(sentence, for_model, target_chunk_length)
-            ]
+            token_chunks = _chunk_tokens(
+                sentence_tokens[i], for_model, target_chunk_length
+            )
+            pieces = (
+                [tokenizer.decode(token_chunk) for token_chunk in token_chunks]
+                if len(token_chunks) > 1
+                else [sentence]
+            )
+            sentences[i : i + 1] = pieces
+            # decoding may not round-trip exactly, so re-tokenize the pieces
+            sentence_tokens[i : i + 1] = tokenizer.encode_batch(pieces)
             continue
 
-        i += 1
         last_sentence = sentence
-        last_sentence_length = sentence_length
+        last_sentence_tokens = sentence_tokens[i]
+        i += 1
 
     if current_chunk:
         yield " ".join(current_chunk), current_chunk_length
+
+
+PARAGRAPH_SEPARATOR = re.compile(r"\n\s*\n")
+
+
+def split_paragraphs(
+    text: str,
+    for_model: str,
+    config: Config,
+    max_chunk_length: Optional[int] = None,
+):
+    """Split text into chunks of whole paragraphs, with boundaries that stay in place
+    when the text is edited
+
+    In `split_text`, the size of every chunk depends on the length of the whole
+    text, so an edit anywhere moves all boundaries after it. Here, a chunk ends
+    after a paragraph if the hash of that paragraph says so, with a probability
+    proportional to its length, or if the next paragraph doesn't fit in the chunk.
+    An edit therefore only changes the chunks around it, and the other chunks can
+    be reused (see `MemoryItem.from_text`). Chunks don't overlap. Paragraphs that
+    don't fit in a chunk by themselves are split between their lines in the same
+    way, and lines that don't fit are split with `split_text`.
+
+    Args:
+        text (str): The text to split
+        for_model (str): The model to chunk for; determines tokenizer and constraints
+        config (Config): The config object
+        max_chunk_length (int, optional): The maximum length of a chunk
+
+    Yields:
+        str: The next chunk of text
+    """
+    max_length = _max_chunk_length(for_model, max_chunk_length)
+    tokenizer = get_tokenizer(for_model)
+
+    text_length = len(tokenizer.encode(text))
+    if text_length < max_length:
+        yield text, text_length
+        return
+
+    # Chunks end at half the maximum length on average, which leaves room for the
+    # boundaries to stay where they are when the text around them changes
+    target_chunk_length = max_length / 2
+
+    def split_at_boundaries(
+        pieces: list[str], separator: str
+    ) -> Iterator[tuple[str, int]]:
+        piece_tokens = tokenizer.encode_batch(pieces)
+        separator_length = len(tokenizer.encode(separator))
+
+        current_chunk: list[str] = []
+        current_chunk_length = 0
+        for piece, tokens in zip(pieces, piece_tokens):
+            piece_length = len(tokens)
+            if current_chunk and (
+                current_chunk_length + separator_length + piece_length >= max_length
+                or piece_length >= max_length
+            ):
+                yield separator.join(current_chunk), current_chunk_length
+                current_chunk = []
+                current_chunk_length = 0
+
+            if piece_length >= max_length:
+                lines = [line.rstrip() for line in piece.splitlines() if line.strip()]
+                if separator == "\n\n" and len(lines) > 1:
+                    # Paragraphs that don't fit in a chunk, e.g. a text without any
+                    # blank lines, are split between their lines in the same way
+                    yield from split_at_boundaries(lines, "\n")
+                else:
+                    yield from split_text(
+                        piece,
+                        for_model,
+                        config,
+                        with_overlap=False,
+                        max_chunk_length=max_chunk_length,
+                    )
+                continue
+
+            current_chunk_length += piece_length + (
+                separator_length if current_chunk else 0
+            )
+            current_chunk.append(piece)
+
+            if _is_chunk_boundary(piece, piece_length / target_chunk_length):
+                yield separator.join(current_chunk), current_chunk_length
+                current_chunk = []
+                current_chunk_length = 0
+
+        if current_chunk:
+            yield separator.join(current_chunk), current_chunk_length
+
+    yield from split_at_boundaries(
+        [p.strip() for p in PARAGRAPH_SEPARATOR.split(text) if p.strip()], "\n\n"
+    )
+
+
+def _is_chunk_boundary(piece: str, probability: float) -> bool:
+    """Decides by the content of a paragraph or line whether a chunk should end
+    after it"""
+    digest = hashlib.sha256(piece.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") < probability * 2**64
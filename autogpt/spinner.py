@@ -58,6 +58,10 @@ class Spinner:
             exc_value (Exception): The exception value.
             exc_traceback (Exception): The exception traceback.
         """
+        self.stop()
+
+    def stop(self) -> None:
+        """Stop the spinner and clear its message, e.g. to print something else"""
         self.running = False
         if self.spinner_thread is not None:
             self.spinner_thread.join()
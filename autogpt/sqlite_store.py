@@ -0,0 +1,72 @@
+"""Base class of the on-disk caches and stores that are kept in the workspace"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, ClassVar, TypeVar, cast
+
+from autogpt.config import Config
+from autogpt.logs import logger
+
+STORE_DIR = ".autogpt"
+"""Hidden directory in the workspace where the stores are kept, out of sight of the
+file commands"""
+
+
+class SQLiteStore:
+    """
+    Keeps its data in a table of an SQLite database. The connection is shared by all
+    threads, so every query must be made while holding `_lock`.
+    """
+
+    TABLE: ClassVar[str]
+    SCHEMA: ClassVar[list[str]]
+    """The statements that create the table and its indexes, if they don't exist"""
+
+    path: Path
+
+    def __init__(self, path: Path):
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute(
+                f"SELECT COUNT(*) FROM {self.TABLE}"
+            ).fetchone()[0]
+
+    def _evict_least_recently_used(self, max_entries: int) -> None:
+        """Deletes all but the `max_entries` most recently used rows, by the
+        `last_used` column. Must be called while holding `_lock`."""
+        self._connection.execute(
+            f"DELETE FROM {self.TABLE} WHERE rowid IN ("
+            f"  SELECT rowid FROM {self.TABLE} ORDER BY last_used DESC"
+            "  LIMIT -1 OFFSET ?"
+            ")",
+            (max_entries,),
+        )
+
+
+S = TypeVar("S", bound=SQLiteStore)
+
+_stores: dict[tuple, SQLiteStore] = {}
+_stores_lock = threading.Lock()
+
+
+def open_store(store_class: type[S], config: Config, file_name: str, *args: Any) -> S:
+    """Returns the store in the given file of the workspace, opening it only once
+    for the same arguments"""
+    path = Path(config.workspace_path) / STORE_DIR / file_name
+    key = (store_class, path, *args)
+    with _stores_lock:
+        if key not in _stores:
+            logger.debug(f"Opening {store_class.__name__} at {path}")
+            path.parent.mkdir(parents=True, exist_ok=True)
+            _stores[key] = store_class(path, *args)
+        return cast(S, _stores[key])
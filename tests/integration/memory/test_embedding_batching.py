@@ -0,0 +1,110 @@
+import asyncio
+
+from pytest_mock import MockerFixture
+
+import autogpt.memory.vector.utils as vector_utils
+from autogpt.config import Config
+from autogpt.llm.rate_limiter import RateLimiter, RequestPriority
+from autogpt.memory.vector.utils import batch_embedding_inputs, get_embedding
+
+from .utils import fake_embedding
+
+
+def test_batch_embedding_inputs_by_batch_size(config: Config):
+    batches = batch_embedding_inputs(
+        ["a", "b", "c", "d", "e"], config.embedding_model, max_batch_size=2
+    )
+    assert batches == [[0, 1], [2, 3], [4]]
+
+
+def test_batch_embedding_inputs_by_tokens(config: Config, mocker: MockerFixture):
+    count_string_tokens = mocker.patch.object(
+        vector_utils, "count_string_tokens", side_effect=lambda text, _: len(text)
+    )
+    max_tokens = vector_utils.iopenai.OPEN_AI_EMBEDDING_MODELS[
+        config.embedding_model
+    ].max_tokens
+    half = max_tokens // 2
+
+    batches = batch_embedding_inputs(
+        ["a" * half, "b" * half, "c" * 10, "d" * (max_tokens + 1), [1, 2, 3]],
+        config.embedding_model,
+    )
+    assert batches == [[0, 1], [2], [3], [4]]
+    assert count_string_tokens.call_count == 4
+
+
+def test_batch_embedding_inputs_skips_tokenizing_short_inputs(
+    config: Config, mocker: MockerFixture
+):
+    count_string_tokens = mocker.patch.object(vector_utils, "count_string_tokens")
+    assert batch_embedding_inputs(["a", "b"], config.embedding_model) == [[0, 1]]
+    count_string_tokens.assert_not_called()
+
+
+def test_get_embedding_reassembles_batches_in_order(
+    config: Config, mocker: MockerFixture, mock_create_embedding
+):
+    config.embedding_cache = False
+    mocker.patch.object(
+        vector_utils,
+        "batch_embedding_inputs",
+        return_value=[[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]],
+    )
+    texts = [f"text {'x' * i}" for i in range(10)]
+
+    assert get_embedding(texts, config) == [fake_embedding(t) for t in texts]
+    assert mock_create_embedding.call_count == 4
+
+
+def test_get_embedding_sends_batches_concurrently(
+    config: Config, mocker: MockerFixture, mock_create_embedding
+):
+    config.embedding_cache = False
+    mocker.patch.object(
+        vector_utils, "batch_embedding_inputs", return_value=[[i] for i in range(10)]
+    )
+    running, max_running = 0, 0
+
+    async def acreate_embedding(input, **kwargs):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return mock_create_embedding(input, **kwargs)
+
+    mocker.patch.object(
+        vector_utils.iopenai, "acreate_embedding", side_effect=acreate_embedding
+    )
+    texts = [f"text {i}" for i in range(10)]
+
+    assert get_embedding(texts, config) == [fake_embedding(t) for t in texts]
+    assert mock_create_embedding.call_count == 10
+    assert max_running == vector_utils.MAX_CONCURRENT_EMBEDDING_REQUESTS
+
+
+def test_get_embedding_rate_limits_batches(
+    config: Config, mocker: MockerFixture, mock_create_embedding
+):
+    config.embedding_cache = False
+    model = config.embedding_model
+    mocker.patch.object(config, "openai_tokens_per_minute", {model: 60000})
+    mocker.patch.object(
+        vector_utils, "count_string_tokens", side_effect=lambda text, _: len(text)
+    )
+    mocker.patch.object(
+        vector_utils, "batch_embedding_inputs", return_value=[[0, 1], [2]]
+    )
+    acquire = mocker.spy(RateLimiter, "_acquire")
+    settle = mocker.spy(RateLimiter, "_settle")
+
+    get_embedding(["ab", "cde", "fghi"], config)
+    RateLimiter().reset()
+
+    assert [c.args[1:] for c in acquire.call_args_list] == [
+        (model, 5, RequestPriority.BACKGROUND, 0, 60000),
+        (model, 4, RequestPriority.BACKGROUND, 0, 60000),
+    ]
+    # The mocked API uses 1 token per input
+    assert [c.args[1:] for c in settle.call_args_list] == [(model, -3), (model, -3)]
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from autogpt.config import Config
+from autogpt.memory.vector.embedding_cache import EmbeddingCache, get_embedding_cache
+from autogpt.memory.vector.utils import get_embedding
+from autogpt.sqlite_store import STORE_DIR
+
+from .utils import fake_embedding
+
+
+def test_embedding_cache_persists(tmp_path: Path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=10)
+    cache.put_many("model", ["a", "bb"], [[1.0, 2.0], [3.0, 4.0]])
+
+    reopened = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=10)
+    assert reopened.get_many("model", ["bb", "c", "a"]) == [
+        [3.0, 4.0],
+        None,
+        [1.0, 2.0],
+    ]
+    assert reopened.get_many("other-model", ["a"]) == [None]
+    assert (reopened.hits, reopened.misses) == (2, 2)
+
+
+def test_embedding_cache_evicts_least_recently_used(tmp_path: Path):
+    cache = EmbeddingCache(tmp_path / "cache.sqlite3", max_entries=2)
+    cache.put_many("model", ["a"], [[1.0]])
+    cache.put_many("model", ["b"], [[2.0]])
+    cache.get_many("model", ["a"])
+    cache.put_many("model", ["c"], [[3.0]])
+
+    assert len(cache) == 2
+    assert cache.get_many("model", ["a", "b", "c"]) == [[1.0], None, [3.0]]
+
+
+def test_get_embedding_cache_is_hidden_in_workspace(config: Config):
+    cache = get_embedding_cache(config)
+    assert cache is get_embedding_cache(config)
+    assert cache.path.parent == Path(config.workspace_path) / STORE_DIR
+
+
+def test_get_embedding_only_requests_misses(config: Config, mock_create_embedding):
+    assert get_embedding("first text", config) == fake_embedding("first text")
+    assert mock_create_embedding.call_count == 1
+
+    assert get_embedding("first text", config) == fake_embedding("first text")
+    assert mock_create_embedding.call_count == 1
+
+    texts = ["second", "first text", "third\ntext"]
+    assert get_embedding(texts, config) == [fake_embedding(t) for t in texts]
+    assert mock_create_embedding.call_count == 2
+    assert mock_create_embedding.call_args.args[0] == ["second", "third text"]
+
+
+def test_get_embedding_without_cache(config: Config, mock_create_embedding):
+    config.embedding_cache = False
+    get_embedding("text", config)
+    get_embedding("text", config)
+    assert mock_create_embedding.call_count == 2
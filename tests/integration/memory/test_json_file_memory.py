@@ -1,8 +1,14 @@
 # sourcery skip: snake-case-functions
 """Tests for JSONFileMemory class"""
+import dataclasses
+import os
+from pathlib import Path
+
+import numpy as np
 import orjson
 import pytest
 
+import autogpt.memory.vector.providers.json_file as json_file_memory
 from autogpt.config import Config
 from autogpt.memory.vector import JSONFileMemory, MemoryItem
 from autogpt.workspace import Workspace
@@ -124,3 +130,199 @@ def test_json_memory_get_stats(config: Config, memory_item: MemoryItem) -> None:
     n_memories, n_chunks = index.get_stats()
     assert n_memories == 1
     assert n_chunks == 1
+
+
+def test_json_memory_get_relevant_uses_index(
+    config: Config, embedding_dimension: int, mocker
+) -> None:
+    def one_hot(i: int) -> np.ndarray:
+        e = np.zeros(embedding_dimension, dtype=np.float32)
+        e[i] = 1.0
+        return e
+
+    def make_item(name: str, e_summary, e_chunks) -> MemoryItem:
+        return MemoryItem(
+            raw_content=name,
+            summary=name,
+            chunks=[name] * len(e_chunks),
+            chunk_summaries=[name] * len(e_chunks),
+            e_summary=e_summary,
+            e_chunks=e_chunks,
+            metadata={},
+        )
+
+    index = JSONFileMemory(config)
+    mem1 = make_item("one", one_hot(0), [one_hot(1)])
+    mem2 = make_item("two", one_hot(2), [one_hot(3), 0.5 * one_hot(0)])
+    mem3 = make_item("three", one_hot(4), [one_hot(5)])
+    for mem in (mem1, mem2, mem3):
+        index.add(mem)
+
+    mocker.patch.object(json_file_memory, "get_embedding", return_value=one_hot(0))
+    relevant = index.get_relevant("query", 2, config)
+
+    assert [r.memory_item for r in relevant] == [mem1, mem2]
+    assert relevant[0].summary_relevance_score == 1.0
+    assert relevant[1].chunk_relevance_scores == [0.0, 0.5]
+    assert relevant[1].most_relevant_chunk == ("two", 0.5)
+
+    index.discard(mem1)
+    assert len(index) == 2
+    assert index.get_relevant("query", 1, config)[0].memory_item == mem2
+
+
+def test_json_memory_add_appends_to_log(config: Config, memory_item: MemoryItem):
+    index = JSONFileMemory(config)
+    index.add(memory_item)
+    index.add(memory_item)
+
+    assert index.file_path.read_text() == "[]"
+    assert len(index.log_path.read_bytes().splitlines()) == 3  # header + 2 records
+
+    reloaded = JSONFileMemory(config)
+    assert reloaded.memories == [memory_item, memory_item]
+
+
+def test_json_memory_log_compaction(
+    config: Config, memory_item: MemoryItem, mocker
+) -> None:
+    mocker.patch.object(JSONFileMemory, "COMPACTION_MIN_RECORDS", 3)
+    index = JSONFileMemory(config)
+    for _ in range(3):
+        index.add(memory_item)
+
+    assert len(orjson.loads(index.file_path.read_bytes())) == 3
+    assert len(index.log_path.read_bytes().splitlines()) == 1
+
+    index.add(memory_item)
+    assert len(JSONFileMemory(config)) == 4
+
+
+def test_json_memory_ignores_stale_log(config: Config, memory_item: MemoryItem):
+    index = JSONFileMemory(config)
+    index.add(memory_item)
+    stale_log = index.log_path.read_bytes()
+
+    # Simulate a crash between writing the snapshot and resetting the log
+    index.save_index()
+    index.log_path.write_bytes(stale_log)
+
+    reloaded = JSONFileMemory(config)
+    assert reloaded.memories == [memory_item]
+
+
+def test_json_memory_discards_torn_log_record(
+    config: Config, memory_item: MemoryItem
+) -> None:
+    index = JSONFileMemory(config)
+    index.add(memory_item)
+    with index.log_path.open("ab") as f:
+        f.write(b'{"raw_content": "interrupted wri')
+
+    reloaded = JSONFileMemory(config)
+    assert reloaded.memories == [memory_item]
+
+    reloaded.add(memory_item)
+    assert len(JSONFileMemory(config)) == 2
+
+
+def test_json_memory_memory_maps_embeddings(
+    config: Config, memory_item: MemoryItem, mocker
+) -> None:
+    mocker.patch.object(JSONFileMemory, "COMPACTION_MIN_RECORDS", 2)
+    index = JSONFileMemory(config)
+    index.add(memory_item)
+    index.add(memory_item)
+    index.add(memory_item)
+
+    assert b"e_summary" not in index.file_path.read_bytes()
+    assert len(list(index.file_path.parent.glob("*.npy"))) == 1
+
+    reloaded = JSONFileMemory(config)
+    assert reloaded.memories == [memory_item] * 3
+    assert isinstance(reloaded.memories[0].e_summary, np.memmap)
+
+
+def test_json_memory_releases_mapped_files_before_replacing_them(
+    config: Config, memory_item: MemoryItem, mocker
+) -> None:
+    """Windows doesn't allow replacing, removing or truncating mapped files"""
+    mocker.patch.object(JSONFileMemory, "COMPACTION_MIN_RECORDS", 2)
+    index = JSONFileMemory(config)
+    for _ in range(3):
+        index.add(memory_item)
+    # Two memories in the snapshot, one in the log
+    index = JSONFileMemory(config)
+    assert isinstance(index.memories[0].e_summary, np.memmap)
+    assert isinstance(index.memories[-1].e_summary, np.memmap)
+
+    def mapped_files() -> set[str]:
+        return {
+            os.path.abspath(e.filename)
+            for memory in index.memories
+            for e in (memory.e_summary, *memory.e_chunks)
+            if isinstance(e, np.memmap)
+        }
+
+    def check_not_mapped(func):
+        def wrapper(path, *args, **kwargs):
+            target = args[0] if func is os.replace else path
+            assert os.path.abspath(target) not in mapped_files()
+            return func(path, *args, **kwargs)
+
+        return wrapper
+
+    mocker.patch.object(os, "replace", check_not_mapped(os.replace))
+    mocker.patch.object(os, "truncate", check_not_mapped(os.truncate))
+    mocker.patch.object(Path, "unlink", check_not_mapped(Path.unlink))
+
+    # Compacts the log and removes the previous snapshot
+    index.add(memory_item)
+    assert JSONFileMemory(config).memories == [memory_item] * 4
+    index.clear()
+    assert len(JSONFileMemory(config)) == 0
+
+
+def test_json_memory_loads_inline_embeddings(config: Config, memory_item: MemoryItem):
+    index_file = config.workspace_path / f"{config.memory_index}.json"
+    index_file.write_bytes(
+        orjson.dumps([memory_item], option=JSONFileMemory.SAVE_OPTIONS)
+    )
+
+    index = JSONFileMemory(config)
+    assert index.memories == [memory_item]
+
+    index.save_index()
+    assert JSONFileMemory(config).memories == [memory_item]
+
+
+def test_json_memory_instances_append_to_the_same_log(
+    config: Config, memory_item: MemoryItem
+):
+    first = JSONFileMemory(config)
+    second = JSONFileMemory(config)
+    items = [
+        dataclasses.replace(
+            memory_item,
+            raw_content=f"content {i}",
+            e_summary=[float(i)] * 3,
+            e_chunks=[[float(i)] * 3],
+        )
+        for i in (1, 2, 3)
+    ]
+
+    first.add(items[0])
+    second.add(items[1])
+    first.add(items[2])
+
+    for index in (first, JSONFileMemory(config)):
+        assert [m.raw_content for m in index.memories] == [
+            "content 1",
+            "content 2",
+            "content 3",
+        ]
+        assert [list(m.e_summary) for m in index.memories] == [
+            [1.0] * 3,
+            [2.0] * 3,
+            [3.0] * 3,
+        ]
@@ -1,9 +1,12 @@
 import numpy
 import pytest
+from openai.openai_object import OpenAIObject
 from pytest_mock import MockerFixture
 
 import autogpt.memory.vector.memory_item as vector_memory_item
 import autogpt.memory.vector.providers.base as memory_provider_base
+import autogpt.memory.vector.providers.json_file as json_file_memory
+import autogpt.memory.vector.utils as vector_utils
 from autogpt.config.config import Config
 from autogpt.llm.providers.openai import OPEN_AI_EMBEDDING_MODELS
 from autogpt.memory.vector import get_memory
@@ -32,6 +35,45 @@ def mock_get_embedding(mocker: MockerFixture, embedding_dimension: int):
         "get_embedding",
         return_value=[0.0255] * embedding_dimension,
     )
+    mocker.patch.object(
+        json_file_memory,
+        "get_embedding",
+        return_value=[0.0255] * embedding_dimension,
+    )
+
+
+def fake_embedding(text: str) -> list[float]:
+    return [float(len(text)), 1.0, 0.5]
+
+
+@pytest.fixture
+def mock_create_embedding(mocker: MockerFixture):
+    """Mocks the embeddings API, returning `fake_embedding` for every input"""
+
+    def create_embedding(input, **kwargs):
+        inputs = input if isinstance(input, list) else [input]
+        return OpenAIObject.construct_from(
+            {
+                "data": [
+                    {"index": i, "embedding": fake_embedding(text)}
+                    for i, text in enumerate(inputs)
+                ],
+                "usage": {"total_tokens": len(inputs)},
+            }
+        )
+
+    mock = mocker.patch.object(
+        vector_utils.iopenai, "create_embedding", side_effect=create_embedding
+    )
+
+    async def acreate_embedding(input, **kwargs):
+        return mock(input, **kwargs)
+
+    # The async variant counts its calls on the same mock
+    mocker.patch.object(
+        vector_utils.iopenai, "acreate_embedding", side_effect=acreate_embedding
+    )
+    return mock
 
 
 @pytest.fixture
@@ -1,6 +1,9 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
+from openai.openai_object import OpenAIObject
 
 from autogpt.llm.api_manager import ApiManager
 from autogpt.llm.providers import openai
@@ -52,3 +55,60 @@ class TestProviderOpenAI:
             assert api_manager.get_total_prompt_tokens() == 0
             assert api_manager.get_total_completion_tokens() == 0
             assert api_manager.get_total_cost() == 0
+
+    @staticmethod
+    def test_create_chat_completion_meters_response():
+        """Test if the usage reported in a response is added to the API costs."""
+        messages = [{"role": "user", "content": "Who won the world series in 2020?"}]
+        model = "gpt-3.5-turbo"
+        response = OpenAIObject.construct_from(
+            {
+                "model": model,
+                "usage": {"prompt_tokens": 10, "completion_tokens": 20},
+                "choices": [],
+            }
+        )
+
+        with patch("openai.ChatCompletion.create", return_value=response):
+            assert openai.create_chat_completion(messages, model=model) is response
+
+        assert api_manager.get_total_prompt_tokens() == 10
+        assert api_manager.get_total_completion_tokens() == 20
+
+    @staticmethod
+    def test_acreate_chat_completion_shares_session():
+        """Test if async calls are metered and share one session per event loop."""
+        messages = [{"role": "user", "content": "Who won the world series in 2020?"}]
+        model = "gpt-3.5-turbo"
+        sessions = []
+
+        async def acreate(**kwargs):
+            sessions.append(openai.openai.aiosession.get())
+            return OpenAIObject.construct_from(
+                {
+                    "model": model,
+                    "usage": {"prompt_tokens": 10, "completion_tokens": 20},
+                    "choices": [],
+                }
+            )
+
+        async def create_completions():
+            return await asyncio.gather(
+                openai.acreate_chat_completion(messages, model=model),
+                openai.acreate_chat_completion(messages, model=model),
+            )
+
+        with patch("openai.ChatCompletion.acreate", side_effect=acreate):
+            with ThreadPoolExecutor(2) as executor:
+                futures = [
+                    executor.submit(openai.run_async, create_completions())
+                    for _ in range(2)
+                ]
+                assert all(len(f.result()) == 2 for f in futures)
+
+        assert len(sessions) == 4
+        assert sessions[0] is not None
+        assert all(session is sessions[0] for session in sessions)
+        assert openai.openai.aiosession.get() is None
+        assert api_manager.get_total_prompt_tokens() == 40
+        assert api_manager.get_total_completion_tokens() == 80
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 import pytest
@@ -75,6 +76,16 @@ class TestApiManager:
         assert api_manager.get_total_completion_tokens() == 0
         assert api_manager.get_total_cost() == (prompt_tokens * 0.0004) / 1000
 
+    @staticmethod
+    def test_update_cost_from_multiple_threads():
+        """Test if concurrent cost updates are all counted."""
+        with ThreadPoolExecutor(8) as executor:
+            for _ in range(1000):
+                executor.submit(api_manager.update_cost, 1, 2, "gpt-3.5-turbo")
+
+        assert api_manager.get_total_prompt_tokens() == 1000
+        assert api_manager.get_total_completion_tokens() == 2000
+
     @staticmethod
     def test_get_models():
         """Test if getting models works correctly."""
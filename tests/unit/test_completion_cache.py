@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from autogpt.llm.completion_cache import CompletionCache
+
+MESSAGE = {"role": "assistant", "content": "Hello", "function_call": None}
+
+
+def make_key(content: str) -> str:
+    return CompletionCache.key(
+        "gpt-3.5-turbo", [{"role": "user", "content": content}], None, 0, 100
+    )
+
+
+def test_completion_cache_persists(tmp_path: Path):
+    cache = CompletionCache(tmp_path / "cache.sqlite3", max_entries=10, ttl=60)
+    cache.put(make_key("Hi"), MESSAGE)
+
+    reopened = CompletionCache(tmp_path / "cache.sqlite3", max_entries=10, ttl=60)
+    assert reopened.get(make_key("Hi")) == MESSAGE
+    assert reopened.get(make_key("Bye")) is None
+
+
+def test_completion_cache_key():
+    assert make_key("Hi") == make_key("Hi")
+    assert make_key("Hi") != make_key("Bye")
+    assert make_key("Hi") != CompletionCache.key(
+        "gpt-3.5-turbo", [{"role": "user", "content": "Hi"}], None, 0, 200
+    )
+
+
+def test_completion_cache_expires_entries(tmp_path: Path, mocker: MockerFixture):
+    time = mocker.patch("autogpt.llm.completion_cache.time.time", return_value=1000)
+    cache = CompletionCache(tmp_path / "cache.sqlite3", max_entries=10, ttl=60)
+    cache.put(make_key("Hi"), MESSAGE)
+
+    time.return_value = 1059
+    assert cache.get(make_key("Hi")) == MESSAGE
+    time.return_value = 1060
+    assert cache.get(make_key("Hi")) is None
+
+    cache.put(make_key("Bye"), MESSAGE)
+    assert len(cache) == 1
+
+
+def test_completion_cache_evicts_least_recently_used(
+    tmp_path: Path, mocker: MockerFixture
+):
+    time = mocker.patch("autogpt.llm.completion_cache.time.time", return_value=1000)
+    cache = CompletionCache(tmp_path / "cache.sqlite3", max_entries=2, ttl=60)
+    cache.put(make_key("a"), MESSAGE)
+    time.return_value += 1
+    cache.put(make_key("b"), MESSAGE)
+    time.return_value += 1
+    cache.get(make_key("a"))
+    time.return_value += 1
+    cache.put(make_key("c"), MESSAGE)
+
+    assert len(cache) == 2
+    assert cache.get(make_key("b")) is None
+    assert cache.get(make_key("a")) == cache.get(make_key("c")) == MESSAGE
@@ -205,6 +205,21 @@ azure_model_map:
     del os.environ["AZURE_CONFIG_FILE"]
 
 
+def test_openai_rate_limits_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("OPENAI_REQUESTS_PER_MINUTE", "gpt-4:200,gpt-3.5-turbo:3500")
+    monkeypatch.setenv("OPENAI_TOKENS_PER_MINUTE", "gpt-4:40000")
+    config = ConfigBuilder.build_config_from_env()
+
+    assert config.get_openai_rate_limits("gpt-4") == {
+        "requests_per_minute": 200,
+        "tokens_per_minute": 40000,
+    }
+    assert config.get_openai_rate_limits("gpt-3.5-turbo") == {
+        "requests_per_minute": 3500,
+        "tokens_per_minute": 0,
+    }
+
+
 def test_create_config_gpt4only(config: Config) -> None:
     with mock.patch("autogpt.llm.api_manager.ApiManager.get_models") as mock_get_models:
         mock_get_models.return_value = [{"id": GPT_4_MODEL}]
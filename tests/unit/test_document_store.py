@@ -0,0 +1,146 @@
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+import autogpt.processing.text as text_processing
+from autogpt.config import Config
+from autogpt.memory.vector import memory_item
+from autogpt.memory.vector.document_store import DocumentStore
+
+
+@pytest.fixture
+def split_paragraphs(mocker: MockerFixture) -> MagicMock:
+    return mocker.patch.object(
+        memory_item,
+        "split_paragraphs",
+        side_effect=lambda text, *_: ((c, 0) for c in text.split("\n\n")),
+    )
+
+
+@pytest.fixture
+def summarize_chunks(mocker: MockerFixture) -> MagicMock:
+    mocker.patch.object(
+        memory_item, "summarize_text", return_value=("Summary of file", None)
+    )
+    mocker.patch.object(
+        memory_item,
+        "get_embedding",
+        side_effect=lambda texts, _: [[float(len(t))] for t in texts],
+    )
+    return mocker.patch.object(
+        memory_item,
+        "summarize_chunks",
+        side_effect=lambda chunks, *_, **__: [f"Summary of {c}" for c in chunks],
+    )
+
+
+def write(path: Path, text: str, mtime_ns: int) -> None:
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_document_store_reuses_unchanged_file(
+    tmp_path: Path,
+    config: Config,
+    split_paragraphs: MagicMock,
+    summarize_chunks: MagicMock,
+):
+    store = DocumentStore(tmp_path / "store.sqlite3")
+    file_path = tmp_path / "file.txt"
+    write(file_path, "One\n\nTwo", 1_000_000_000)
+    read_content = MagicMock(side_effect=lambda: file_path.read_text())
+
+    memory = store.memorize_file(str(file_path), read_content, config)
+    assert memory.chunk_summaries == ["Summary of One", "Summary of Two"]
+    assert memory.summary == "Summary of file"
+
+    reopened = DocumentStore(tmp_path / "store.sqlite3")
+    assert reopened.memorize_file(str(file_path), read_content, config) == memory
+    assert read_content.call_count == 1
+
+    # Touched, but with the same content
+    write(file_path, "One\n\nTwo", 2_000_000_000)
+    assert reopened.memorize_file(str(file_path), read_content, config) == memory
+    assert read_content.call_count == 2
+    assert summarize_chunks.call_count == 1
+
+
+def test_document_store_only_memorizes_changed_chunks(
+    tmp_path: Path,
+    config: Config,
+    split_paragraphs: MagicMock,
+    summarize_chunks: MagicMock,
+):
+    store = DocumentStore(tmp_path / "store.sqlite3")
+    file_path = tmp_path / "file.txt"
+    write(file_path, "One\n\nTwo\n\nThree", 1_000_000_000)
+    store.memorize_file(str(file_path), file_path.read_text, config)
+
+    write(file_path, "One\n\nChanged\n\nThree", 2_000_000_000)
+    memory = store.memorize_file(str(file_path), file_path.read_text, config)
+
+    assert summarize_chunks.call_args.args[0] == ["Changed"]
+    assert memory.chunks == ["One", "Changed", "Three"]
+    assert memory.chunk_summaries == [
+        "Summary of One",
+        "Summary of Changed",
+        "Summary of Three",
+    ]
+    assert memory.e_chunks == [[3.0], [7.0], [5.0]]
+
+
+def test_document_store_ignores_memories_of_other_models(
+    tmp_path: Path,
+    config: Config,
+    split_paragraphs: MagicMock,
+    summarize_chunks: MagicMock,
+    mocker: MockerFixture,
+):
+    store = DocumentStore(tmp_path / "store.sqlite3")
+    file_path = tmp_path / "file.txt"
+    write(file_path, "One\n\nTwo", 1_000_000_000)
+    store.memorize_file(str(file_path), file_path.read_text, config)
+
+    mocker.patch.object(config, "fast_llm", "other-model")
+    store.memorize_file(str(file_path), file_path.read_text, config)
+
+    assert summarize_chunks.call_args.args[0] == ["One", "Two"]
+    assert summarize_chunks.call_count == 2
+
+
+class WordTokenizer:
+    """Fake tiktoken encoding with one token per word"""
+
+    def encode(self, text: str) -> list[int]:
+        return [len(word) for word in text.split()]
+
+    def encode_batch(self, texts: list[str]) -> list[list[int]]:
+        return [self.encode(text) for text in texts]
+
+
+def test_document_store_chunk_boundaries_survive_edits(
+    tmp_path: Path, config: Config, summarize_chunks: MagicMock, mocker: MockerFixture
+):
+    mocker.patch.object(text_processing, "get_tokenizer", return_value=WordTokenizer())
+    store = DocumentStore(tmp_path / "store.sqlite3")
+    file_path = tmp_path / "file.txt"
+    paragraphs = [f"Paragraph {i}: " + " ".join(["word"] * 300) for i in range(100)]
+    write(file_path, "\n\n".join(paragraphs), 1_000_000_000)
+    memory = store.memorize_file(str(file_path), file_path.read_text, config)
+    assert len(memory.chunks) > 2
+    assert "\n\n".join(memory.chunks) == "\n\n".join(paragraphs)
+
+    paragraphs[50] += " changed"
+    write(file_path, "\n\n".join(paragraphs), 2_000_000_000)
+    store.memorize_file(str(file_path), file_path.read_text, config)
+    (changed_chunk,) = summarize_chunks.call_args.args[0]
+    assert "Paragraph 50: " in changed_chunk
+
+    paragraphs.insert(0, "A new first paragraph")
+    write(file_path, "\n\n".join(paragraphs), 3_000_000_000)
+    memory = store.memorize_file(str(file_path), file_path.read_text, config)
+    assert len(summarize_chunks.call_args.args[0]) <= 2
+    assert "\n\n".join(memory.chunks) == "\n\n".join(paragraphs)
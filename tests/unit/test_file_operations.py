@@ -31,7 +31,7 @@ def mock_MemoryItem_from_text(
     mocker.patch.object(
         file_ops.MemoryItem,
         "from_text",
-        new=lambda content, source_type, config, metadata: MemoryItem(
+        new=lambda content, source_type, config, metadata, **kwargs: MemoryItem(
             raw_content=content,
             summary=f"Summary of content '{content}'",
             chunk_summaries=[f"Summary of content '{content}'"],
@@ -124,6 +124,59 @@ def test_file_operations_state(test_file: TextIOWrapper):
     assert file_ops.file_operations_state(test_file.name) == expected_state
 
 
+def test_file_operations_index_updates_incrementally(
+    agent: Agent, mocker: MockerFixture
+):
+    log_path = agent.config.file_logger_path
+    operations_from_log = mocker.spy(file_ops, "operations_from_log")
+
+    file_ops.log_operation("write", "file1.txt", agent, "checksum1")
+    file_ops.log_operation("write", "file2.txt", agent, "checksum2")
+    file_ops.log_operation("delete", "file1.txt", agent)
+
+    assert file_ops.file_operations_state(log_path) == {"file2.txt": "checksum2"}
+    assert operations_from_log.call_count == 1
+
+
+@pytest.mark.parametrize("linesep", ["\n", "\r\n"])
+def test_file_operations_index_counts_written_line_endings(
+    tmp_path: Path, mocker: MockerFixture, linesep: str
+):
+    # Text mode writes os.linesep for each newline, e.g. "\r\n" on Windows
+    mocker.patch.object(os, "linesep", linesep)
+    log_path = tmp_path / "file_logger.txt"
+    log_path.write_text("")
+    index = file_ops.FileOperationsIndex(str(log_path))
+    assert index.state() == {}
+    operations_from_log = mocker.spy(file_ops, "operations_from_log")
+
+    for log_entry in ("write: file1.txt #checksum1\n", "write: file2.txt #checksum2\n"):
+        with open(log_path, "a", encoding="utf-8", newline=linesep) as f:
+            f.write(log_entry)
+        index.record(log_entry)
+
+    assert index.state() == {"file1.txt": "checksum1", "file2.txt": "checksum2"}
+    assert operations_from_log.call_count == 0
+
+
+def test_file_operations_index_reloads_external_changes(
+    agent: Agent, mocker: MockerFixture
+):
+    log_path = agent.config.file_logger_path
+    file_ops.log_operation("write", "file1.txt", agent, "checksum1")
+    assert file_ops.file_operations_state(log_path) == {"file1.txt": "checksum1"}
+
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write("append: file1.txt #checksum2\n")
+    assert file_ops.file_operations_state(log_path) == {"file1.txt": "checksum2"}
+
+    # Changes by something else are also picked up when an operation is logged
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write("write: file2.txt #checksum3\n")
+    file_ops.log_operation("delete", "file1.txt", agent)
+    assert file_ops.file_operations_state(log_path) == {"file2.txt": "checksum3"}
+
+
 def test_is_duplicate_operation(agent: Agent, mocker: MockerFixture):
     # Prepare a fake state dictionary for the function to use
     state = {
@@ -282,6 +335,52 @@ def test_append_to_file_uses_checksum_from_appended_file(
     )
 
 
+def test_append_to_file_hashes_only_appended_text(
+    test_file_path: Path, agent: Agent, mocker: MockerFixture
+):
+    hash_file = mocker.spy(file_ops.AppendChecksums, "_hash_file")
+    with open(test_file_path, "w", encoding="utf-8") as f:
+        f.write("Existing text.\n")
+
+    for i in range(3):
+        file_ops.append_to_file(test_file_path, f"Line {i}\n", agent=agent)
+
+    state = file_ops.file_operations_state(agent.config.file_logger_path)
+    with open(test_file_path, "r", encoding="utf-8") as f:
+        assert state[str(test_file_path.name)] == file_ops.text_checksum(f.read())
+    assert hash_file.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "external_change, appended_text",
+    [
+        ("Changed by something else.\n", "Appended text.\n"),
+        ("", "Appended text.\r\n"),
+        ("Ends with carriage return\r", "\nAppended text.\n"),
+    ],
+)
+def test_append_to_file_checksum_after_external_change(
+    test_file_path: Path, agent: Agent, external_change: str, appended_text: str
+):
+    file_ops.append_to_file(test_file_path, "Existing text.\n", agent=agent)
+    with open(test_file_path, "a", encoding="utf-8", newline="") as f:
+        f.write(external_change)
+
+    file_ops.append_to_file(test_file_path, appended_text, agent=agent)
+
+    state = file_ops.file_operations_state(agent.config.file_logger_path)
+    with open(test_file_path, "r", encoding="utf-8") as f:
+        assert state[str(test_file_path.name)] == file_ops.text_checksum(f.read())
+
+
+def test_append_to_file_after_carriage_return(test_file_path: Path, agent: Agent):
+    file_ops.append_to_file(test_file_path, "Line 1\r", agent=agent)
+    file_ops.append_to_file(test_file_path, "\nLine 2\n", agent=agent)
+
+    state = file_ops.file_operations_state(agent.config.file_logger_path)
+    assert state[str(test_file_path.name)] == file_ops.text_checksum("Line 1\nLine 2\n")
+
+
 def test_delete_file(test_file_with_content_path: Path, agent: Agent):
     result = file_ops.delete_file(str(test_file_with_content_path), agent=agent)
     assert result == "File deleted successfully."
@@ -333,3 +432,14 @@ def test_list_files(workspace: Workspace, test_directory: Path, agent: Agent):
     non_existent_file = "non_existent_file.txt"
     files = file_ops.list_files("", agent=agent)
     assert non_existent_file not in files
+
+
+def test_list_files_skips_hidden_directories(workspace: Workspace, agent: Agent):
+    workspace.get_path("visible.txt").write_text("Visible")
+    hidden_dir = workspace.get_path(".autogpt")
+    hidden_dir.mkdir(exist_ok=True)
+    (hidden_dir / "cache.sqlite3").write_text("Hidden")
+
+    files = file_ops.list_files(str(workspace.root), agent=agent)
+    assert "visible.txt" in files
+    assert os.path.join(".autogpt", "cache.sqlite3") not in files
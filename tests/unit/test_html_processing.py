@@ -0,0 +1,62 @@
+import pytest
+from pytest_mock import MockerFixture
+
+import autogpt.processing.html as html_processing
+from autogpt.processing.html import extract_page_content
+
+PAGE = (
+    "<!DOCTYPE html><html><head><title>Title</title><style>p {}</style></head>"
+    "<body>Intro<!-- comment --> text<p>One  two \r\n three "
+    "<a href='/other'>Other <b>page</b></a> after</p>"
+    "<script>var x;</script><noscript>Enable JavaScript</noscript>"
+    "<a href='https://example.org/'>Elsewhere</a></body></html>"
+)
+EXPECTED_TEXT = "Intro textOne\ntwo\nthree Other page afterEnable JavaScriptElsewhere"
+EXPECTED_LINKS = [
+    ("Other page", "https://example.com/other"),
+    ("Elsewhere", "https://example.org/"),
+]
+
+
+@pytest.fixture(params=["lxml", "bs4"])
+def parser(request, mocker: MockerFixture):
+    if request.param == "bs4":
+        mocker.patch.object(html_processing, "etree", None)
+    return request.param
+
+
+def test_extract_page_content(parser):
+    page = extract_page_content(PAGE, "https://example.com/page")
+
+    assert page.text == EXPECTED_TEXT
+    assert page.hyperlinks == EXPECTED_LINKS
+    assert page.noscript_text == "Enable JavaScript"
+
+
+@pytest.mark.parametrize("encode", [False, True])
+def test_extract_page_content_from_chunks(parser, encode: bool):
+    chunks = [PAGE[i : i + 7] for i in range(0, len(PAGE), 7)]
+    if encode:
+        chunks = [chunk.encode() for chunk in chunks]
+
+    page = extract_page_content(chunks, "https://example.com/page")
+
+    assert page.text == EXPECTED_TEXT
+    assert page.hyperlinks == EXPECTED_LINKS
+
+
+def test_extract_page_content_empty(parser):
+    assert extract_page_content("", "https://example.com") == ("", [], "")
+
+
+@pytest.mark.parametrize(
+    "html, encoding",
+    [
+        ('<meta charset="windows-1252"><body>Grüße aus Köln</body>', "cp1252"),
+        ("<body>Grüße aus Köln</body>", "utf-8"),
+        ('<meta charset="unknown"><body>Grüße aus Köln</body>', "utf-8"),
+    ],
+)
+def test_extract_page_content_detects_encoding(parser, html: str, encoding: str):
+    page = extract_page_content([html.encode(encoding)], "https://example.com")
+    assert page.text == "Grüße aus Köln"
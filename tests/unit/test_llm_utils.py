@@ -0,0 +1,97 @@
+from openai.openai_object import OpenAIObject
+from pytest_mock import MockerFixture
+
+from autogpt.config import Config
+from autogpt.llm.api_manager import ApiManager
+from autogpt.llm.base import ChatSequence, Message
+from autogpt.llm.providers import openai as iopenai
+from autogpt.llm.utils import create_chat_completion
+
+
+def stream_chunks(*deltas: dict):
+    for delta in deltas:
+        yield OpenAIObject.construct_from({"choices": [{"index": 0, "delta": delta}]})
+
+
+def test_create_chat_completion_stream(config: Config, mocker: MockerFixture):
+    chunks = stream_chunks(
+        {"role": "assistant"},
+        {"content": '{"thoughts"'},
+        {"content": ": {}}"},
+        {"content": "\nSome text after the JSON"},
+    )
+    create = mocker.patch.object(iopenai, "create_chat_completion", return_value=chunks)
+    mocker.patch("autogpt.llm.utils.count_message_tokens", return_value=10)
+    mocker.patch("autogpt.llm.utils.count_string_tokens", return_value=5)
+    update_cost = mocker.patch.object(ApiManager(), "update_cost")
+
+    received = []
+
+    def stream_handler(content: str) -> bool:
+        received.append(content)
+        return content.endswith("}")
+
+    prompt = ChatSequence.for_model(config.fast_llm, [Message("user", "Hi")])
+    response = create_chat_completion(
+        prompt, config, max_tokens=100, stream_handler=stream_handler
+    )
+
+    assert create.call_args.kwargs["stream"] is True
+    assert received == ['{"thoughts"', ": {}}"]
+    assert response.content == '{"thoughts": {}}'
+    assert response.function_call is None
+    # the rest of the stream is discarded
+    assert chunks.gi_frame is None
+    update_cost.assert_called_once_with(10, 5, config.fast_llm)
+
+
+def test_create_chat_completion_stream_function_call(
+    config: Config, mocker: MockerFixture
+):
+    mocker.patch.object(
+        iopenai,
+        "create_chat_completion",
+        return_value=stream_chunks(
+            {"role": "assistant", "function_call": {"name": "read_file"}},
+            {"function_call": {"arguments": '{"filename": '}},
+            {"function_call": {"arguments": '"notes.txt"}'}},
+        ),
+    )
+    mocker.patch("autogpt.llm.utils.count_message_tokens", return_value=10)
+    mocker.patch("autogpt.llm.utils.count_string_tokens", return_value=5)
+    mocker.patch.object(ApiManager(), "update_cost")
+
+    prompt = ChatSequence.for_model(config.fast_llm, [Message("user", "Hi")])
+    response = create_chat_completion(
+        prompt, config, max_tokens=100, stream_handler=lambda content: None
+    )
+
+    assert response.content is None
+    assert response.function_call.name == "read_file"
+    assert response.function_call.arguments == '{"filename": "notes.txt"}'
+
+
+def test_create_chat_completion_cache(config: Config, mocker: MockerFixture):
+    config.completion_cache = True
+    response = OpenAIObject.construct_from(
+        {"choices": [{"message": {"role": "assistant", "content": "Hello"}}]}
+    )
+    create = mocker.patch.object(
+        iopenai, "create_chat_completion", return_value=response
+    )
+    mocker.patch("autogpt.llm.utils.count_message_tokens", return_value=10)
+    api_manager = ApiManager()
+    api_manager.reset()
+
+    prompt = ChatSequence.for_model(config.fast_llm, [Message("user", "Hi")])
+    for temperature in (0, 0, 0.5):
+        response = create_chat_completion(
+            prompt, config, temperature=temperature, max_tokens=100
+        )
+        assert response.content == "Hello"
+
+    # Only the second deterministic request is served from the cache
+    assert create.call_count == 2
+    assert api_manager.completion_cache_hits == 1
+    assert api_manager.completion_cache_misses == 1
+    assert api_manager.get_completion_cache_hit_rate() == 0.5
@@ -1,6 +1,10 @@
+import json
+
 import pytest
+from pytest_mock import MockerFixture
 
-from autogpt.logs import remove_color_codes
+from autogpt.config import Config
+from autogpt.logs import StreamingThoughtsPrinter, remove_color_codes
 
 
 @pytest.mark.parametrize(
@@ -26,3 +30,37 @@ from autogpt.logs import remove_color_codes
 )
 def test_remove_color_codes(raw_text, clean_text):
     assert remove_color_codes(raw_text) == clean_text
+
+
+def test_streaming_thoughts_printer(config: Config, mocker: MockerFixture):
+    printed = []
+    mocker.patch(
+        "autogpt.logs.utils.print_assistant_thought",
+        side_effect=lambda ai_name, field, thoughts, config: printed.append(
+            (field, thoughts.get(field))
+        ),
+    )
+    before_first_print = mocker.Mock()
+    reply = {
+        "thoughts": {
+            "text": "thought",
+            "reasoning": "reasoning",
+            "plan": "- plan",
+            "criticism": "criticism",
+            "speak": "speak",
+        },
+        "command": {"name": "do_nothing", "args": {}},
+    }
+    printer = StreamingThoughtsPrinter("Test AI", config, before_first_print)
+
+    text = json.dumps(reply)
+    reasoning_end = text.index('"plan"')
+    assert not printer(text[:reasoning_end])
+    assert printed == [("text", "thought"), ("reasoning", "reasoning")]
+    before_first_print.assert_called_once()
+
+    assert printer(text[reasoning_end:])
+    assert printed == [(field, reply["thoughts"][field]) for field in reply["thoughts"]]
+
+    printer.print_remaining(reply)
+    assert len(printed) == 5
@@ -1,3 +1,4 @@
+import json
 import math
 import time
 from unittest.mock import MagicMock
@@ -146,3 +147,80 @@ def test_message_history_batch_summary(mocker, agent: Agent, config: Config):
         + mock_summary_response.content,
         type=None,
     )
+
+
+def add_cycle(history: MessageHistory, i: int, content_length: int = 1) -> None:
+    history.add("user", "Determine which next command to use")
+    history.add(
+        "assistant",
+        json.dumps({"command": {"name": f"command_{i}", "args": {}}}),
+        "ai_response",
+    )
+    history.add("system", "x" * content_length, "action_result")
+
+
+@pytest.fixture
+def history(config: Config, mocker) -> MessageHistory:
+    mocker.patch(
+        "autogpt.memory.message_history.count_message_tokens",
+        side_effect=lambda messages, model: sum(len(m.content) for m in messages),
+    )
+    return MessageHistory.for_model(config.smart_llm)
+
+
+def test_message_history_per_cycle_parses_appended_messages_once(
+    history: MessageHistory, mocker
+):
+    extract_json = mocker.patch(
+        "autogpt.memory.message_history.extract_json_from_response",
+        side_effect=json.loads,
+    )
+
+    add_cycle(history, 0)
+    add_cycle(history, 1)
+    assert len(list(history.per_cycle())) == 2
+    assert extract_json.call_count == 2
+
+    add_cycle(history, 2)
+    cycles = list(history.per_cycle())
+    assert [cycle[1].content for cycle in cycles] == [
+        msg.content for msg in history if msg.type == "ai_response"
+    ]
+    assert extract_json.call_count == 3
+
+    # Slicing copies the history, so the copy has to be parsed again
+    assert len(list(history[3:].per_cycle())) == 2
+    assert extract_json.call_count == 5
+
+
+def test_message_history_most_recent_cycles(history: MessageHistory, config: Config):
+    for i in range(5):
+        add_cycle(history, i, content_length=10 * (i + 1))
+    cycle_tlengths = [
+        sum(len(msg.content) for msg in cycle if msg is not None)
+        for cycle in history.per_cycle()
+    ]
+
+    messages, tlength = history.most_recent_cycles(
+        sum(cycle_tlengths[-2:]), config.smart_llm
+    )
+    assert messages == history.messages[-6:]
+    assert tlength == sum(cycle_tlengths[-2:])
+
+    messages, tlength = history.most_recent_cycles(
+        sum(cycle_tlengths[-2:]) - 1, config.smart_llm
+    )
+    assert messages == history.messages[-3:]
+    assert tlength == cycle_tlengths[-1]
+
+    assert history.most_recent_cycles(0, config.smart_llm) == ([], 0)
+    assert history.most_recent_cycles(10**6, config.smart_llm) == (
+        history.messages,
+        sum(cycle_tlengths),
+    )
+
+    add_cycle(history, 5, content_length=1)
+    messages, tlength = history.most_recent_cycles(
+        sum(cycle_tlengths[-1:]) + 100, config.smart_llm
+    )
+    assert messages == history.messages[-6:]
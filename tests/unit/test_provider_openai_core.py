@@ -0,0 +1,90 @@
+import logging
+
+import pytest
+from openai.openai_object import OpenAIObject
+from pytest_mock import MockerFixture
+
+from autogpt.core.resource.model_providers import OpenAIModelName, OpenAIProvider
+from autogpt.core.resource.model_providers import openai as openai_provider
+
+
+class WordTokenizer:
+    def encode_batch(self, texts: list[str]) -> list[list[str]]:
+        return [text.split() for text in texts]
+
+
+@pytest.fixture
+def provider(mocker: MockerFixture) -> OpenAIProvider:
+    mocker.patch.object(openai_provider, "_get_tokenizer", return_value=WordTokenizer())
+    settings = OpenAIProvider.default_settings.copy(deep=True)
+    return OpenAIProvider(settings, logging.getLogger(__name__))
+
+
+@pytest.fixture
+def requests(mocker: MockerFixture) -> list[list[str]]:
+    requests = []
+
+    async def acreate(input: list[str], **kwargs):
+        requests.append(input)
+        return OpenAIObject.construct_from(
+            {
+                "data": [
+                    {"index": i, "embedding": [float(len(text))]}
+                    for i, text in reversed(list(enumerate(input)))
+                ],
+                "usage": {"prompt_tokens": sum(len(t.split()) for t in input)},
+            }
+        )
+
+    mocker.patch("openai.Embedding.acreate", side_effect=acreate)
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_create_embeddings(provider: OpenAIProvider, requests: list):
+    texts = ["one", "two words", "three more words"]
+
+    responses = await provider.create_embeddings(
+        texts, OpenAIModelName.ADA, embedding_parser=lambda e: e
+    )
+
+    assert requests == [texts]
+    assert [r.embedding for r in responses] == [[3.0], [9.0], [16.0]]
+    assert [r.prompt_tokens_used for r in responses] == [1, 2, 3]
+    assert provider._budget.usage.prompt_tokens == 6
+
+
+@pytest.mark.asyncio
+async def test_create_embedding(provider: OpenAIProvider, requests: list):
+    response = await provider.create_embedding(
+        "some text", OpenAIModelName.ADA, embedding_parser=lambda e: e
+    )
+
+    assert requests == [["some text"]]
+    assert response.embedding == [9.0]
+    assert response.prompt_tokens_used == 2
+
+
+@pytest.mark.asyncio
+async def test_create_embeddings_in_multiple_requests(
+    provider: OpenAIProvider, requests: list, mocker: MockerFixture
+):
+    mocker.patch.object(openai_provider, "OPEN_AI_MAX_EMBEDDING_BATCH_SIZE", 2)
+    texts = [f"text {i}" for i in range(5)]
+
+    responses = await provider.create_embeddings(
+        texts, OpenAIModelName.ADA, embedding_parser=lambda e: e
+    )
+
+    assert sorted(requests) == [texts[0:2], texts[2:4], texts[4:5]]
+    assert [r.embedding for r in responses] == [[6.0]] * 5
+    assert provider._budget.usage.prompt_tokens == 10
+
+
+def test_batch_embedding_inputs():
+    assert openai_provider._batch_embedding_inputs([3, 3, 3, 9, 1], 7, 2048) == [
+        [0, 1],
+        [2],
+        [3],
+        [4],
+    ]
@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from autogpt.llm.rate_limiter import RateLimiter, RequestPriority
+
+MODEL = "gpt-3.5-turbo"
+
+
+@pytest.fixture
+def rate_limiter():
+    rate_limiter = RateLimiter()
+    rate_limiter.reset()
+    yield rate_limiter
+    rate_limiter.reset()
+
+
+def test_no_limits(rate_limiter: RateLimiter):
+    start = time.monotonic()
+    for _ in range(100):
+        with rate_limiter.request(MODEL, 1000) as request:
+            request.report_usage(2000)
+    assert time.monotonic() - start < 0.5
+
+
+def test_tokens_per_minute(rate_limiter: RateLimiter):
+    # 1000 tokens per second
+    limits = {"tokens_per_minute": 60000}
+    with rate_limiter.request(MODEL, 60000, **limits):
+        pass
+
+    start = time.monotonic()
+    with rate_limiter.request(MODEL, 200, **limits):
+        pass
+    assert 0.15 < time.monotonic() - start < 1
+
+
+def test_requests_per_minute(rate_limiter: RateLimiter):
+    # 10 requests per second
+    limits = {"requests_per_minute": 600}
+    for _ in range(600):
+        with rate_limiter.request(MODEL, 0, **limits):
+            pass
+
+    start = time.monotonic()
+    for _ in range(2):
+        with rate_limiter.request(MODEL, 0, **limits):
+            pass
+    assert 0.15 < time.monotonic() - start < 1
+
+
+def test_report_usage(rate_limiter: RateLimiter):
+    limits = {"tokens_per_minute": 60000}
+    with rate_limiter.request(MODEL, 0, **limits) as request:
+        request.report_usage(60200)
+
+    start = time.monotonic()
+    with rate_limiter.request(MODEL, 0, **limits):
+        pass
+    assert 0.15 < time.monotonic() - start < 1
+
+
+def test_priority(rate_limiter: RateLimiter):
+    limits = {"tokens_per_minute": 60000}
+    with rate_limiter.request(MODEL, 60000, **limits):
+        pass
+
+    served = []
+
+    def make_request(priority: RequestPriority):
+        with rate_limiter.request(MODEL, 100, priority, **limits):
+            served.append(priority)
+
+    threads = [
+        threading.Thread(target=make_request, args=(priority,))
+        for priority in (RequestPriority.BACKGROUND, RequestPriority.AGENT)
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+
+    assert served == [RequestPriority.AGENT, RequestPriority.BACKGROUND]
+
+
+def test_limits_are_per_model(rate_limiter: RateLimiter):
+    limits = {"tokens_per_minute": 60000}
+    with rate_limiter.request(MODEL, 60000, **limits):
+        pass
+
+    start = time.monotonic()
+    with rate_limiter.request("gpt-4", 1000, **limits):
+        pass
+    assert time.monotonic() - start < 0.1
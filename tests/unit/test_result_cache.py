@@ -0,0 +1,63 @@
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from autogpt.agent.agent import Agent
+from autogpt.commands import web_selenium
+from autogpt.commands.result_cache import CommandResultCache
+
+
+def test_result_cache_get_and_put(tmp_path: Path):
+    cache = CommandResultCache(tmp_path / "cache.sqlite3", ttl=60)
+    cache.put("web_search", "query", "results")
+
+    reopened = CommandResultCache(tmp_path / "cache.sqlite3", ttl=60)
+    assert reopened.get("web_search", "query") == "results"
+    assert reopened.get("web_search", "other query") is None
+    assert reopened.get("other_command", "query") is None
+
+
+def test_result_cache_matches_similar_questions(tmp_path: Path):
+    cache = CommandResultCache(tmp_path / "cache.sqlite3", ttl=60)
+    cache.put("browse_website", "https://example.com", "answer 1", [1.0, 0.0])
+    cache.put("browse_website", "https://example.com", "answer 2", [0.0, 1.0])
+
+    assert cache.get("browse_website", "https://example.com", [0.9, 0.1]) == "answer 1"
+    assert cache.get("browse_website", "https://example.com", [0.1, 0.9]) == "answer 2"
+    assert cache.get("browse_website", "https://example.com", [1.0, 1.0]) is None
+    assert cache.get("browse_website", "https://example.com") is None
+
+
+def test_result_cache_expires_results(tmp_path: Path, mocker: MockerFixture):
+    time = mocker.patch("autogpt.commands.result_cache.time.time", return_value=1000)
+    cache = CommandResultCache(tmp_path / "cache.sqlite3", ttl=60)
+    cache.put("web_search", "query", "results")
+
+    time.return_value = 1059
+    assert cache.get("web_search", "query") == "results"
+    time.return_value = 1060
+    assert cache.get("web_search", "query") is None
+
+    cache.put("web_search", "other query", "results")
+    assert len(cache) == 1
+
+
+def test_result_cache_normalize_query():
+    assert CommandResultCache.normalize_query("  Some\n QUERY ") == "some query"
+
+
+def test_browse_website_uses_cache(agent: Agent, mocker: MockerFixture):
+    mocker.patch.object(web_selenium, "get_embedding", return_value=[1.0, 0.0])
+    scrape = mocker.patch.object(
+        web_selenium, "scrape_page_with_requests", return_value=("Some text", [])
+    )
+    mocker.patch.object(
+        web_selenium, "summarize_memorize_webpage", return_value="The answer"
+    )
+
+    first = web_selenium.browse_website("https://example.com", "question?", agent)
+    second = web_selenium.browse_website("https://example.com", "question?", agent)
+
+    assert first == second
+    assert "The answer" in first
+    assert scrape.call_count == 1
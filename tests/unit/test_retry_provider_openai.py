@@ -128,3 +128,32 @@ def test_retry_openapi_other_api_error(capsys):
 
     output = capsys.readouterr()
     assert output.out == ""
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error_count, retry_count, failure",
+    [(2, 10, False), (3, 2, True)],
+    ids=["passing", "failing"],
+)
+async def test_retry_open_api_async(mocker, error, error_count, retry_count, failure):
+    """Tests that async calls are retried without blocking the event loop"""
+    async_sleep = mocker.patch.object(openai.asyncio, "sleep", mocker.AsyncMock())
+    count = 0
+
+    @openai.retry_api(max_retries=retry_count, backoff_base=0.001)
+    async def raises():
+        nonlocal count
+        count += 1
+        if count <= error_count:
+            raise error
+        return count
+
+    if failure:
+        with pytest.raises(type(error)):
+            await raises()
+    else:
+        assert await raises() == error_count + 1
+
+    assert count == min(error_count, retry_count) + 1
+    assert async_sleep.await_count == min(error_count, retry_count)
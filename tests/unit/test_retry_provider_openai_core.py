@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from email.utils import formatdate
+from time import time
+
+import pytest
+from openai.error import APIError, RateLimitError
+
+from autogpt.core.resource.model_providers.openai import (
+    _get_retry_after,
+    _OpenAIRetryHandler,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def error_factory(error: Exception, error_count: int):
+    calls = []
+
+    async def f():
+        calls.append(time())
+        if len(calls) <= error_count:
+            raise error
+        return len(calls)
+
+    return f, calls
+
+
+@pytest.mark.asyncio
+async def test_retry_does_not_block_event_loop():
+    handler = _OpenAIRetryHandler(logger, num_retries=3, warn_user=False)
+    error = RateLimitError("Error", headers={"retry-after": "0.2"})
+    f, calls = error_factory(error, 1)
+    finished = []
+
+    async def other_work():
+        await asyncio.sleep(0.01)
+        finished.append("other")
+
+    async def retried_call():
+        await handler(f)()
+        finished.append("retried")
+
+    await asyncio.gather(retried_call(), other_work())
+
+    assert finished == ["other", "retried"]
+    assert calls[1] - calls[0] >= 0.2
+
+
+@pytest.mark.asyncio
+async def test_retry_metrics():
+    handler = _OpenAIRetryHandler(logger, num_retries=3, warn_user=False)
+    rate_limit_error = RateLimitError("Error", headers={"retry-after-ms": "10"})
+    server_error = APIError("Error", http_status=502, headers={"retry-after": "0"})
+
+    f, _ = error_factory(rate_limit_error, 2)
+    assert await handler(f)() == 3
+    f, _ = error_factory(server_error, 1)
+    assert await handler(f)() == 2
+
+    assert handler.metrics.retries == 3
+    assert handler.metrics.rate_limit_errors == 2
+    assert handler.metrics.server_errors == 1
+    assert handler.metrics.time_waiting == pytest.approx(0.02)
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up():
+    handler = _OpenAIRetryHandler(logger, num_retries=2, warn_user=False)
+    error = RateLimitError("Error", headers={"retry-after": "0"})
+    f, calls = error_factory(error, 5)
+
+    with pytest.raises(RateLimitError):
+        await handler(f)()
+    assert len(calls) == 3
+
+
+def test_backoff_has_jitter_and_limit():
+    handler = _OpenAIRetryHandler(logger, backoff_base=2.0, max_backoff=60.0)
+    error = RateLimitError("Error")
+
+    backoffs = {handler._get_backoff(1, error) for _ in range(20)}
+    assert len(backoffs) > 1
+    assert all(4 <= backoff <= 8 for backoff in backoffs)
+    assert all(30 <= handler._get_backoff(10, error) <= 60 for _ in range(20))
+
+
+@pytest.mark.parametrize(
+    "headers, expected",
+    [
+        ({}, None),
+        ({"retry-after": "3"}, 3),
+        ({"retry-after": "1.5"}, 1.5),
+        ({"retry-after-ms": "250", "retry-after": "1"}, 0.25),
+        ({"retry-after": "soon"}, None),
+    ],
+)
+def test_get_retry_after(headers: dict, expected):
+    assert _get_retry_after(RateLimitError("Error", headers=headers)) == expected
+
+
+def test_get_retry_after_http_date():
+    error = RateLimitError("Error", headers={"retry-after": formatdate(time() + 30)})
+    assert 25 < _get_retry_after(error) <= 30
@@ -1,13 +1,23 @@
 import json
 import tempfile
+from pathlib import Path
 from unittest import TestCase
 from xml.etree import ElementTree
 
 import docx
+import pytest
 import yaml
 from bs4 import BeautifulSoup
-
-from autogpt.commands.file_operations_utils import is_file_binary_fn, read_textual_file
+from pytest_mock import MockerFixture
+
+from autogpt.commands import file_operations_utils
+from autogpt.commands.file_operations_utils import (
+    BINARY_SNIFF_SIZE,
+    ENCODING_SNIFF_SIZE,
+    detect_encoding,
+    is_file_binary_fn,
+    read_textual_file,
+)
 from autogpt.logs import logger
 
 plain_text_str = "Hello, world!"
@@ -148,3 +158,53 @@ class TestConfig(TestCase):
             self.assertIn(plain_text_str, loaded_text)
             should_be_binary = file_extension in binary_files_extensions
             self.assertEqual(should_be_binary, is_file_binary_fn(created_filepath))
+
+
+def test_is_file_binary_only_checks_start_of_file(tmp_path: Path):
+    file_path = tmp_path / "late_null_byte.log"
+    file_path.write_bytes(b"a" * BINARY_SNIFF_SIZE + b"\x00")
+    assert is_file_binary_fn(str(file_path)) is False
+
+
+def test_read_text_file_with_detected_encoding(tmp_path: Path):
+    file_path = tmp_path / "latin-1.txt"
+    text = "Grüße aus Köln, schöne Straße. " * 20
+    file_path.write_bytes(text.encode("latin-1"))
+    assert read_textual_file(str(file_path), logger) == text
+
+
+@pytest.mark.parametrize("overhang", [1, 2])
+def test_detect_encoding_when_sample_ends_mid_character(tmp_path: Path, overhang: int):
+    sentence = "Grüße aus Köln, schöne Straße. "
+    text = sentence * (ENCODING_SNIFF_SIZE // len(sentence.encode()) - 1)
+    # "€" is 3 bytes in UTF-8; the sample ends after the first 3 - overhang
+    text += "x" * (ENCODING_SNIFF_SIZE - len(text.encode()) - 3 + overhang)
+    text += "€" + sentence * 10
+    file_path = tmp_path / "utf-8.txt"
+    file_path.write_bytes(text.encode("utf-8"))
+
+    assert detect_encoding(str(file_path)) == "utf_8_sig"
+    assert read_textual_file(str(file_path), logger) == text
+
+
+def test_read_text_file_in_chunks(tmp_path: Path, mocker: MockerFixture):
+    mocker.patch.object(file_operations_utils, "READ_CHUNK_SIZE", 4)
+    file_path = tmp_path / "utf-8.txt"
+    file_path.write_text("﻿Hello, wörld!", encoding="utf-8")
+
+    chunks = list(file_operations_utils.TXTParser().iter_text(str(file_path)))
+
+    assert chunks == ["Hell", "o, w", "örld", "!"]
+
+
+def test_read_textual_file_truncates_to_max_bytes(mocker: MockerFixture):
+    mocker.patch.object(
+        file_operations_utils.TXTParser,
+        "iter_text",
+        return_value=iter(["Hello, ", "wörld!", " Never read"]),
+    )
+    file_path = mock_text_file()
+
+    text = read_textual_file(file_path, logger, max_bytes=9)
+
+    assert text == "Hello, w\n\n[The text of this file is truncated to 9 bytes]"
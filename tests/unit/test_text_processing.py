@@ -0,0 +1,152 @@
+import threading
+import time
+from pathlib import Path
+
+import spacy
+from pytest_mock import MockerFixture
+
+import autogpt.processing.text as text_processing
+from autogpt.config import Config
+from autogpt.llm.base import ChatModelResponse, ChatSequence
+from autogpt.llm.providers.openai import OPEN_AI_CHAT_MODELS
+from autogpt.processing.text import (
+    load_spacy_pipeline,
+    split_paragraphs,
+    split_text,
+    summarize_chunks,
+)
+
+
+def test_summarize_chunks_concurrently(config: Config, mocker: MockerFixture):
+    config.summarization_concurrency = 2
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def create_chat_completion(prompt, **kwargs):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        text = prompt.messages[-1].content.split('"""')[1]
+        return ChatModelResponse(
+            model_info=OPEN_AI_CHAT_MODELS[config.fast_llm],
+            content=f"summary of {text}",
+            function_call=None,
+        )
+
+    mocker.patch.object(text_processing, "count_string_tokens", return_value=10)
+    mocker.patch.object(ChatSequence, "dump", return_value="")
+    mocker.patch.object(
+        text_processing, "create_chat_completion", side_effect=create_chat_completion
+    )
+
+    chunks = [f"chunk {i}" for i in range(6)]
+    assert summarize_chunks(chunks, config) == [f"summary of {c}" for c in chunks]
+    assert max_running == 2
+
+
+def test_load_spacy_pipeline_is_cached(tmp_path: Path):
+    model_path = tmp_path / "model"
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    nlp.to_disk(model_path)
+
+    pipeline = load_spacy_pipeline(str(model_path), sentencizer_only=True)
+    assert pipeline is load_spacy_pipeline(str(model_path), sentencizer_only=True)
+    assert pipeline.pipe_names == ["sentencizer"]
+    assert [s.text for s in pipeline("One sentence. Another one.").sents] == [
+        "One sentence.",
+        "Another one.",
+    ]
+
+
+class CharacterTokenizer:
+    """Fake tiktoken encoding with one token per character"""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode(self, text: str) -> list[int]:
+        self.encoded.append(text)
+        return [ord(c) for c in text]
+
+    def encode_batch(self, texts: list[str]) -> list[list[int]]:
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens: list[int]) -> str:
+        return "".join(map(chr, tokens))
+
+
+def test_split_text_tokenizes_once(config: Config, mocker: MockerFixture):
+    tokenizer = CharacterTokenizer()
+    mocker.patch.object(text_processing, "get_tokenizer", return_value=tokenizer)
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    mocker.patch.object(text_processing, "load_spacy_pipeline", return_value=nlp)
+
+    sentences = [f"This is sentence number {i}." for i in range(20)]
+    text = " ".join(sentences)
+    chunks = list(
+        split_text(
+            text, config.fast_llm, config, with_overlap=False, max_chunk_length=100
+        )
+    )
+
+    assert len(chunks) > 1
+    assert " ".join(chunk for chunk, _ in chunks) == text
+    for chunk, length in chunks:
+        assert len(chunk) <= length < 100
+    # the text once for its length, then every sentence once
+    assert tokenizer.encoded == [text, *sentences]
+
+
+def test_split_paragraphs(config: Config, mocker: MockerFixture):
+    mocker.patch.object(
+        text_processing, "get_tokenizer", return_value=CharacterTokenizer()
+    )
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    mocker.patch.object(text_processing, "load_spacy_pipeline", return_value=nlp)
+
+    paragraphs = [f"Paragraph number {i}." for i in range(20)]
+    long_paragraph = " ".join(f"This is sentence number {i}." for i in range(10))
+    text = "\n\n".join([*paragraphs[:10], long_paragraph, *paragraphs[10:]])
+    chunks = list(split_paragraphs(text, config.fast_llm, config, 100))
+
+    assert len(chunks) > 3
+    for chunk, length in chunks:
+        assert len(chunk) <= length < 100
+    # Short paragraphs are kept whole, the long one is split into sentences
+    assert [c for c, _ in chunks if "Paragraph" in c] == [
+        c for c, _ in chunks if "sentence" not in c
+    ]
+    assert "\n\n".join(c for c, _ in chunks if "Paragraph" in c) == "\n\n".join(
+        paragraphs
+    )
+    assert " ".join(c for c, _ in chunks if "sentence" in c) == long_paragraph
+
+
+def test_split_paragraphs_without_blank_lines(config: Config, mocker: MockerFixture):
+    mocker.patch.object(
+        text_processing, "get_tokenizer", return_value=CharacterTokenizer()
+    )
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    mocker.patch.object(text_processing, "load_spacy_pipeline", return_value=nlp)
+
+    lines = [f"Line number {i} of the file." for i in range(100)]
+    text = "\n".join(lines)
+    chunks = [c for c, _ in split_paragraphs(text, config.fast_llm, config, 200)]
+    appended = "\n".join([*lines, "One more line.", "And another one."])
+    new_chunks = [
+        c for c, _ in split_paragraphs(appended, config.fast_llm, config, 200)
+    ]
+
+    assert len(chunks) > 10
+    assert "\n".join(chunks) == text
+    # Only the last chunk changes
+    assert new_chunks[: len(chunks) - 1] == chunks[:-1]
@@ -1,7 +1,8 @@
 import pytest
+from pytest_mock import MockerFixture
 
 from autogpt.llm.base import Message
-from autogpt.llm.utils import count_message_tokens, count_string_tokens
+from autogpt.llm.utils import count_message_tokens, count_string_tokens, token_counter
 
 
 def test_count_message_tokens():
@@ -53,3 +54,54 @@ def test_count_string_tokens_gpt_4():
 
     string = "Hello, world!"
     assert count_string_tokens(string, model_name="gpt-4-0314") == 4
+
+
+class WordEncoding:
+    """Fake tiktoken encoding with one token per word"""
+
+    name = "words"
+
+    def __init__(self):
+        self.encoded: list[str] = []
+
+    def encode(self, text: str) -> list[int]:
+        self.encoded.append(text)
+        return [hash(word) for word in text.split()]
+
+
+@pytest.fixture
+def word_encoding(mocker: MockerFixture) -> WordEncoding:
+    encoding = WordEncoding()
+    mocker.patch.object(token_counter, "get_tokenizer", return_value=encoding)
+    mocker.patch.dict(token_counter._token_counts, clear=True)
+    return encoding
+
+
+def test_count_string_tokens_is_memoized(word_encoding: WordEncoding):
+    assert count_string_tokens("one two three", "gpt-3.5-turbo") == 3
+    assert count_string_tokens("one two three", "gpt-4") == 3
+    assert word_encoding.encoded == ["one two three"]
+
+
+def test_count_string_tokens_memo_evicts_least_recently_used(
+    word_encoding: WordEncoding, mocker: MockerFixture
+):
+    mocker.patch.object(token_counter, "TOKEN_COUNT_CACHE_SIZE", 2)
+    for text in ["a", "b", "a", "c", "a", "b"]:
+        count_string_tokens(text, "gpt-3.5-turbo")
+    assert word_encoding.encoded == ["a", "b", "c", "b"]
+
+
+def test_count_message_tokens_caches_count_on_message(word_encoding: WordEncoding):
+    message = Message("user", "Hello there")
+    assert count_message_tokens(message) == 4 + 3 + 3
+    n_encoded = len(word_encoding.encoded)
+
+    token_counter._token_counts.clear()
+    assert count_message_tokens([message, message]) == 2 * (4 + 3) + 3
+    assert len(word_encoding.encoded) == n_encoded
+
+    message.content = "Hello there, general Kenobi"
+    assert count_message_tokens(message) == 4 + 5 + 3
+    assert word_encoding.encoded[-1] == "Hello there, general Kenobi"
+    assert message == Message("user", "Hello there, general Kenobi")
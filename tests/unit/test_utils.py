@@ -1,3 +1,4 @@
+import json
 import os
 from unittest.mock import patch
 
@@ -5,7 +6,11 @@ import pytest
 import requests
 
 from autogpt.config import Config
-from autogpt.json_utils.utilities import extract_json_from_response, validate_json
+from autogpt.json_utils.utilities import (
+    StreamingJSONParser,
+    extract_json_from_response,
+    validate_json,
+)
 from autogpt.utils import (
     get_bulletin_from_web,
     get_current_git_branch,
@@ -206,3 +211,34 @@ def test_extract_json_from_response_wrapped_in_code_block(valid_json_response: d
     assert (
         extract_json_from_response(emulated_response_from_openai) == valid_json_response
     )
+
+
+def test_streaming_json_parser(valid_json_response: dict):
+    text = json.dumps(valid_json_response)
+    parser = StreamingJSONParser()
+    partial_results = []
+    for i in range(0, len(text), 7):
+        parser.feed(text[i : i + 7])
+        if (partial := parser.parse()) is not None:
+            partial_results.append(partial)
+
+    assert parser.complete
+    assert parser.started_at_beginning
+    assert partial_results[-1] == valid_json_response
+    assert {"thoughts": {"text": valid_json_response["thoughts"]["text"]}} in (
+        partial_results
+    )
+
+
+def test_streaming_json_parser_incomplete_string():
+    parser = StreamingJSONParser()
+    parser.feed('```json\n{"thoughts": {"text": "Hello, wo')
+    assert parser.parse() is None
+    parser.feed('rld"')
+    assert parser.parse() == {"thoughts": {"text": "Hello, world"}}
+    parser.feed(', "reasoning": "\\"quoted\\" }"}}\n```')
+    assert parser.complete
+    assert not parser.started_at_beginning
+    assert parser.parse() == {
+        "thoughts": {"text": "Hello, world", "reasoning": '"quoted" }'}
+    }
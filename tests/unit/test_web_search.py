@@ -134,3 +134,16 @@ def test_google_official_search_errors(
     mock_googleapiclient.side_effect = error
     actual_output = google(query, agent=agent, num_results=num_results)
     assert actual_output == safe_google_results(expected_output)
+
+
+def test_web_search_uses_cache(mocker, agent: Agent):
+    mock_ddg = mocker.patch(
+        "autogpt.commands.web_search.DDGS.text",
+        return_value=[{"title": "Result 1", "link": "https://example.com/result1"}],
+    )
+
+    first = web_search("Some  Query", agent=agent, num_results=1)
+    second = web_search("some query ", agent=agent, num_results=1)
+
+    assert first == second
+    assert mock_ddg.call_count == 1
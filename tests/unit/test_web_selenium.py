@@ -0,0 +1,239 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from autogpt.agent.agent import Agent
+from autogpt.commands import web_selenium
+from autogpt.memory.vector import JSONFileMemory, MemoryItem
+
+ARTICLE = " ".join(["Some article text."] * 20)
+
+
+@pytest.fixture
+def http_get(mocker: MockerFixture) -> MagicMock:
+    web_selenium._http_session.cache_clear()
+    return mocker.patch("requests.Session.get")
+
+
+def html_response(body: str) -> MagicMock:
+    response = MagicMock(ok=True, url="https://example.com/page")
+    response.headers = {"Content-Type": "text/html; charset=utf-8"}
+    html = f"<html><body>{body}</body></html>"
+    response.iter_content.return_value = [html[:20], html[20:]]
+    return response
+
+
+def test_scrape_page_with_requests(http_get: MagicMock, agent: Agent):
+    http_get.return_value = html_response(
+        f"<script>var x;</script><p>{ARTICLE}</p><a href='/other'>Other</a>"
+    )
+
+    text, links = web_selenium.scrape_page_with_requests(
+        "https://example.com/page", agent
+    )
+
+    assert text == f"{ARTICLE}Other"
+    assert links == ["Other (https://example.com/other)"]
+    assert http_get.call_args.kwargs["headers"]["User-Agent"] == agent.config.user_agent
+
+
+def test_scrape_page_with_requests_detects_meta_charset(
+    http_get: MagicMock, agent: Agent
+):
+    html = (
+        '<html><head><meta charset="utf-8"></head>'
+        f"<body><p>Grüße aus Köln. {ARTICLE}</p></body></html>"
+    ).encode("utf-8")
+    response = html_response("")
+    response.headers = {"Content-Type": "text/html"}
+    response.iter_content.return_value = [html[:60], html[60:]]
+    http_get.return_value = response
+
+    text, _ = web_selenium.scrape_page_with_requests("https://example.com", agent)
+
+    assert text == f"Grüße aus Köln. {ARTICLE}"
+    assert response.iter_content.call_args.kwargs["decode_unicode"] is False
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "<div id='root'></div>",
+        f"<noscript>Please enable JavaScript to continue.</noscript><p>{ARTICLE}</p>",
+    ],
+)
+def test_scrape_page_with_requests_needs_javascript(
+    http_get: MagicMock, agent: Agent, body: str
+):
+    http_get.return_value = html_response(body)
+    assert web_selenium.scrape_page_with_requests("https://example.com", agent) is None
+
+
+def test_scrape_page_with_requests_not_html(http_get: MagicMock, agent: Agent):
+    response = html_response(ARTICLE)
+    response.headers = {"Content-Type": "application/pdf"}
+    http_get.return_value = response
+    assert web_selenium.scrape_page_with_requests("https://example.com", agent) is None
+
+
+def test_browse_website_falls_back_to_browser(agent: Agent, mocker: MockerFixture):
+    agent.config.web_cache_ttl = 0
+    mocker.patch.object(web_selenium, "scrape_page_with_requests", return_value=None)
+    driver = MagicMock()
+    pool = MagicMock()
+    pool.driver.return_value.__enter__.return_value = driver
+    mocker.patch.object(web_selenium, "get_webdriver_pool", return_value=pool)
+    mocker.patch.object(
+        web_selenium,
+        "scrape_page_with_selenium",
+        return_value=("Some text", ["Link (url)"]),
+    )
+    mocker.patch.object(web_selenium, "add_header")
+    mocker.patch.object(
+        web_selenium, "summarize_memorize_webpage", return_value="The answer"
+    )
+
+    result = web_selenium.browse_website("https://example.com", "question?", agent)
+
+    assert result == "Answer gathered from website: The answer\n\nLinks: ['Link (url)']"
+    web_selenium.scrape_page_with_selenium.assert_called_once_with(
+        driver, "https://example.com"
+    )
+
+
+def test_browse_websites(agent: Agent, mocker: MockerFixture):
+    agent.config.web_cache_ttl = 0
+    agent.config.browse_concurrency = 3
+    lock = threading.Lock()
+    running = 0
+    max_running = 0
+
+    def scrape_page_with_requests(url: str, agent: Agent):
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return f"Text of {url}", []
+
+    mocker.patch.object(
+        web_selenium, "scrape_page_with_requests", new=scrape_page_with_requests
+    )
+    summarize = mocker.patch.object(
+        web_selenium,
+        "summarize_memorize_webpage",
+        side_effect=lambda url, text, question, agent: f"Answer from {text}",
+    )
+
+    merge = mocker.patch.object(
+        web_selenium, "summarize_text", return_value=("Merged answer", None)
+    )
+
+    result = web_selenium.browse_websites(
+        "https://a.com, https://b.com https://c.com,https://a.com,file:///etc/passwd",
+        "question?",
+        agent,
+    )
+
+    assert result == (
+        "Answer gathered from websites: Merged answer\n\n"
+        "Links from https://a.com: []\n"
+        "Links from https://b.com: []\n"
+        "Links from https://c.com: []\n\n"
+        "Website file:///etc/passwd: Error: Invalid URL format"
+    )
+    merge.assert_called_once_with(
+        "Website https://a.com:\nAnswer from Text of https://a.com\n\n"
+        "Website https://b.com:\nAnswer from Text of https://b.com\n\n"
+        "Website https://c.com:\nAnswer from Text of https://c.com",
+        agent.config,
+        question="question?",
+    )
+    assert summarize.call_count == 3
+    assert max_running == 3
+
+
+def test_browse_websites_single_answer(agent: Agent, mocker: MockerFixture):
+    agent.config.web_cache_ttl = 0
+    mocker.patch.object(
+        web_selenium,
+        "scrape_page_with_requests",
+        side_effect=lambda url, agent: ("Text" if "a.com" in url else "", ["Link"]),
+    )
+    mocker.patch.object(
+        web_selenium,
+        "summarize_memorize_webpage",
+        side_effect=lambda url, text, question, agent: (
+            f"Answer from {url}" if text else "Error: No text to summarize"
+        ),
+    )
+    merge = mocker.patch.object(web_selenium, "summarize_text")
+
+    result = web_selenium.browse_websites(
+        "https://a.com,https://b.com", "question?", agent
+    )
+
+    assert result == (
+        "Answer gathered from websites: Answer from https://a.com\n\n"
+        "Links from https://a.com: ['Link']\n\n"
+        "Website https://b.com: Error: No text to summarize"
+    )
+    merge.assert_not_called()
+
+
+def test_browse_website_uses_cached_answer(agent: Agent, mocker: MockerFixture):
+    agent.config.web_cache_ttl = 60
+    mocker.patch.object(web_selenium, "get_embedding", return_value=[1.0, 0.0])
+    scrape = mocker.patch.object(
+        web_selenium, "scrape_page_with_requests", return_value=("Text", ["Link"])
+    )
+    mocker.patch.object(
+        web_selenium, "summarize_memorize_webpage", return_value="The answer"
+    )
+
+    results = [
+        web_selenium.browse_website("https://example.com", "question?", agent)
+        for _ in range(2)
+    ]
+
+    assert (
+        results == ["Answer gathered from website: The answer\n\nLinks: ['Link']"] * 2
+    )
+    assert scrape.call_count == 1
+
+
+def test_summarize_memorize_webpage_in_parallel(agent: Agent, mocker: MockerFixture):
+    def from_webpage(text: str, url: str, config, question: str) -> MemoryItem:
+        return MemoryItem(
+            raw_content=text,
+            summary=f"Summary of {url}",
+            chunks=[text],
+            chunk_summaries=[f"Summary of {url}"],
+            e_summary=[float(len(url))] * 3,
+            e_chunks=[[float(len(url))] * 3],
+            metadata={"location": url},
+        )
+
+    mocker.patch.object(MemoryItem, "from_webpage", side_effect=from_webpage)
+    urls = [f"https://example.com/{'x' * i}" for i in range(8)]
+
+    with ThreadPoolExecutor(4) as executor:
+        list(
+            executor.map(
+                lambda url: web_selenium.summarize_memorize_webpage(
+                    url, "Text", "question?", agent
+                ),
+                urls,
+            )
+        )
+
+    memories = JSONFileMemory(agent.config).memories
+    assert sorted(m.metadata["location"] for m in memories) == sorted(urls)
+    for memory in memories:
+        assert list(memory.e_summary) == [float(len(memory.metadata["location"]))] * 3
@@ -0,0 +1,102 @@
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from autogpt.commands.webdriver_pool import WebDriverPool
+
+
+def make_driver() -> MagicMock:
+    driver = MagicMock()
+    driver.window_handles = ["main"]
+    return driver
+
+
+@pytest.fixture
+def create_driver() -> MagicMock:
+    return MagicMock(side_effect=make_driver)
+
+
+def test_driver_is_reused(create_driver: MagicMock):
+    pool = WebDriverPool(create_driver, max_size=2, idle_timeout=0)
+
+    with pool.driver() as first:
+        pass
+    with pool.driver() as second:
+        pass
+
+    assert first is second
+    assert create_driver.call_count == 1
+    first.delete_all_cookies.assert_called()
+    first.get.assert_called_with("about:blank")
+
+
+def test_extra_tabs_are_closed(create_driver: MagicMock):
+    pool = WebDriverPool(create_driver, max_size=1, idle_timeout=0)
+
+    with pool.driver() as driver:
+        driver.window_handles = ["main", "popup"]
+
+    driver.switch_to.window.assert_called_with("main")
+    driver.close.assert_called_once()
+
+
+def test_failed_driver_is_discarded(create_driver: MagicMock):
+    pool = WebDriverPool(create_driver, max_size=1, idle_timeout=0)
+
+    with pytest.raises(WebDriverException):
+        with pool.driver() as crashed:
+            raise WebDriverException("crashed")
+    with pool.driver() as driver:
+        pass
+
+    crashed.quit.assert_called_once()
+    assert driver is not crashed
+    assert len(pool) == 1
+
+
+def test_unhealthy_driver_is_replaced(create_driver: MagicMock):
+    pool = WebDriverPool(create_driver, max_size=1, idle_timeout=0)
+
+    with pool.driver() as unhealthy:
+        pass
+    type(unhealthy).current_url = property(
+        lambda self: (_ for _ in ()).throw(WebDriverException("gone"))
+    )
+    with pool.driver() as driver:
+        pass
+
+    assert driver is not unhealthy
+    unhealthy.quit.assert_called_once()
+
+
+def test_pool_is_bounded(create_driver: MagicMock):
+    pool = WebDriverPool(create_driver, max_size=1, idle_timeout=0)
+    borrowed = []
+
+    def browse():
+        with pool.driver() as driver:
+            borrowed.append(driver)
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=browse) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert create_driver.call_count == 1
+    assert len(borrowed) == 3 and len(set(map(id, borrowed))) == 1
+
+
+def test_idle_drivers_are_closed(create_driver: MagicMock):
+    pool = WebDriverPool(create_driver, max_size=1, idle_timeout=0.05)
+
+    with pool.driver() as driver:
+        pass
+    time.sleep(0.2)
+
+    driver.quit.assert_called_once()
+    assert len(pool) == 0